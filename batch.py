@@ -0,0 +1,109 @@
+"""Evaluates many boards at once with NumPy, for analytics jobs.
+
+Boards are rows of an integer array with one column per space, coded as
+in GameBoard.CELL_CODES: 0 for empty, 1 for X and 2 for O. NumPy is only
+needed by this module, the game itself runs without it.
+"""
+
+import numpy as np
+from board import BoardGeometry, GameBoard
+
+EMPTY = GameBoard.CELL_CODES[GameBoard.BOARD_EMPTY]
+PLAYER_X = GameBoard.CELL_CODES[GameBoard.BOARD_PLAYER_X]
+PLAYER_O = GameBoard.CELL_CODES[GameBoard.BOARD_PLAYER_O]
+
+
+class BatchResult:
+    """The state of every board of a batch, one array entry per board."""
+
+    def __init__(self, winners, draws, to_move, legal):
+        """
+        Initialize a batch result.
+
+        Args:
+            winners: (N,) int8 array, the code of the winner or 0.
+            draws: (N,) bool array, True for full boards without a winner.
+            to_move: (N,) int8 array, the code of the side to move, or 0
+            if the game is over.
+            legal: (N, spaces) bool array of the spaces the side to move
+            may mark, all False if the game is over.
+        """
+        self.winners = winners
+        self.draws = draws
+        self.to_move = to_move
+        self.legal = legal
+
+    def __len__(self):
+        """
+        Return the number of boards in the batch.
+        """
+        return len(self.winners)
+
+
+def to_array(boards):
+    """
+    Encode GameBoards as a batch array.
+
+    Args:
+        boards: A sequence of GameBoard objects of the same shape.
+
+    Returns:
+        An (N, spaces) int8 array.
+    """
+    codes = GameBoard.CELL_CODES
+    return np.array([[codes[space] for space in board.board]
+                     for board in boards], dtype=np.int8)
+
+
+def _has_line(marks, lines):
+    """
+    Tell which boards have a complete line of marks.
+
+    Args:
+        marks: (N, spaces) bool array of one player's marks.
+        lines: (lines, win_length) array of space indexes.
+
+    Returns:
+        An (N,) bool array.
+    """
+    # Gathers an (N, lines, win_length) array and reduces each line
+    return marks[:, lines].all(axis=2).any(axis=1)
+
+
+def evaluate_boards(boards, rows=3, columns=3, win_length=3):
+    """
+    Find winners, draws, side to move and legal moves of many boards.
+
+    Every step is a whole-array operation over the winning lines of the
+    board shape, there is no Python loop over the boards. A board on
+    which both players have a line counts as won by X.
+
+    Args:
+        boards: An (N, rows * columns) integer array of cell codes.
+        rows: The number of rows of every board.
+        columns: The number of columns of every board.
+        win_length: How many marks in a row win the game.
+
+    Returns:
+        A BatchResult for the N boards.
+    """
+    geometry = BoardGeometry.get(rows, columns, win_length)
+    boards = np.asarray(boards)
+    if boards.ndim != 2 or boards.shape[1] != geometry.size:
+        raise ValueError(f"Expected an (N, {geometry.size}) array of boards")
+    lines = np.array(geometry.lines, dtype=np.intp)
+    is_x = boards == PLAYER_X
+    is_o = boards == PLAYER_O
+    winners = np.where(_has_line(is_x, lines), PLAYER_X,
+                       np.where(_has_line(is_o, lines), PLAYER_O, EMPTY)
+                       ).astype(np.int8)
+
+    x_count = is_x.sum(axis=1)
+    o_count = is_o.sum(axis=1)
+    full = x_count + o_count == geometry.size
+    over = full | (winners != EMPTY)
+    to_move = np.where(over, EMPTY,
+                       np.where(x_count > o_count, PLAYER_O, PLAYER_X)
+                       ).astype(np.int8)
+    legal = (boards == EMPTY) & ~over[:, None]
+    return BatchResult(winners, full & (winners == EMPTY), to_move, legal)
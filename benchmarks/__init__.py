@@ -0,0 +1 @@
+"""Benchmarks for the game engine, run with 'python -m benchmarks.<name>'."""
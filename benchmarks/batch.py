@@ -0,0 +1,56 @@
+"""Compares batch evaluation with a GameBoard per position."""
+
+import time
+import numpy as np
+from batch import evaluate_boards
+from board import GameBoard
+
+
+def random_boards(count, seed=1):
+    """
+    Generate random 3x3 boards with valid piece counts.
+
+    Args:
+        count: The number of boards.
+        seed: The seed of the random generator.
+
+    Returns:
+        A (count, 9) int8 array of cell codes.
+    """
+    rng = np.random.default_rng(seed)
+    marks = rng.integers(0, 10, size=count)
+    order = rng.random((count, 9)).argsort(axis=1)
+    turn = np.arange(9)
+    codes = np.where(turn < marks[:, None], 1 + turn % 2, 0)
+    boards = np.empty((count, 9), dtype=np.int8)
+    np.put_along_axis(boards, order, codes, axis=1)
+    return boards
+
+
+def main():
+    """
+    Print boards per second for both ways of evaluating.
+    """
+    boards = random_boards(1_000_000)
+    start = time.perf_counter()
+    evaluate_boards(boards)
+    vectorized = time.perf_counter() - start
+
+    symbols = (GameBoard.BOARD_EMPTY, GameBoard.BOARD_PLAYER_X,
+               GameBoard.BOARD_PLAYER_O)
+    sample = boards[:50_000].tolist()
+    board = GameBoard()
+    start = time.perf_counter()
+    for cells in sample:
+        board.board = [symbols[code] for code in cells]
+        board.check_terminal_state()
+        board.available_actions()
+    looped = (time.perf_counter() - start) * len(boards) / len(sample)
+
+    print(f"{'method':<12}{'boards/s':>14}")
+    print(f"{'GameBoard':<12}{len(boards) / looped:>14,.0f}")
+    print(f"{'NumPy batch':<12}{len(boards) / vectorized:>14,.0f}")
+
+
+if __name__ == '__main__':
+    main()
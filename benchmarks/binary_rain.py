@@ -0,0 +1,27 @@
+"""Measures the CPU cost of the binary rain animation."""
+
+import os
+from view import BinaryRain
+
+SIZES = ((80, 23), (200, 60))
+
+
+def main():
+    """
+    Print the CPU time per frame and the CPU load at the default rate.
+    """
+    print(f"{'size':<10}{'ms/frame':>10}{'fps':>8}{'CPU %':>8}")
+    with open(os.devnull, 'w', encoding='ascii') as stream:
+        for columns, rows in SIZES:
+            unpaced = BinaryRain(columns, rows, seed=1).run(
+                stream, fps=1e9, frames=500)
+            paced = BinaryRain(columns, rows, seed=1).run(
+                stream, frames=BinaryRain.FPS * 3)
+            print(f"{f'{columns}x{rows}':<10}"
+                  f"{unpaced['cpu_seconds'] / unpaced['frames'] * 1000:>10.3f}"
+                  f"{paced['fps']:>8.1f}"
+                  f"{paced['cpu_seconds'] / paced['seconds'] * 100:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Measures the CPU cost per move and the strength of each difficulty."""
+
+import argparse
+import time
+from board import BoardGeometry, GameBoard
+from player import ComputerPlayer, RandomPlayer
+
+
+def play_games(difficulty, size, games):
+    """
+    Play a difficulty level against a random player and time its moves.
+
+    The players take turns at moving first.
+
+    Args:
+        difficulty: A key of ComputerPlayer.DIFFICULTY_LEVELS.
+        size: The number of rows and columns of the board.
+        games: The number of games to play.
+
+    Returns:
+        A tuple (CPU seconds per move, score), a win counting 1 and a
+        draw 0.5.
+    """
+    shape = (size, size, BoardGeometry.WIN_LENGTHS[size])
+    cpu, moves, score = 0.0, 0, 0.0
+    for game in range(games):
+        symbol, other = GameBoard.BOARD_PLAYER_X, GameBoard.BOARD_PLAYER_O
+        if game % 2:
+            symbol, other = other, symbol
+        players = {symbol: ComputerPlayer(symbol, difficulty=difficulty,
+                                          seed=game),
+                   other: RandomPlayer(other, seed=game)}
+        board = GameBoard(*shape)
+        while board.check_terminal_state() is None:
+            player = board.current_player()
+            start = time.process_time()
+            action = players[player].make_move(board)
+            if player == symbol:
+                cpu += time.process_time() - start
+                moves += 1
+            board.apply_action(action)
+        winner = board.check_terminal_state()
+        if winner == symbol:
+            score += 1
+        elif winner == 0:
+            score += 0.5
+    return cpu / max(moves, 1), score
+
+
+def main():
+    """
+    Print the CPU time per move and the score of every level and size.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[3, 5, 7])
+    parser.add_argument('--games', type=int, default=4,
+                        help="games against a random player per level")
+    args = parser.parse_args()
+    # Build the perfect play table before anything is timed
+    ComputerPlayer(GameBoard.BOARD_PLAYER_X,
+                   ComputerPlayer.SEARCH_PERFECT).make_move(GameBoard())
+    print(f"{'level':<8}{'board':>7}{'CPU ms/move':>13}{'score':>9}")
+    for difficulty in ComputerPlayer.DIFFICULTY_LEVELS:
+        for size in args.sizes:
+            cpu, score = play_games(difficulty, size, args.games)
+            print(f"{difficulty:<8}{f'{size}x{size}':>7}{cpu * 1000:>13.2f}"
+                  f"{f'{score:g}/{args.games}':>9}")
+
+
+if __name__ == '__main__':
+    main()
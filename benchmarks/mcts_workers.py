@@ -0,0 +1,100 @@
+"""Measures how MCTS playouts and strength scale with worker processes."""
+
+import argparse
+import os
+from board import GameBoard
+from mcts import MCTSPlayer
+
+
+def playouts_per_second(workers, shape, time_limit):
+    """
+    Search the empty board once and measure the playout rate.
+
+    Args:
+        workers: The number of worker processes.
+        shape: A tuple (rows, columns, win_length).
+        time_limit: Seconds to search.
+
+    Returns:
+        The number of playouts per second.
+    """
+    agent = MCTSPlayer(GameBoard.BOARD_PLAYER_X, time_limit=time_limit,
+                       workers=workers, seed=1)
+    try:
+        # The first move starts the worker processes, time the second
+        agent.make_move(GameBoard(*shape))
+        agent.make_move(GameBoard(*shape))
+    finally:
+        agent.close()
+    return agent.last_search['iterations'] / agent.last_search['elapsed']
+
+
+def play_match(workers, shape, time_limit, games):
+    """
+    Play a parallel player against a single process one.
+
+    Both players get the same time per move and take turns at moving
+    first.
+
+    Args:
+        workers: The number of worker processes of the parallel player.
+        shape: A tuple (rows, columns, win_length).
+        time_limit: Seconds per move.
+        games: The number of games to play.
+
+    Returns:
+        The score of the parallel player, a win counting 1 and a draw 0.5.
+    """
+    score = 0.0
+    for game in range(games):
+        parallel_symbol, single_symbol = GameBoard.BOARD_PLAYER_X, \
+            GameBoard.BOARD_PLAYER_O
+        if game % 2:
+            parallel_symbol, single_symbol = single_symbol, parallel_symbol
+        players = {
+            parallel_symbol: MCTSPlayer(parallel_symbol, time_limit=time_limit,
+                                        workers=workers, seed=game),
+            single_symbol: MCTSPlayer(single_symbol, time_limit=time_limit,
+                                      seed=game),
+        }
+        board = GameBoard(*shape)
+        try:
+            while board.check_terminal_state() is None:
+                board.apply_action(
+                    players[board.current_player()].make_move(board))
+        finally:
+            players[parallel_symbol].close()
+        winner = board.check_terminal_state()
+        if winner == parallel_symbol:
+            score += 1
+        elif winner == 0:
+            score += 0.5
+    return score
+
+
+def main():
+    """
+    Print playouts per second and match score for each worker count.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=5)
+    parser.add_argument('--win-length', type=int, default=4)
+    parser.add_argument('--time', type=float, default=0.2,
+                        help="seconds per move")
+    parser.add_argument('--games', type=int, default=4,
+                        help="games against one worker, 0 to skip")
+    args = parser.parse_args()
+    shape = (args.size, args.size, args.win_length)
+    counts = sorted({1, 2, 4, os.cpu_count() or 1})
+    print(f"{'workers':<9}{'playouts/s':>12}{'score vs 1':>12}")
+    for workers in counts:
+        rate = playouts_per_second(workers, shape, args.time)
+        score = ''
+        if args.games and workers > 1:
+            score = f"{play_match(workers, shape, args.time, args.games)}" \
+                    f"/{args.games}"
+        print(f"{workers:<9}{rate:>12.0f}{score:>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""Compares the memory allocated by a search with copying and in-place moves.
+
+The copying walk makes every move with apply_action, which copies the
+board list, and undoes it in place, as the search did before push and
+pop. The in-place walk uses push and pop. The memory the moves allocate is
+traced with tracemalloc and sys.getallocatedblocks while every board
+list is kept alive, timings are taken without tracing.
+"""
+
+import sys
+import time
+import tracemalloc
+from board import GameBoard
+from player import ComputerPlayer
+
+
+class CopyingBoard(GameBoard):
+    """Board that makes moves with apply_action and undoes them with pop."""
+
+    def push(self, action):
+        """
+        Apply an action with apply_action and remember it for pop.
+
+        Args:
+            action: A tuple containing the current player's symbol
+            and the index of the space on the board to mark.
+        """
+        self._replaced.append(self.board[action[1]])
+        self._winners.append(self._winners[-1])
+        self.apply_action(action)
+        self.move_stack.append(action)
+
+
+class RetainingBoard(GameBoard):
+    """Board that keeps every list it held after a move alive."""
+
+    def __init__(self):
+        """
+        Initialize the board and the list of kept board lists.
+        """
+        super().__init__()
+        self.kept = []
+
+    def push(self, action):
+        """
+        Make a move and keep the board list it left behind.
+
+        Kept lists cannot be freed and reused, so the memory traced
+        after the search holds every list the moves allocated. Moves in
+        place keep the same list over and over, which costs nothing.
+
+        Args:
+            action: A tuple containing the current player's symbol
+            and the index of the space on the board to mark.
+        """
+        super().push(action)
+        self.kept.append(self.board)
+
+
+class RetainingCopyingBoard(RetainingBoard, CopyingBoard):
+    """Copying board that keeps every list it held after a move alive."""
+
+
+def run_search(board_class, cells, search_mode):
+    """
+    Run one computer move and time it.
+
+    Args:
+        board_class: The board class to search on.
+        cells: The starting position as a list of 9 symbols.
+        search_mode: The ComputerPlayer search mode.
+
+    Returns:
+        A tuple (nodes, seconds).
+    """
+    board = board_class()
+    board.board = list(cells)
+    agent = ComputerPlayer(board.current_player(), search_mode)
+    start = time.perf_counter()
+    agent.make_move(board)
+    return agent.nodes_visited, time.perf_counter() - start
+
+
+def measure_search(board_class, cells, search_mode):
+    """
+    Run one computer move on a RetainingBoard and trace its memory.
+
+    Args:
+        board_class: RetainingBoard or RetainingCopyingBoard.
+        cells: The starting position as a list of 9 symbols.
+        search_mode: The ComputerPlayer search mode.
+
+    Returns:
+        A tuple (bytes, blocks) the moves allocated, without the list
+        that keeps them.
+    """
+    board = board_class()
+    board.board = list(cells)
+    agent = ComputerPlayer(board.current_player(), search_mode)
+    tracemalloc.start()
+    try:
+        blocks = sys.getallocatedblocks()
+        agent.make_move(board)
+        allocated = tracemalloc.get_traced_memory()[0]
+        blocks = sys.getallocatedblocks() - blocks
+    finally:
+        tracemalloc.stop()
+    # The kept list is larger than a small block and not among them
+    return allocated - sys.getsizeof(board.kept), blocks
+
+
+def main():
+    """
+    Print the memory allocated per node and the time per search for both
+    ways of moving.
+    """
+    positions = {
+        "empty board": [GameBoard.BOARD_EMPTY] * 9,
+        "after X center": [0, 0, 0, 0, "X", 0, 0, 0, 0],
+    }
+    walks = (("copying", CopyingBoard, RetainingCopyingBoard),
+             ("push/pop", GameBoard, RetainingBoard))
+    print(f"{'position':<16}{'search':<11}{'board':<10}{'nodes':>9}"
+          f"{'bytes/node':>12}{'blocks/node':>13}{'ms':>10}")
+    for name, cells in positions.items():
+        for search_mode in (ComputerPlayer.SEARCH_MINIMAX,
+                            ComputerPlayer.SEARCH_ALPHA_BETA):
+            for label, board_class, retaining_class in walks:
+                allocated, blocks = measure_search(retaining_class, cells,
+                                                   search_mode)
+                runs = [run_search(board_class, cells, search_mode)
+                        for _ in range(3)]
+                nodes = runs[0][0]
+                elapsed = min(run[1] for run in runs)
+                print(f"{name:<16}{search_mode:<11}{label:<10}{nodes:>9}"
+                      f"{allocated / nodes:>12.1f}{blocks / nodes:>13.2f}"
+                      f"{elapsed * 1000:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""Measures move latency of the game server under many open sessions.
+
+Start the server first, e.g. ``python server.py``, then run
+``python -m benchmarks.server_load --sessions 1000`` and again with
+``--sessions 10000``. Each session is one TCP connection, so the open
+file limit (``ulimit -n``) must be above the number of sessions.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+
+async def play_session(host, port, games, latencies, rng):
+    """
+    Play games against the computer over one connection.
+
+    Args:
+        host: The server address.
+        port: The server port.
+        games: The number of games to play.
+        latencies: A list the seconds per move request are appended to.
+        rng: The random generator picking the moves.
+
+    Returns:
+        The number of error responses.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    errors = 0
+
+    async def request(message):
+        writer.write(json.dumps(message).encode() + b"\n")
+        await writer.drain()
+        return json.loads(await reader.readline())
+
+    try:
+        for _ in range(games):
+            state = await request({"op": "new"})
+            while state.get("ok") and state["result"] is None:
+                start = time.perf_counter()
+                state = await request({"op": "move", "index":
+                                       rng.choice(state["legal_moves"])})
+                latencies.append(time.perf_counter() - start)
+            errors += not state.get("ok")
+    finally:
+        writer.close()
+    return errors
+
+
+async def run_load(host, port, sessions, games, seed):
+    """
+    Run all sessions at once and collect their move latencies.
+
+    Args:
+        host: The server address.
+        port: The server port.
+        sessions: The number of concurrent connections.
+        games: The number of games per connection.
+        seed: The seed of the random moves.
+
+    Returns:
+        A tuple (latencies, errors, failed connections, seconds).
+    """
+    rng = random.Random(seed)
+    latencies = []
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(play_session(host, port, games, latencies,
+                       random.Random(rng.getrandbits(32)))
+          for _ in range(sessions)),
+        return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    errors = sum(result for result in results if isinstance(result, int))
+    failed = sum(isinstance(result, Exception) for result in results)
+    return latencies, errors, failed, elapsed
+
+
+def main():
+    """
+    Print p50 and p99 move latency for each number of sessions.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--sessions', type=int, nargs='+',
+                        default=[1000, 10000])
+    parser.add_argument('--games', type=int, default=1,
+                        help="games per session")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    print(f"{'sessions':>9}{'moves':>9}{'p50 ms':>9}{'p99 ms':>9}"
+          f"{'moves/s':>10}{'errors':>8}{'failed':>8}")
+    for sessions in args.sessions:
+        latencies, errors, failed, elapsed = asyncio.run(
+            run_load(args.host, args.port, sessions, args.games, args.seed))
+        if len(latencies) < 2:
+            print(f"{sessions:>9}  no moves completed, {failed} sessions "
+                  f"failed to connect")
+            continue
+        cuts = statistics.quantiles(latencies, n=100)
+        print(f"{sessions:>9}{len(latencies):>9}{cuts[49] * 1000:>9.1f}"
+              f"{cuts[98] * 1000:>9.1f}{len(latencies) / elapsed:>10.0f}"
+              f"{errors:>8}{failed:>8}")
+
+
+if __name__ == '__main__':
+    main()
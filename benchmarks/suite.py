@@ -0,0 +1,343 @@
+"""Times the engine, board and persistence hot paths.
+
+Run ``python -m benchmarks.suite --output baseline.json`` once, then
+``python -m benchmarks.suite --compare baseline.json`` after a change to
+flag cases whose median time grew by more than the threshold. The exit
+status is 1 when a regression was found.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from unittest.mock import patch
+from board import GameBoard
+from controller import GameManager
+from player import ComputerPlayer
+from savestore import SaveStore
+
+# A position after X center, O corner, X opposite corner
+MIDGAME = [GameBoard.BOARD_PLAYER_O, 0, 0,
+           0, GameBoard.BOARD_PLAYER_X, 0,
+           0, 0, GameBoard.BOARD_PLAYER_X]
+# Six marks on a 5x5 board, X to move
+MIDGAME_5X5 = [0, 0, 0, 0, 0,
+               0, "O", "X", 0, 0,
+               0, "X", "X", "O", 0,
+               0, 0, "O", 0, 0,
+               0, 0, 0, 0, 0]
+
+# Calls per run of the apply_action case, each needs a board of its own
+APPLY_ACTION_NUMBER = 10000
+
+
+def _board(cells, rows=3, columns=3, win_length=3):
+    """
+    Build a board holding the given spaces.
+
+    Args:
+        cells: The spaces as a list of symbols.
+        rows: The number of rows.
+        columns: The number of columns.
+        win_length: How many marks in a row win the game.
+
+    Returns:
+        The GameBoard.
+    """
+    board = GameBoard(rows, columns, win_length)
+    board.board = list(cells)
+    return board
+
+
+def make_move_case(search_mode, cells, **options):
+    """
+    Create a case timing one computer move.
+
+    Args:
+        search_mode: The ComputerPlayer search mode.
+        cells: The starting position.
+        **options: Board dimensions and ComputerPlayer keyword arguments.
+
+    Returns:
+        A case factory for BENCHMARKS.
+    """
+    shape = {key: options.pop(key) for key in ('rows', 'columns',
+                                               'win_length')
+             if key in options}
+
+    def factory(stack):
+        del stack
+        board = _board(cells, **shape)
+        agent = ComputerPlayer(board.current_player(), search_mode,
+                               **options)
+        return lambda: agent.make_move(board)
+    return factory
+
+
+def check_terminal_state_case(stack):
+    """
+    Create a case timing check_terminal_state on a midgame board.
+    """
+    del stack
+    board = _board(MIDGAME)
+    return board.check_terminal_state
+
+
+def available_actions_case(stack):
+    """
+    Create a case timing available_actions on a midgame board.
+    """
+    del stack
+    board = _board(MIDGAME)
+    return board.available_actions
+
+
+def apply_action_case(stack):
+    """
+    Create a case timing apply_action, which copies the board.
+
+    Every call marks an empty space of its own midgame board, as in a
+    game. Marking a taken space would rescan every line. The boards are
+    built before each run, outside the timing.
+    """
+    del stack
+    boards = []
+    action = (GameBoard.BOARD_PLAYER_O, 1)
+
+    def before_run():
+        boards[:] = [_board(MIDGAME) for _ in range(APPLY_ACTION_NUMBER)]
+
+    def apply_action():
+        boards.pop().apply_action(action)
+    apply_action.before_run = before_run
+    return apply_action
+
+
+def save_load_case(stack):
+    """
+    Create a case timing a save_game_state and load_game_state round trip
+    through JSON files.
+
+    The game is saved to and loaded from a temporary directory, with the
+    prompts answered by a patched GameView.
+    """
+    directory = stack.enter_context(tempfile.TemporaryDirectory())
+    previous = os.getcwd()
+    os.chdir(directory)
+    stack.callback(os.chdir, previous)
+    view = stack.enter_context(patch('controller.GameView'))
+    manager = GameManager()
+    manager.board = _board(MIDGAME)
+    manager.start_menu = lambda: None
+
+    def round_trip():
+        view.input_prompt.return_value = "bench"
+        manager.save_game_state()
+        view.input_prompt.return_value = "1"
+        manager.load_game_state()
+    return round_trip
+
+
+def store_save_load_case(stack):
+    """
+    Create a case timing a save_game_state and load_game_state round trip
+    through a SaveStore.
+
+    The store is a database file in a temporary directory, with the
+    prompts answered by a patched GameView.
+    """
+    directory = stack.enter_context(tempfile.TemporaryDirectory())
+    store = stack.enter_context(SaveStore(os.path.join(directory, "saves.db")))
+    view = stack.enter_context(patch('controller.GameView'))
+    manager = GameManager(store)
+    manager.board = _board(MIDGAME)
+    manager.start_menu = lambda: None
+
+    def round_trip():
+        view.input_prompt.return_value = "bench"
+        manager.save_game_state()
+        view.input_prompt.return_value = "1"
+        manager.load_game_state()
+    return round_trip
+
+
+# name: (case factory, calls per timed run)
+BENCHMARKS = {
+    'make_move[perfect,empty]': (
+        make_move_case(ComputerPlayer.SEARCH_PERFECT, [0] * 9), 1000),
+    'make_move[alphabeta,empty]': (
+        make_move_case(ComputerPlayer.SEARCH_ALPHA_BETA, [0] * 9), 1),
+    'make_move[minimax,midgame]': (
+        make_move_case(ComputerPlayer.SEARCH_MINIMAX, MIDGAME), 1),
+    'make_move[alphabeta,midgame]': (
+        make_move_case(ComputerPlayer.SEARCH_ALPHA_BETA, MIDGAME), 10),
+    'make_move[iterative,5x5 midgame]': (
+        make_move_case(ComputerPlayer.SEARCH_ITERATIVE, MIDGAME_5X5,
+                       rows=5, columns=5, win_length=4, node_limit=20000),
+        1),
+    'check_terminal_state': (check_terminal_state_case, 100000),
+    'available_actions': (available_actions_case, 100000),
+    'apply_action': (apply_action_case, APPLY_ACTION_NUMBER),
+    'save_load_round_trip': (save_load_case, 100),
+    'save_load_round_trip[store]': (store_save_load_case, 100),
+}
+
+
+def time_case(factory, number, repeat=5, warmup=1):
+    """
+    Time a case.
+
+    Args:
+        factory: A function taking a contextlib.ExitStack and returning
+        the callable to time. If the callable has a before_run
+        attribute, it is called before every run, outside the timing.
+        number: How often the callable is called per timed run.
+        repeat: The number of timed runs.
+        warmup: The number of untimed runs before them.
+
+    Returns:
+        A dictionary of seconds per call: min, median, mean and stdev
+        over the runs, with number and repeat.
+    """
+    with contextlib.ExitStack() as stack:
+        function = factory(stack)
+        before_run = getattr(function, 'before_run', None)
+        timings = []
+        for run in range(warmup + repeat):
+            if before_run is not None:
+                before_run()
+            start = time.perf_counter()
+            for _ in range(number):
+                function()
+            if run >= warmup:
+                timings.append((time.perf_counter() - start) / number)
+    return {
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.fmean(timings),
+        'stdev': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        'number': number,
+        'repeat': repeat,
+    }
+
+
+def run_suite(names=None, repeat=5, warmup=1):
+    """
+    Time the selected cases.
+
+    Args:
+        names: Optional list of case names, every case if None.
+        repeat: The number of timed runs per case.
+        warmup: The number of untimed runs per case.
+
+    Returns:
+        A dictionary with the environment and the results per case.
+    """
+    results = {}
+    for name in names or BENCHMARKS:
+        factory, number = BENCHMARKS[name]
+        results[name] = time_case(factory, number, repeat, warmup)
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+
+def compare(report, baseline, threshold=0.10):
+    """
+    Compare median times with a baseline report.
+
+    Args:
+        report: A report returned by run_suite.
+        baseline: An earlier report.
+        threshold: The relative slowdown that counts as a regression.
+
+    Returns:
+        A list of tuples (name, baseline median, median, ratio, verdict)
+        with verdict "regression", "faster", "ok" or "new".
+    """
+    rows = []
+    for name, result in report['results'].items():
+        before = baseline['results'].get(name)
+        if before is None:
+            rows.append((name, None, result['median'], None, 'new'))
+            continue
+        ratio = result['median'] / before['median']
+        verdict = 'ok'
+        if ratio > 1 + threshold:
+            verdict = 'regression'
+        elif ratio < 1 - threshold:
+            verdict = 'faster'
+        rows.append((name, before['median'], result['median'], ratio,
+                     verdict))
+    return rows
+
+
+def _format_time(seconds):
+    """
+    Format seconds with a readable unit.
+    """
+    if seconds is None:
+        return '-'
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main(argv=None):
+    """
+    Run the suite from the command line.
+
+    Args:
+        argv: Optional command line arguments, sys.argv is used if None.
+
+    Returns:
+        The exit status, 1 if a regression was found.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--filter', default='',
+                        help="only run cases whose name contains this")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--output', help="write the report to this file")
+    parser.add_argument('--compare', help="baseline report to compare with")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="slowdown counted as a regression, 0.10 = 10%%")
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS if args.filter in name]
+    report = run_suite(names, args.repeat, args.warmup)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+
+    if not args.compare:
+        print(f"{'case':<36}{'median':>12}{'min':>12}{'stdev':>12}")
+        for name, result in report['results'].items():
+            print(f"{name:<36}{_format_time(result['median']):>12}"
+                  f"{_format_time(result['min']):>12}"
+                  f"{_format_time(result['stdev']):>12}")
+        return 0
+
+    with open(args.compare, 'r', encoding='utf-8') as file:
+        baseline = json.load(file)
+    rows = compare(report, baseline, args.threshold)
+    print(f"{'case':<36}{'baseline':>12}{'now':>12}{'ratio':>8}  verdict")
+    for name, before, now, ratio, verdict in rows:
+        ratio_text = '-' if ratio is None else f"{ratio:.2f}"
+        print(f"{name:<36}{_format_time(before):>12}{_format_time(now):>12}"
+              f"{ratio_text:>8}  {verdict}")
+    return 1 if any(row[4] == 'regression' for row in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,157 @@
 """Takes care of the game board and its state."""
 
-from collections import Counter
+import random
+from operator import itemgetter
+
+
+def _lines_through(lines, size):
+    """
+    Group the winning lines by the spaces they contain.
+
+    Args:
+        lines: The winning lines as tuples of space indexes.
+        size: The number of spaces on the board.
+
+    Returns:
+        A tuple holding, for every space, the lines through it.
+    """
+    return tuple(tuple(line for line in lines if index in line)
+                 for index in range(size))
+
+
+class BoardGeometry:
+    """Precomputed lines and symmetries of a board shape."""
+    DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+    # Marks in a row needed to win on each supported square board size
+    WIN_LENGTHS = {3: 3, 4: 4, 5: 4, 6: 5, 7: 5}
+    _cache = {}
+
+    def __init__(self, rows, columns, win_length):
+        """
+        Precompute the winning lines of a rows x columns board.
+
+        Args:
+            rows: The number of rows.
+            columns: The number of columns.
+            win_length: How many marks in a row win the game.
+        """
+        if rows < 1 or columns < 1 \
+                or not 1 <= win_length <= max(rows, columns):
+            raise ValueError("Invalid board dimensions")
+        self.rows = rows
+        self.columns = columns
+        self.win_length = win_length
+        self.size = rows * columns
+        self.lines = self._find_lines()
+        self.lines_through = _lines_through(self.lines, self.size)
+        self.symmetries = self._find_symmetries()
+        # Read a board in the order of each symmetry but the identity
+        self.symmetry_views = tuple(itemgetter(*symmetry)
+                                    for symmetry in self.symmetries[1:]) \
+            if self.size > 1 else ()
+        self.zobrist, self.zobrist_side = self._zobrist_keys()
+        # Spaces on many lines first: center, corners, then edges on 3x3
+        self.move_order = tuple(sorted(
+            range(self.size),
+            key=lambda index: (-len(self.lines_through[index]),
+                               self._distance_to_center(index), index)))
+
+    @classmethod
+    def get(cls, rows, columns, win_length):
+        """
+        Return the shared geometry of a board shape.
+
+        Args:
+            rows: The number of rows.
+            columns: The number of columns.
+            win_length: How many marks in a row win the game.
+
+        Returns:
+            The BoardGeometry, computed on first use.
+        """
+        key = (rows, columns, win_length)
+        if key not in cls._cache:
+            cls._cache[key] = cls(rows, columns, win_length)
+        return cls._cache[key]
+
+    def _distance_to_center(self, index):
+        """
+        Measure how far a space is from the center of the board.
+
+        Args:
+            index: The index of the space.
+
+        Returns:
+            The squared distance, in half spaces, to the center.
+        """
+        row, column = divmod(index, self.columns)
+        return (2 * row - self.rows + 1) ** 2 \
+            + (2 * column - self.columns + 1) ** 2
+
+    def _find_lines(self):
+        """
+        List every run of win_length spaces in a straight line.
+
+        Returns:
+            A tuple of lines, each a tuple of space indexes.
+        """
+        lines = []
+        reach = self.win_length - 1
+        for row in range(self.rows):
+            for column in range(self.columns):
+                for row_step, column_step in self.DIRECTIONS:
+                    if 0 <= row + row_step * reach < self.rows \
+                            and 0 <= column + column_step * reach < self.columns:
+                        lines.append(tuple(
+                            (row + row_step * i) * self.columns
+                            + column + column_step * i
+                            for i in range(self.win_length)))
+        return tuple(lines)
+
+    def _find_symmetries(self):
+        """
+        List the rotations and reflections that map the board onto itself.
+
+        Returns:
+            A tuple of index permutations, 8 for square boards, else 4.
+        """
+        last_row, last_column = self.rows - 1, self.columns - 1
+        transforms = [lambda r, c: (r, c),
+                      lambda r, c: (r, last_column - c),
+                      lambda r, c: (last_row - r, c),
+                      lambda r, c: (last_row - r, last_column - c)]
+        if self.rows == self.columns:
+            transforms += [lambda r, c: (c, r),
+                           lambda r, c: (last_column - c, r),
+                           lambda r, c: (c, last_row - r),
+                           lambda r, c: (last_column - c, last_row - r)]
+        symmetries = []
+        for transform in transforms:
+            symmetry = []
+            for index in range(self.size):
+                row, column = transform(*divmod(index, self.columns))
+                symmetry.append(row * self.columns + column)
+            symmetries.append(tuple(symmetry))
+        return tuple(symmetries)
+
+    def _zobrist_keys(self):
+        """
+        Draw the random 64-bit keys of Zobrist hashing.
+
+        The generator is seeded with the board shape, so every process
+        draws the same keys and hashes can be stored and compared.
+
+        Returns:
+            A tuple (keys, side). keys holds, for every space, a
+            dictionary of one key per player symbol, side is the key of
+            O being the side to move.
+        """
+        generator = random.Random(
+            f"zobrist {self.rows}x{self.columns}x{self.win_length}")
+        keys = tuple({GameBoard.BOARD_PLAYER_X: generator.getrandbits(64),
+                      GameBoard.BOARD_PLAYER_O: generator.getrandbits(64)}
+                     for _ in range(self.size))
+        return keys, generator.getrandbits(64)
 
 
 class GameBoard:
@@ -8,13 +159,71 @@ class GameBoard:
     BOARD_EMPTY = 0
     BOARD_PLAYER_X = "X"
     BOARD_PLAYER_O = "O"
+    CELL_CODES = {BOARD_EMPTY: 0, BOARD_PLAYER_X: 1, BOARD_PLAYER_O: 2}
 
-    def __init__(self):
+    def __init__(self, rows=3, columns=3, win_length=3):
         """
         Initialize the game board with empty spaces.
+
+        Args:
+            rows: The number of rows.
+            columns: The number of columns.
+            win_length: How many marks in a row win the game.
         """
-        self.board = [self.BOARD_EMPTY for _ in range(9)]
+        self.geometry = BoardGeometry.get(rows, columns, win_length)
+        self._zobrist = self.geometry.zobrist
         self.current_turn = None
+        self.move_stack = []
+        # The symbol each pushed action replaced, restored by pop
+        self._replaced = []
+        self.board = [self.BOARD_EMPTY for _ in range(self.geometry.size)]
+
+    @property
+    def rows(self):
+        """
+        The number of rows of the board.
+        """
+        return self.geometry.rows
+
+    @property
+    def columns(self):
+        """
+        The number of columns of the board.
+        """
+        return self.geometry.columns
+
+    @property
+    def win_length(self):
+        """
+        How many marks in a row win the game.
+        """
+        return self.geometry.win_length
+
+    @property
+    def board(self):
+        """
+        The spaces of the board as a list of symbols.
+
+        Piece counts, empty spaces, the winner and the Zobrist hash are
+        tracked alongside the list. They are derived again when a new
+        list is assigned, single spaces should be changed with apply_action or push/pop.
+        """
+        return self._board
+
+    @board.setter
+    def board(self, spaces):
+        self._board = spaces
+        self._counts = {self.BOARD_PLAYER_X: 0, self.BOARD_PLAYER_O: 0}
+        self._empty = set()
+        self._hash = 0
+        for index, space in enumerate(spaces):
+            if space in self._counts:
+                self._counts[space] += 1
+                self._hash ^= self._zobrist[index][space]
+            elif space == self.BOARD_EMPTY:
+                self._empty.add(index)
+        # The last entry is the current winner, one more per pushed move
+        self._winners = [self._scan_winner()]
 
     def set_current_player(self, player):
         """
@@ -35,10 +244,9 @@ class GameBoard:
         Returns:
             The symbol of the current player.
         """
-        counter = Counter(self.board)
-        x_count = counter[self.BOARD_PLAYER_X]
-        o_count = counter[self.BOARD_PLAYER_O]
-        if x_count + o_count == 9:
+        x_count = self._counts[self.BOARD_PLAYER_X]
+        o_count = self._counts[self.BOARD_PLAYER_O]
+        if x_count + o_count == self.geometry.size:
             return None
         return self.BOARD_PLAYER_O if x_count > o_count \
             else self.BOARD_PLAYER_X
@@ -50,14 +258,7 @@ class GameBoard:
         Returns:
             The symbol of the current player.
         """
-        # Existing logic to calculate the current player
-        counter = Counter(self.board)
-        x_count = counter[self.BOARD_PLAYER_X]
-        o_count = counter[self.BOARD_PLAYER_O]
-        if x_count + o_count == 9:
-            return None
-        return self.BOARD_PLAYER_O if x_count > o_count \
-                                   else self.BOARD_PLAYER_X
+        return self.current_player()
 
     def available_actions(self):
         """
@@ -67,8 +268,32 @@ class GameBoard:
             A list of tuples with player symbols.
         """
         player = self.current_player()
-        return [(player, i) for i,
-                space in enumerate(self.board) if space == self.BOARD_EMPTY]
+        return [(player, i) for i in sorted(self._empty)]
+
+    def unique_actions(self):
+        """
+        Determine the available actions, one for each class of equivalent
+        moves.
+
+        When a rotation or reflection maps the position onto itself, moves
+        it maps onto each other lead to equivalent games. Only the lowest
+        index of each such class is kept, e.g. center, corner 0 and
+        edge 1 on the empty 3x3 board.
+
+        Returns:
+            A list of tuples with player symbols, in index order.
+        """
+        actions = self.available_actions()
+        board = self.board
+        spaces = tuple(board)
+        fixed = [symmetry for symmetry, view
+                 in zip(self.geometry.symmetries[1:],
+                        self.geometry.symmetry_views)
+                 if view(board) == spaces]
+        if not fixed:
+            return actions
+        return [action for action in actions
+                if all(symmetry[action[1]] >= action[1] for symmetry in fixed)]
 
     def apply_action(self, action):
         """
@@ -79,9 +304,94 @@ class GameBoard:
             and the index of the space on the board to mark.
         """
         player, index = action
-        new_board = self.board.copy()
+        new_board = self._board.copy()
+        previous = new_board[index]
         new_board[index] = player
-        self.board = new_board
+        self._board = new_board
+        self._place(index, previous, player)
+
+    def push(self, action):
+        """
+        Apply an action in place and remember it so it can be undone.
+
+        Unlike apply_action the board list is not copied, which makes
+        push and pop the cheap way to walk the game tree. Pushed actions
+        should be popped before the board is changed in any other way.
+
+        Args:
+            action: A tuple containing the current player's symbol
+            and the index of the space on the board to mark.
+        """
+        player, index = action
+        previous = self._board[index]
+        self._board[index] = player
+        self.move_stack.append(action)
+        self._replaced.append(previous)
+        self._winners.append(self._winners[-1])
+        self._place(index, previous, player)
+
+    def pop(self):
+        """
+        Undo the last action applied with push by restoring its space.
+
+        Returns:
+            The action that was undone.
+        """
+        action = self.move_stack.pop()
+        index = action[1]
+        replaced = self._replaced.pop()
+        previous = self._board[index]
+        self._board[index] = replaced
+        self._count(index, previous, replaced)
+        self._winners.pop()
+        return action
+
+    def _place(self, index, previous, space):
+        """
+        Update the tracked state after a space was changed.
+
+        Only the lines through the changed space are checked, unless a
+        piece was overwritten and a finished line may have been broken.
+
+        Args:
+            index: The index of the changed space.
+            previous: The symbol that was in the space before.
+            space: The symbol now in the space.
+        """
+        self._count(index, previous, space)
+        if previous in self._counts:
+            self._winners[-1] = self._scan_winner()
+        elif self._winners[-1] is None and space in self._counts:
+            board = self._board
+            for line in self.geometry.lines_through[index]:
+                for other in line:
+                    if board[other] != space:
+                        break
+                else:
+                    self._winners[-1] = space
+                    break
+
+    def _count(self, index, previous, space):
+        """
+        Update the piece counts, empty spaces and hash for a changed space.
+
+        Args:
+            index: The index of the changed space.
+            previous: The symbol that was in the space before.
+            space: The symbol now in the space.
+        """
+        counts = self._counts
+        keys = self._zobrist[index]
+        if previous in counts:
+            counts[previous] -= 1
+            self._hash ^= keys[previous]
+        elif previous == self.BOARD_EMPTY:
+            self._empty.discard(index)
+        if space in counts:
+            counts[space] += 1
+            self._hash ^= keys[space]
+        elif space == self.BOARD_EMPTY:
+            self._empty.add(index)
 
     def check_terminal_state(self):
         """
@@ -91,18 +401,270 @@ class GameBoard:
             The symbol of the winning player, if there is one. 
             If the game is a draw, returns 0. If the game is not over, returns None.
         """
-        for i in range(3):
-            if self.board[3*i] == self.board[3*i + 1] == \
-                self.board[3*i + 2] != self.BOARD_EMPTY:
-                return self.board[3*i]
-            if self.board[i] == self.board[i + 3] == \
-                self.board[i + 6] != self.BOARD_EMPTY:
-                return self.board[i]
+        winner = self._winners[-1]
+        if winner is not None:
+            return winner
+        return 0 if self.current_player() is None else None
 
-        if self.board[0] == self.board[4] \
-        == self.board[8] != self.BOARD_EMPTY \
-        or self.board[2] == self.board[4] \
-        == self.board[6] != self.BOARD_EMPTY:
-            return self.board[4]
+    def winner(self):
+        """
+        Return the player who has completed a line.
 
-        return 0 if self.current_player() is None else None
+        Returns:
+            The symbol of the winning player, or None.
+        """
+        return self._winners[-1]
+
+    def _scan_winner(self):
+        """
+        Search all lines of the board for a winner.
+
+        Returns:
+            The symbol of the winning player, or None.
+        """
+        board = self._board
+        for line in self.geometry.lines:
+            first = board[line[0]]
+            if first != self.BOARD_EMPTY \
+                    and all(board[index] == first for index in line):
+                return first
+        return None
+
+    def zobrist_key(self):
+        """
+        Return the 64-bit Zobrist hash of the position.
+
+        The hash is the XOR of one random key per mark on the board and,
+        when O is to move, a side to move key. It is kept up to date in
+        O(1) per changed space, which makes it a cheap key for caches.
+        Unlike canonical_key, symmetric positions get different hashes.
+
+        Returns:
+            The hash as an int below 2**64.
+        """
+        if self._counts[self.BOARD_PLAYER_X] > \
+                self._counts[self.BOARD_PLAYER_O]:
+            return self._hash ^ self.geometry.zobrist_side
+        return self._hash
+
+    def canonical_key(self):
+        """
+        Compute a key shared by all rotations and reflections of the board.
+
+        Returns:
+            The smallest base-3 encoding of the board over all symmetries.
+        """
+        return self.canonical_form()[0]
+
+    def canonical_form(self):
+        """
+        Find the key of canonical_key and the symmetry that produces it.
+
+        Space i of the canonical board is space symmetry[i] of this board,
+        which maps moves between the two.
+
+        Returns:
+            A tuple (key, symmetry) with symmetry a tuple of indexes.
+        """
+        codes = [self.CELL_CODES.get(space, 0) for space in self.board]
+        best_key = best_symmetry = None
+        for symmetry in self.geometry.symmetries:
+            key = 0
+            for index in symmetry:
+                key = key * 3 + codes[index]
+            if best_key is None or key < best_key:
+                best_key, best_symmetry = key, symmetry
+        return best_key, best_symmetry
+
+
+def _winning_patterns(masks, full_mask):
+    """
+    Precompute which sets of marks contain a winning line.
+
+    Args:
+        masks: The bitmasks of the winning lines.
+        full_mask: The bitmask with every cell set.
+
+    Returns:
+        A tuple telling for every bitmask whether it covers a line.
+    """
+    return tuple(any(bits & mask == mask for mask in masks)
+                 for bits in range(full_mask + 1))
+
+
+class BitBoard(GameBoard):
+    """Board handeling class keeping each player's marks in a 9-bit integer."""
+    # Bit i is set when the player holds cell i
+    WIN_MASKS = (0b000000111, 0b000111000, 0b111000000,
+                 0b001001001, 0b010010010, 0b100100100,
+                 0b100010001, 0b001010100)
+    FULL_MASK = 0b111111111
+    # WINNING_PATTERNS[bits] tells whether bits contain a full line
+    WINNING_PATTERNS = _winning_patterns(WIN_MASKS, FULL_MASK)
+
+    def __init__(self):
+        """
+        Initialize the game board with no marks for either player.
+        """
+        self.x_bits = 0
+        self.o_bits = 0
+        super().__init__()
+
+    @property
+    def board(self):
+        """
+        The board as a list of 9 symbols, like GameBoard.board.
+
+        The list is a copy, changes to it do not affect the board.
+        """
+        return [self.BOARD_PLAYER_X if self.x_bits >> i & 1
+                else self.BOARD_PLAYER_O if self.o_bits >> i & 1
+                else self.BOARD_EMPTY for i in range(9)]
+
+    @board.setter
+    def board(self, cells):
+        x_bits = o_bits = 0
+        self._hash = 0
+        for i, space in enumerate(cells):
+            if space == self.BOARD_PLAYER_X:
+                x_bits |= 1 << i
+            elif space == self.BOARD_PLAYER_O:
+                o_bits |= 1 << i
+            else:
+                continue
+            self._hash ^= self.geometry.zobrist[i][space]
+        self.x_bits = x_bits
+        self.o_bits = o_bits
+
+    def current_player(self):
+        """
+        Determine the current player from the number of marks.
+
+        Returns:
+            The symbol of the current player.
+        """
+        x_count = self.x_bits.bit_count()
+        o_count = self.o_bits.bit_count()
+        if x_count + o_count == 9:
+            return None
+        return self.BOARD_PLAYER_O if x_count > o_count \
+            else self.BOARD_PLAYER_X
+
+    def _calculate_current_player(self):
+        """
+        Calculate the current player from the number of marks.
+
+        Returns:
+            The symbol of the current player.
+        """
+        return self.current_player()
+
+    def available_actions(self):
+        """
+        Determine the available actions for the current player.
+
+        Returns:
+            A list of tuples with player symbols.
+        """
+        player = self.current_player()
+        empty = ~(self.x_bits | self.o_bits)
+        return [(player, i) for i in range(9) if empty >> i & 1]
+
+    def apply_action(self, action):
+        """
+        Apply an action to the game board.
+
+        Args:
+            action: A tuple containing the current player's symbol
+            and the index of the space on the board to mark.
+        """
+        player, index = action
+        self._clear(index)
+        bit = 1 << index
+        if player == self.BOARD_PLAYER_X:
+            self.x_bits |= bit
+        elif player == self.BOARD_PLAYER_O:
+            self.o_bits |= bit
+        else:
+            return
+        self._hash ^= self.geometry.zobrist[index][player]
+
+    def push(self, action):
+        """
+        Apply an action and remember it so it can be undone.
+
+        Args:
+            action: A tuple containing the current player's symbol
+            and the index of the space on the board to mark.
+        """
+        index = action[1]
+        bit = 1 << index
+        self._replaced.append(self.BOARD_PLAYER_X if self.x_bits & bit
+                              else self.BOARD_PLAYER_O if self.o_bits & bit
+                              else self.BOARD_EMPTY)
+        self.apply_action(action)
+        self.move_stack.append(action)
+
+    def pop(self):
+        """
+        Undo the last action applied with push by restoring its space.
+
+        Returns:
+            The action that was undone.
+        """
+        action = self.move_stack.pop()
+        self.apply_action((self._replaced.pop(), action[1]))
+        return action
+
+    def _clear(self, index):
+        """
+        Remove the mark in a space and its key from the hash.
+
+        Args:
+            index: The index of the space.
+        """
+        bit = 1 << index
+        keys = self.geometry.zobrist[index]
+        if self.x_bits & bit:
+            self.x_bits &= ~bit
+            self._hash ^= keys[self.BOARD_PLAYER_X]
+        elif self.o_bits & bit:
+            self.o_bits &= ~bit
+            self._hash ^= keys[self.BOARD_PLAYER_O]
+
+    def zobrist_key(self):
+        """
+        Return the 64-bit Zobrist hash of the position.
+
+        Returns:
+            The same hash as GameBoard.zobrist_key.
+        """
+        if self.x_bits.bit_count() > self.o_bits.bit_count():
+            return self._hash ^ self.geometry.zobrist_side
+        return self._hash
+
+    def check_terminal_state(self):
+        """
+        Check if the game is in a terminal state.
+
+        Returns:
+            The symbol of the winning player, if there is one.
+            If the game is a draw, returns 0. If the game is not over, returns None.
+        """
+        winner = self.winner()
+        if winner is not None:
+            return winner
+        return 0 if self.x_bits | self.o_bits == self.FULL_MASK else None
+
+    def winner(self):
+        """
+        Return the player who has completed a line.
+
+        Returns:
+            The symbol of the winning player, or None.
+        """
+        if self.WINNING_PATTERNS[self.x_bits]:
+            return self.BOARD_PLAYER_X
+        if self.WINNING_PATTERNS[self.o_bits]:
+            return self.BOARD_PLAYER_O
+        return None
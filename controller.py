@@ -1,26 +1,73 @@
 """ Controller module for gamelogic """
 from datetime import datetime
-import random
 import json
 import os
+import sqlite3
 import sys
 from pathlib import Path
-from board import GameBoard
+from board import BoardGeometry, GameBoard
+from game import Game
 from player import HumanPlayer, ComputerPlayer
-from view import GameView
+from ponder import Ponderer
+from savestore import SaveStore
+from view import BinaryRain, GameView
 
 
 class GameManager:
-    """ Brain of the operation"""
+    """ Terminal front end that drives a Game with GameView """
+    WIN_LENGTHS = BoardGeometry.WIN_LENGTHS
+    # Difficulty levels of the computer player by menu number
+    DIFFICULTIES = {'1': ComputerPlayer.DIFFICULTY_EASY,
+                    '2': ComputerPlayer.DIFFICULTY_MEDIUM,
+                    '3': ComputerPlayer.DIFFICULTY_HARD}
 
-    def __init__(self):
+    def __init__(self, save_store=None):
         """
         Initialize the game manager with a new game board and one player.
+
+        Args:
+            save_store: Optional SaveStore games are saved to and loaded
+            from, JSON files in the savedGames directory if None.
         """
-        self.board = GameBoard()
-        self.num_players = 1
+        self.save_store = save_store
+        self.game = Game(GameBoard(), 1, ComputerPlayer.DIFFICULTY_HARD)
         self.players = [HumanPlayer(GameBoard.BOARD_PLAYER_X),
-                        ComputerPlayer(GameBoard.BOARD_PLAYER_O)]
+                        self.computer_player()]
+        self.ponderer = None
+
+    @property
+    def board(self):
+        """
+        The board of the current game.
+        """
+        return self.game.board
+
+    @board.setter
+    def board(self, board):
+        self.game = Game(board, self.game.num_players, self.game.difficulty)
+
+    @property
+    def num_players(self):
+        """
+        The number of human players of the current game.
+        """
+        return self.game.num_players
+
+    @num_players.setter
+    def num_players(self, num_players):
+        self.game.num_players = num_players
+
+    def computer_player(self):
+        """
+        Create the computer player at the difficulty of the current game.
+
+        Returns:
+            A ComputerPlayer playing O, at DIFFICULTY_HARD for games
+            saved without a difficulty.
+        """
+        return ComputerPlayer(GameBoard.BOARD_PLAYER_O,
+                              difficulty=self.game.difficulty
+                              or ComputerPlayer.DIFFICULTY_HARD)
 
     def start_screen(self):
         """
@@ -62,37 +109,83 @@ class GameManager:
     def game_loop(self):
         """
         Main game loop, handles player turns and game state updates.
+
+        While a human chooses a move against the computer, the computer's
+        replies are prepared in the background, see Ponderer.
         """
-        while self.board.check_terminal_state() is None \
-        and any(space == GameBoard.BOARD_EMPTY for space in self.board.board):
-            for player in self.players:
-                GameView.clear_screen()  # Clear screen for each turn
-                GameView.print_board(self.board)
-                if isinstance(player, HumanPlayer):
-                    move = GameView.choose_move(self.board, player)
-                    if move == 'save':
-                        self.save_game_state()
-                        return
-                    #  Unpack the tuple
-                    row, column = move
-                    action = player.make_move(self.board, row, column)
-                else:
-                    # Pass the board argument to the make_move() method
-                    action = player.make_move(self.board)
-                self.board.apply_action(action)
-                GameView.clear_screen()
-                GameView.print_board(self.board)
-                if self.board.check_terminal_state() is not None:
-                    break
+        try:
+            while self.game.result() is None:
+                for turn, player in enumerate(self.players):
+                    GameView.clear_screen()  # Clear screen for each turn
+                    GameView.print_board(self.board)
+                    if isinstance(player, HumanPlayer):
+                        self.start_pondering(
+                            self.players[(turn + 1) % len(self.players)])
+                        move = GameView.choose_move(self.board, player)
+                        if move == 'save':
+                            self.stop_pondering()
+                            self.save_game_state()
+                            return
+                        #  Unpack the tuple
+                        row, column = move
+                        action = player.make_move(self.board, row, column)
+                    else:
+                        # Taking a pondered move rolls for the noise
+                        pondered = self.ponderer is not None
+                        action = self.take_pondered_move()
+                        if action is None:
+                            # Pass the board argument to the make_move() method
+                            action = player.make_move(self.board,
+                                                      skip_noise=pondered)
+                    self.game.play(action)
+                    GameView.clear_screen()
+                    GameView.print_board(self.board)
+                    if self.game.result() is not None:
+                        break
+        finally:
+            self.stop_pondering()
         self.post_game()
 
+    def start_pondering(self, player):
+        """
+        Start preparing the replies of the player who moves next.
+
+        Args:
+            player: The player who moves after the human.
+        """
+        self.stop_pondering()
+        if Ponderer.worthwhile(player, self.board):
+            self.ponderer = Ponderer(player)
+            self.ponderer.start(self.board)
+
+    def take_pondered_move(self):
+        """
+        Take the reply prepared for the current position, if any.
+
+        Returns:
+            The prepared action, or None if there is none.
+        """
+        if self.ponderer is None:
+            return None
+        action = self.ponderer.take(self.board)
+        self.ponderer = None
+        return action
+
+    def stop_pondering(self):
+        """
+        Cancel the preparation of replies, e.g. before saving or exiting.
+        """
+        if self.ponderer is not None:
+            self.ponderer.stop()
+            self.ponderer = None
+
     def post_game(self):
         """
         Handle post-game actions, 
         such as displaying the winner and offering replay options.
         """
         # Check for the winner after the loop ends
-        winner = self.board.check_terminal_state()
+        winner = self.game.result()
         GameView.clear_screen()
         GameView.print_board(self.board)
         if winner == GameBoard.BOARD_PLAYER_X:
@@ -116,10 +209,22 @@ class GameManager:
     def start_new_game(self):
         """
         Start a new game, 
-        asking the number of players
+        asking the board size, the number of players and in single
+        player mode the difficulty,
         initializies the game board and players.
         """
-        self.board = GameBoard()
+        board_size = GameView.input_prompt("Enter board size [3-7] "
+                                           "(leave blank for 3x3): ")
+        if board_size and board_size.isdigit() \
+                and int(board_size) in self.WIN_LENGTHS:
+            board_size = int(board_size)
+        else:
+            if board_size:
+                GameView.display_message("Invalid board size. "
+                                         "Defaulting to 3x3.")
+            board_size = 3
+        self.game = Game(GameBoard(board_size, board_size,
+                                   self.WIN_LENGTHS[board_size]))
         num_players = GameView.input_prompt('Enter number of players [1-2]: ')
         self.num_players = int(num_players)
 
@@ -128,64 +233,108 @@ class GameManager:
                                      Defaulting to 1 player mode.")
 
         if self.num_players == 1:
+            self.game.difficulty = self.choose_difficulty()
             self.players = [HumanPlayer(GameBoard.BOARD_PLAYER_X),
-                            ComputerPlayer(GameBoard.BOARD_PLAYER_O)]
+                            self.computer_player()]
         elif self.num_players == 2:
             self.players = [HumanPlayer(GameBoard.BOARD_PLAYER_X),
                             HumanPlayer(GameBoard.BOARD_PLAYER_O)]
 
+    def choose_difficulty(self):
+        """
+        Ask the difficulty of the computer player.
+
+        Returns:
+            A key of ComputerPlayer.DIFFICULTY_LEVELS, DIFFICULTY_HARD if
+            the input is blank or invalid.
+        """
+        choice = GameView.input_prompt("Enter difficulty [1-3] 1) easy "
+                                       "2) medium 3) hard "
+                                       "(leave blank for hard): ")
+        if choice in self.DIFFICULTIES:
+            return self.DIFFICULTIES[choice]
+        if choice:
+            GameView.display_message("Invalid difficulty. "
+                                     "Defaulting to hard.")
+        return ComputerPlayer.DIFFICULTY_HARD
+
     @staticmethod
-    def binary_rain(rows=1080, columns=1920):
+    def binary_rain(fps=BinaryRain.FPS, frames=None):
         """
         Display a binary rain animation. Can be interrupted with a keyboard interrupt.
+
+        Args:
+            fps: Frames per second.
+            frames: Optional number of frames after which to stop.
+
+        Returns:
+            The frame and CPU time statistics of the animation, or None
+            if the terminal cannot show it.
         """
-        while True:
-            # Generate a frame of binary rain
-            frame = [[' ' for _ in range(columns)] for _ in range(rows)]
-            for col in range(columns):
-                if random.choice([True, False]):
-                    start_row = random.randint(0, rows - 1)
-                    for row in range(start_row, rows):
-                        frame[row][col] = str(random.randint(0, 1))
-            # Print the frame
-            GameView.display_message(frame)
+        return GameView.binary_rain(fps, frames)
 
     def save_game_state(self):
         """
-        Save the current game state to a file.
+        Save the current game state to a file or the save store.
         """
         save_name = GameView.input_prompt("Enter a name for your save"
                           "(leave blank to use the current datetime): ")
+        if self.save_store is not None:
+            self._save_to_store(save_name)
+        else:
+            self._save_to_file(save_name)
+        GameView.clear_screen()
+        self.start_menu()  # Return to the main menu after saving the game
+
+    def _save_to_store(self, save_name):
+        """
+        Save the current game state to the save store.
+
+        Args:
+            save_name: The name entered by the user, may be empty.
+        """
+        if not save_name:
+            save_name = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        try:
+            self.save_store.save(save_name, self.game.to_dict())
+            GameView.display_message(f"Game saved as '{save_name}'")
+        except sqlite3.Error as e:
+            GameView.display_message(f"Failed to save the game: {str(e)}")
+
+    def _save_to_file(self, save_name):
+        """
+        Save the current game state to a JSON file in savedGames.
+
+        Args:
+            save_name: The name entered by the user, may be empty.
+        """
         if not save_name:
             # Ensure filename valid filename, regardless of OS
             save_name = datetime.now().strftime("%Y-%m-%d_%H-%M-%S") + ".json"
-        else:
-            if not save_name.endswith('.json'):
-                save_name += ".json"
+        elif not save_name.endswith('.json'):
+            save_name += ".json"
         # OS independent filepath
         filename = Path("savedGames", save_name)
         self.create_directory_if_not_exists()
-        game_state = {
-            'board': self.board.board,
-            'num_players': self.num_players,
-            'current_turn': self.board.current_player()
-        }
         try:
             with open(filename, 'w', encoding='utf-8') as file:
-                json.dump(game_state, file)
+                json.dump(self.game.to_dict(), file)
             GameView.display_message(f"Game saved as '{filename}'")
         except IOError as e:
             GameView.display_message(f"Failed to save the game: {str(e)}")
-        GameView.clear_screen()
-        self.start_menu()  # Return to the main menu after saving the game
 
     def load_game_state(self):
         """
-        Load a game state from a file.
+        Load a game state from a file or the save store.
         """
+        if self.save_store is not None:
+            state = self.choose_stored_game()
+            return state is not None and self.restore_game_state(state)
         saved_games_dir = 'savedGames'
         try:
-            saved_files = os.listdir(saved_games_dir)
+            # The save store keeps its database files in the same directory
+            saved_files = [file for file in os.listdir(saved_games_dir) or ()
+                           if file.endswith('.json')]
             if not saved_files:
                 GameView.display_message("No saved games found.")
                 return False
@@ -211,16 +360,76 @@ class GameManager:
 
         with open(f'{saved_games_dir}/{selected_file}', 'r', encoding='utf-8') as file:
             state = json.load(file)
+        return self.restore_game_state(state)
+
+    def choose_stored_game(self):
+        """
+        Let the user page through and search the save store.
+
+        Returns:
+            The saved-game dictionary of the chosen save, or None.
+        """
+        store = self.save_store
+        search = None
+        # The last save before each page shown so far, None for the first
+        pages = [None]
+        while True:
+            saves = store.page(pages[-1], search=search)
+            if not saves:
+                if search is None:
+                    GameView.display_message("No saved games found.")
+                    return None
+                GameView.display_message(
+                    f"No saved games start with '{search}'.")
+                search, pages = None, [None]
+                continue
+            GameView.display_message("Please select a game to load:")
+            for i, save in enumerate(saves, 1):
+                GameView.display_message(f"{i}. {SaveStore.describe(save)}")
+            choice = GameView.input_prompt(
+                "Enter the number of the game you want to load, "
+                "'n'/'p' for the next/previous page or the start of a name "
+                "to search ('exit' to return to main menu): ")
+            if choice.lower() == 'exit':
+                GameView.clear_screen()
+                self.start_menu()
+                return None
+            if choice.lower() == 'n':
+                if len(saves) == store.PAGE_SIZE:
+                    pages.append(saves[-1])
+            elif choice.lower() == 'p':
+                if len(pages) > 1:
+                    pages.pop()
+            elif choice.isdigit():
+                if not 1 <= int(choice) <= len(saves):
+                    GameView.display_message("Invalid selection.")
+                    return None
+                return store.load(saves[int(choice) - 1]['id'])
+            else:
+                search, pages = choice, [None]
+
+    def restore_game_state(self, state):
+        """
+        Resume a saved game with players of the saved mode.
+
+        Args:
+            state: The saved-game dictionary.
 
-        self.board = GameBoard()
-        self.board.board = state['board']
-        self.num_players = state['num_players']
+        Returns:
+            True.
+        """
+        self.game = Game.from_dict(state, GameBoard(
+            state.get('rows', 3), state.get('columns', 3),
+            state.get('win_length', 3)))
         current_turn = state['current_turn']
 
         if self.num_players == 1:
             if current_turn == GameBoard.BOARD_PLAYER_X:
                 self.players = [HumanPlayer(GameBoard.BOARD_PLAYER_X),
-                                ComputerPlayer(GameBoard.BOARD_PLAYER_O)]
+                                self.computer_player()]
+            else:
+                self.players = [self.computer_player(),
+                                HumanPlayer(GameBoard.BOARD_PLAYER_X)]
         if self.num_players == 2:
             if current_turn == GameBoard.BOARD_PLAYER_X:
                 self.players = [HumanPlayer(self.board.BOARD_PLAYER_X),
@@ -228,8 +437,6 @@ class GameManager:
             else:
                 self.players = [HumanPlayer(self.board.BOARD_PLAYER_O),
                                 HumanPlayer(self.board.BOARD_PLAYER_X)]
-        if current_turn:
-            self.board.set_current_player(current_turn)
 
         GameView.display_message("Game loaded successfully.")
         return True  # Indicate success
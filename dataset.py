@@ -0,0 +1,148 @@
+"""Exports every reachable 3x3 position with its perfect play solution.
+
+The dataset is a set of equally long columns, one row per position
+reachable from the empty board, finished games included:
+
+    index     (N,) int32      base-3 index as in PerfectPlayTable
+    boards    (N, 9) int8     spaces coded as in GameBoard.CELL_CODES
+    plies     (N,) int8       marks on the board
+    to_move   (N,) int8       code of the side to move, 0 if the game is over
+    value     (N,) int8       result for the side to move: 1, 0 or -1
+    distance  (N,) int8       plies until the game ends with perfect play
+    score     (N,) int8       PerfectPlayTable value, combining both
+    optimal   (N, 9) bool     the moves that keep the value
+
+Written to a directory, every column is its own .npy file that
+np.load(..., mmap_mode='r') maps without copying, see load(). Written to
+a path ending in .npz, the columns share one uncompressed archive.
+NumPy is only needed by this module.
+
+Example:
+    python dataset.py --out perfect_play_dataset
+"""
+
+import argparse
+import json
+from pathlib import Path
+import numpy as np
+from board import GameBoard
+from solver import PerfectPlayTable
+
+VERSION = 1
+COLUMNS = ('index', 'boards', 'plies', 'to_move', 'value', 'distance',
+           'score', 'optimal')
+SPACES = 9
+
+
+def build_dataset(table=None):
+    """
+    Compute the dataset columns from the solved game.
+
+    Args:
+        table: Optional PerfectPlayTable, the shared one if None.
+
+    Returns:
+        A dictionary of column name to NumPy array, ordered by index.
+    """
+    table = table or PerfectPlayTable.shared()
+    values = np.frombuffer(table.values, dtype=np.int8)
+    index = np.flatnonzero(values != PerfectPlayTable.UNREACHABLE)
+    score = values[index]
+    moves = np.frombuffer(table.moves, dtype=np.uint16)[index]
+
+    boards = (index[:, None] // 3 ** np.arange(SPACES)) % 3
+    x_count = (boards == GameBoard.CELL_CODES[GameBoard.BOARD_PLAYER_X]) \
+        .sum(axis=1)
+    o_count = (boards == GameBoard.CELL_CODES[GameBoard.BOARD_PLAYER_O]) \
+        .sum(axis=1)
+    plies = x_count + o_count
+    # Only finished games have no optimal move
+    finished = moves == 0
+    to_move = np.where(
+        finished, 0,
+        np.where(x_count > o_count,
+                 GameBoard.CELL_CODES[GameBoard.BOARD_PLAYER_O],
+                 GameBoard.CELL_CODES[GameBoard.BOARD_PLAYER_X]))
+    # A win in n plies scores 11 - n, a loss -(11 - n), a draw fills the board
+    distance = np.where(score > 0, 11 - score,
+                        np.where(score < 0, 11 + score, SPACES - plies))
+    optimal = (moves[:, None] >> np.arange(SPACES)) & 1
+    return {
+        'index': index.astype(np.int32),
+        'boards': boards.astype(np.int8),
+        'plies': plies.astype(np.int8),
+        'to_move': to_move.astype(np.int8),
+        'value': np.sign(score).astype(np.int8),
+        'distance': distance.astype(np.int8),
+        'score': score.astype(np.int8),
+        'optimal': optimal.astype(bool),
+    }
+
+
+def export(path, columns=None):
+    """
+    Write the dataset to a directory of .npy files or an .npz archive.
+
+    Args:
+        path: A directory, created if needed, or a file ending in .npz.
+        columns: Optional columns from build_dataset, built if None.
+
+    Returns:
+        The number of positions written.
+    """
+    columns = columns or build_dataset()
+    path = Path(path)
+    if path.suffix == '.npz':
+        np.savez(path, **columns)
+    else:
+        path.mkdir(parents=True, exist_ok=True)
+        for name, column in columns.items():
+            np.save(path / f"{name}.npy", column)
+        manifest = {'version': VERSION,
+                    'positions': len(columns['index']),
+                    'columns': {name: {'dtype': str(column.dtype),
+                                       'shape': list(column.shape)}
+                                for name, column in columns.items()}}
+        with open(path / 'manifest.json', 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, indent=2)
+    return len(columns['index'])
+
+
+def load(path, mmap=True):
+    """
+    Read a dataset written by export.
+
+    Args:
+        path: The directory or .npz file.
+        mmap: Whether columns in a directory are memory-mapped instead of
+        read, .npz archives are always read.
+
+    Returns:
+        A dictionary of column name to array.
+    """
+    path = Path(path)
+    if path.suffix == '.npz':
+        with np.load(path) as archive:
+            return {name: archive[name] for name in archive.files}
+    mode = 'r' if mmap else None
+    return {name: np.load(path / f"{name}.npy", mmap_mode=mode)
+            for name in COLUMNS}
+
+
+def main(argv=None):
+    """
+    Export the dataset from the command line.
+
+    Args:
+        argv: Optional command line arguments, sys.argv is used if None.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--out', default='perfect_play_dataset',
+                        help="directory of .npy files, or a .npz file")
+    args = parser.parse_args(argv)
+    count = export(args.out)
+    print(f"Wrote {count} positions to '{args.out}'")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,359 @@
+"""Anytime search engine for boards too large to search to the end."""
+
+import time
+from board import GameBoard
+from transposition import TranspositionTable
+
+
+def evaluate_lines(board, player):
+    """
+    Estimate the score of an unfinished game from its open lines.
+
+    Every line that only one player has marks in counts for that
+    player, the more marks the more it counts. The result always lies
+    strictly between -1 and 1, so it never outweighs a win or a loss.
+
+    Args:
+        board: The current state of the game board.
+        player: The symbol of the player to score the board for.
+
+    Returns:
+        The estimated score of the game state for player.
+    """
+    spaces = board.board
+    lines = board.geometry.lines
+    score = 0
+    for line in lines:
+        mine = theirs = 0
+        for index in line:
+            space = spaces[index]
+            if space == player:
+                mine += 1
+            elif space != GameBoard.BOARD_EMPTY:
+                theirs += 1
+        if not theirs:
+            score += mine * mine
+        elif not mine:
+            score -= theirs * theirs
+    return score / (len(lines) * board.win_length ** 2 + 1)
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time or node budget is used up."""
+
+
+class SearchResult:
+    """Outcome of one search, as reported to the caller."""
+
+    def __init__(self, action, score, depth, nodes, elapsed):
+        """
+        Initialize a search result.
+
+        Args:
+            action: The best action found, or None if there was no move.
+            score: The score of the action for the side to move.
+            depth: The deepest iteration that was completed.
+            nodes: The number of nodes visited.
+            elapsed: The wall time of the search in seconds.
+        """
+        self.action = action
+        self.score = score
+        self.depth = depth
+        self.nodes = nodes
+        self.elapsed = elapsed
+
+    def to_dict(self):
+        """
+        Return the result as a dictionary.
+        """
+        return {'action': self.action, 'score': self.score,
+                'depth': self.depth, 'nodes': self.nodes,
+                'elapsed': self.elapsed}
+
+
+class SearchStats:
+    """Counters of one move's search, collected only when asked for."""
+
+    def __init__(self):
+        """
+        Initialize zeroed counters.
+        """
+        self.nodes = 0
+        self.terminal = 0
+        self.max_depth = 0
+        self.cutoffs = 0
+        self.cache_hits = 0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+
+    def to_dict(self):
+        """
+        Return the counters as a dictionary.
+        """
+        return {'nodes': self.nodes, 'terminal': self.terminal,
+                'max_depth': self.max_depth, 'cutoffs': self.cutoffs,
+                'cache_hits': self.cache_hits, 'wall_time': self.wall_time,
+                'cpu_time': self.cpu_time}
+
+
+class IterativeDeepeningEngine:
+    """
+    Negamax with alpha-beta, searched one ply deeper per iteration.
+
+    The best move of the last completed iteration is always available, so
+    the search can be stopped at any time by a deadline or node budget.
+    Positions at the depth limit are scored with evaluate_lines.
+    """
+    # How many nodes to visit between two looks at the clock
+    CLOCK_INTERVAL = 256
+
+    def __init__(self, time_limit=None, node_limit=None, max_depth=None,
+                 transposition_table=None):
+        """
+        Initialize the engine with its budget.
+
+        Args:
+            time_limit: Optional seconds a search may take.
+            node_limit: Optional number of nodes a search may visit.
+            max_depth: Optional deepest iteration to search.
+            transposition_table: Optional TranspositionTable keeping
+            results between iterations and searches. Positions are keyed
+            on GameBoard.zobrist_key() with the remaining depth, so a
+            bounded table with POLICY_DEPTH keeps the deepest results.
+        """
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.max_depth = max_depth
+        self.transposition_table = transposition_table
+        self.nodes = 0
+        self.history = {}
+        self._hash_moves = {}
+        self._deadline = None
+        self._win_score = 0
+        self._move_rank = {}
+        # A SearchStats to fill in, None keeps the search free of counting
+        self.stats = None
+        # A threading.Event that stops the search like the deadline
+        self.stop_event = None
+
+    def search(self, board, deadline=None):
+        """
+        Find the best move within the budget.
+
+        Args:
+            board: The current state of the game board, restored
+            before returning.
+            deadline: Optional time.perf_counter() value at which to
+            stop, overriding time_limit.
+
+        Returns:
+            A SearchResult for the side to move.
+        """
+        start = time.perf_counter()
+        if deadline is None and self.time_limit is not None:
+            deadline = start + self.time_limit
+        self._deadline = deadline
+        self._win_score = len(board.board) + 1
+        self._move_rank = {index: rank for rank, index
+                           in enumerate(board.geometry.move_order)}
+        self.nodes = 0
+        self.history = {}
+        self._hash_moves = {}
+
+        actions = self.order_actions(board, board.available_actions())
+        if board.check_terminal_state() is not None or not actions:
+            return SearchResult(None, 0, 0, 0, time.perf_counter() - start)
+        best_action, best_score, completed = actions[0], 0, 0
+        remaining = len(actions)
+        max_depth = min(remaining, self.max_depth or remaining)
+        stack_size = len(board.move_stack)
+        for depth in range(1, max_depth + 1):
+            try:
+                best_score, best_action = self._search_root(board, depth)
+            except SearchTimeout:
+                while len(board.move_stack) > stack_size:
+                    board.pop()
+                break
+            completed = depth
+            if abs(best_score) >= 1:
+                break  # A forced win or loss, deeper search cannot change it
+        return SearchResult(best_action, best_score, completed, self.nodes,
+                            time.perf_counter() - start)
+
+    def principal_variation(self, board):
+        """
+        Follow the best moves found by the last search.
+
+        Args:
+            board: The position the search started from, restored before
+            returning.
+
+        Returns:
+            The list of space indexes both sides are expected to play.
+        """
+        variation = []
+        while board.check_terminal_state() is None:
+            index = self._hash_moves.get(board.zobrist_key())
+            if index is None:
+                break
+            board.push((board.current_player(), index))
+            variation.append(index)
+        for _ in variation:
+            board.pop()
+        return variation
+
+    def order_actions(self, board, actions):
+        """
+        Sort actions so the most promising ones are searched first.
+
+        The best move from an earlier iteration comes first, then moves
+        with a history score, then the board's center-first move order.
+
+        Args:
+            board: The current state of the game board.
+            actions: A list of (player, index) tuples.
+
+        Returns:
+            The actions as a new list in search order.
+        """
+        hash_move = self._hash_moves.get(board.zobrist_key())
+        return sorted(actions, key=lambda action: (
+            action[1] != hash_move,
+            -self.history.get(action[1], 0),
+            self._move_rank[action[1]]))
+
+    def _search_root(self, board, depth):
+        """
+        Search every root move to the given depth.
+
+        Args:
+            board: The current state of the game board.
+            depth: The number of plies to search.
+
+        Returns:
+            A tuple (score, action) of the best root move.
+        """
+        alpha, beta = float('-inf'), float('inf')
+        best_action = None
+        for action in self.order_actions(board, board.available_actions()):
+            board.push(action)
+            score = -self._negamax(board, depth - 1, 1, -beta, -alpha)
+            board.pop()
+            if best_action is None or score > alpha:
+                alpha = score
+                best_action = action
+        self._hash_moves[board.zobrist_key()] = best_action[1]
+        return alpha, best_action
+
+    def _negamax(self, board, depth, ply, alpha, beta):
+        """
+        Score a position for the side to move.
+
+        Args:
+            board: The current state of the game board.
+            depth: The number of plies left to search.
+            ply: The number of plies played since the root.
+            alpha: The score the side to move is already assured of.
+            beta: The score the opponent is already assured of.
+
+        Returns:
+            The score of the position for the side to move.
+        """
+        self.nodes += 1
+        if self.node_limit is not None and self.nodes > self.node_limit:
+            raise SearchTimeout()
+        if self.nodes % self.CLOCK_INTERVAL == 0 and (
+                self._deadline is not None
+                and time.perf_counter() >= self._deadline
+                or self.stop_event is not None and self.stop_event.is_set()):
+            raise SearchTimeout()
+        stats = self.stats
+        if stats is not None and ply > stats.max_depth:
+            stats.max_depth = ply
+
+        winner = board.check_terminal_state()
+        if winner is not None:
+            if stats is not None:
+                stats.terminal += 1
+            # Only the player who just moved can have won
+            return 0 if winner == 0 else ply - self._win_score
+        if depth == 0:
+            return evaluate_lines(board, board.current_player())
+
+        key = board.zobrist_key()
+        table = self.transposition_table
+        if table is not None:
+            entry = table.probe(key, depth)
+            if entry is not None:
+                score, flag = entry
+                score = self._from_table(score, ply)
+                if flag == TranspositionTable.EXACT:
+                    return score
+                if flag == TranspositionTable.LOWER_BOUND:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score
+        # The window searched, which decides the bound type of the result
+        window_alpha = alpha
+
+        actions = self.order_actions(board, board.available_actions())
+        best_score = float('-inf')
+        best_index = None
+        for action in actions:
+            board.push(action)
+            score = -self._negamax(board, depth - 1, ply + 1, -beta, -alpha)
+            board.pop()
+            if score > best_score:
+                best_score = score
+                best_index = action[1]
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                if stats is not None:
+                    stats.cutoffs += 1
+                self.history[action[1]] = \
+                    self.history.get(action[1], 0) + depth * depth
+                break
+        self._hash_moves[key] = best_index
+        if table is not None:
+            flag = TranspositionTable.bound_flag(best_score, window_alpha,
+                                                 beta)
+            table.store(key, self._to_table(best_score, ply), flag, depth)
+        return best_score
+
+    @staticmethod
+    def _to_table(score, ply):
+        """
+        Count a win or loss from the position instead of from the root.
+
+        Args:
+            score: The score of the position for the side to move.
+            ply: The number of plies played since the root.
+
+        Returns:
+            The score to store in the transposition table.
+        """
+        if score >= 1:
+            return score + ply
+        if score <= -1:
+            return score - ply
+        return score
+
+    @staticmethod
+    def _from_table(score, ply):
+        """
+        Count a stored win or loss from the root again.
+
+        Args:
+            score: The score read from the transposition table.
+            ply: The number of plies played since the root.
+
+        Returns:
+            The score of the position for the side to move.
+        """
+        if score >= 1:
+            return score - ply
+        if score <= -1:
+            return score + ply
+        return score
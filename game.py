@@ -0,0 +1,127 @@
+"""Rules and state of one game, without any input or output."""
+
+from board import GameBoard
+
+
+class Game:
+    """
+    A game of tic-tac-toe that is driven by calling its methods.
+
+    Game knows whose turn it is, which moves are legal and how the game
+    ended, and converts itself to and from the saved-game dictionary.
+    It never prompts, prints or exits, so the terminal interface, servers
+    and simulations can all drive it.
+    """
+
+    def __init__(self, board=None, num_players=1, difficulty=None):
+        """
+        Initialize a game.
+
+        Args:
+            board: Optional GameBoard to play on, an empty 3x3 board if
+            None.
+            num_players: The number of human players, 0 to 2.
+            difficulty: Optional difficulty level of the computer
+            player, a key of ComputerPlayer.DIFFICULTY_LEVELS.
+        """
+        self.board = board if board is not None else GameBoard()
+        self.num_players = num_players
+        self.difficulty = difficulty
+
+    def current_player(self):
+        """
+        Return the symbol of the player to move.
+
+        Returns:
+            "X" or "O", or None if the board is full.
+        """
+        return self.board.current_player()
+
+    def legal_moves(self):
+        """
+        List the spaces the player to move may mark.
+
+        Returns:
+            A list of space indexes, empty once the game is over.
+        """
+        if self.result() is not None:
+            return []
+        return [action[1] for action in self.board.available_actions()]
+
+    def play(self, move):
+        """
+        Mark a space for the player to move.
+
+        Args:
+            move: The index of the space, or an action tuple
+            (player, index) as returned by Player.make_move.
+
+        Raises:
+            ValueError: If the game is over, the move is not on the
+            board, the space is taken or it is not the player's turn.
+        """
+        player = self.board.current_player()
+        if isinstance(move, tuple):
+            if move[0] != player:
+                raise ValueError(f"It is not {move[0]}'s turn")
+            move = move[1]
+        if player is None or self.board.winner() is not None:
+            raise ValueError("The game is over")
+        if not isinstance(move, int) or not 0 <= move < len(self.board.board):
+            raise ValueError(f"Invalid move: {move!r}")
+        if self.board.board[move] != GameBoard.BOARD_EMPTY:
+            raise ValueError("Space already taken")
+        self.board.apply_action((player, move))
+
+    def result(self):
+        """
+        Tell whether and how the game has ended.
+
+        Returns:
+            The symbol of the winning player, 0 for a draw or None if
+            the game is not over.
+        """
+        return self.board.check_terminal_state()
+
+    def to_dict(self):
+        """
+        Return the game as a saved-game dictionary.
+
+        Returns:
+            A JSON serializable dictionary that from_dict accepts.
+        """
+        return {
+            'board': self.board.board,
+            'rows': self.board.rows,
+            'columns': self.board.columns,
+            'win_length': self.board.win_length,
+            'num_players': self.num_players,
+            'difficulty': self.difficulty,
+            'current_turn': self.board.current_player()
+        }
+
+    @classmethod
+    def from_dict(cls, state, board=None):
+        """
+        Restore a game from a saved-game dictionary.
+
+        Saves written before larger boards were supported have no
+        dimensions and are loaded as 3x3, saves written before difficulty
+        levels have no difficulty.
+
+        Args:
+            state: A dictionary as returned by to_dict.
+            board: Optional empty GameBoard of the saved dimensions to
+            load the spaces into, one is created if None.
+
+        Returns:
+            The restored Game.
+        """
+        if board is None:
+            board = GameBoard(state.get('rows', 3), state.get('columns', 3),
+                              state.get('win_length', 3))
+        board.board = state['board']
+        if state.get('current_turn'):
+            board.set_current_player(state['current_turn'])
+        return cls(board, state.get('num_players', 1),
+                   state.get('difficulty'))
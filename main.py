@@ -1,9 +1,14 @@
 """ Main file to run the game """
 from controller import GameManager
+from savestore import SaveStore
 from view import GameView
 
 if __name__ == '__main__':
     GameView.clear_screen()
-    game_manager = GameManager()
+    save_store = SaveStore()
+    # Carry over the saves written as JSON files, names already in the
+    # store are skipped, so this only imports files new since last time
+    save_store.import_json()
+    game_manager = GameManager(save_store)
     game_manager.start_menu()  # Display the start menu @ intial start
     game_manager.game_loop()
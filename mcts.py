@@ -0,0 +1,253 @@
+"""Monte Carlo tree search player for boards too large to solve."""
+
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from board import GameBoard
+from player import Player
+
+
+class Node:
+    """One position in the search tree."""
+    __slots__ = ('parent', 'index', 'player', 'children', 'untried',
+                 'visits', 'wins')
+
+    def __init__(self, parent, index, player, untried):
+        """
+        Initialize a node that has not been visited yet.
+
+        Args:
+            parent: The parent node, or None for the root.
+            index: The space marked to reach this node.
+            player: The symbol of the player who marked it.
+            untried: The spaces that have no child node yet.
+        """
+        self.parent = parent
+        self.index = index
+        self.player = player
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0.0
+
+    def select_child(self, exploration):
+        """
+        Pick the child with the highest UCT value.
+
+        Args:
+            exploration: The weight of the exploration term.
+
+        Returns:
+            The selected child node.
+        """
+        log_visits = math.log(self.visits)
+        return max(self.children, key=lambda child: (
+            child.wins / child.visits
+            + exploration * math.sqrt(log_visits / child.visits)))
+
+
+def search_tree(cells, shape, iterations=None, time_limit=None, seed=None,
+                exploration=math.sqrt(2)):
+    """
+    Grow one search tree from a position with random playouts.
+
+    This is the unit of work of a worker process, so it only takes and
+    returns plain values.
+
+    Args:
+        cells: The spaces of the board as a list of symbols.
+        shape: A tuple (rows, columns, win_length).
+        iterations: Optional number of playouts.
+        time_limit: Optional seconds to search.
+        seed: Optional seed for the random playouts.
+        exploration: The weight of the UCT exploration term.
+
+    Returns:
+        A dictionary mapping each root space to a list [visits, wins]
+        seen from the side to move.
+    """
+    board = GameBoard(*shape)
+    board.board = list(cells)
+    rng = random.Random(seed)
+    root = Node(None, None, None, _open_spaces(board))
+    deadline = None
+    if time_limit is not None:
+        deadline = time.perf_counter() + time_limit
+    done = 0
+    while (iterations is None or done < iterations) and \
+            (deadline is None or time.perf_counter() < deadline):
+        _iterate(root, board, rng, exploration)
+        done += 1
+    return {child.index: [child.visits, child.wins]
+            for child in root.children}
+
+
+def _open_spaces(board):
+    """
+    List the spaces that can still be marked.
+
+    Args:
+        board: The current state of the game board.
+
+    Returns:
+        The indices of the empty spaces, or an empty list if the game
+        is over.
+    """
+    if board.check_terminal_state() is not None:
+        return []
+    return [action[1] for action in board.available_actions()]
+
+
+def _iterate(root, board, rng, exploration):
+    """
+    Run one selection, expansion, playout and backpropagation step.
+
+    Args:
+        root: The root node, its position is on the board.
+        board: The game board, restored before returning.
+        rng: The random number generator of the playouts.
+        exploration: The weight of the UCT exploration term.
+    """
+    depth = len(board.move_stack)
+    node = root
+    while not node.untried and node.children:
+        node = node.select_child(exploration)
+        board.push((node.player, node.index))
+    if node.untried:
+        index = node.untried.pop(rng.randrange(len(node.untried)))
+        player = board.current_player()
+        board.push((player, index))
+        child = Node(node, index, player, _open_spaces(board))
+        node.children.append(child)
+        node = child
+    winner = _playout(board, rng)
+    while len(board.move_stack) > depth:
+        board.pop()
+    while node is not None:
+        node.visits += 1
+        if winner == node.player:
+            node.wins += 1
+        elif winner == 0:
+            node.wins += 0.5
+        node = node.parent
+
+
+def _playout(board, rng):
+    """
+    Play random moves until the game is over.
+
+    Args:
+        board: The game board, the moves are pushed onto it.
+        rng: The random number generator to pick moves with.
+
+    Returns:
+        The symbol of the winner, or 0 for a draw.
+    """
+    winner = board.check_terminal_state()
+    if winner is not None:
+        return winner
+    spaces = [action[1] for action in board.available_actions()]
+    rng.shuffle(spaces)
+    player = board.current_player()
+    other = {GameBoard.BOARD_PLAYER_X: GameBoard.BOARD_PLAYER_O,
+             GameBoard.BOARD_PLAYER_O: GameBoard.BOARD_PLAYER_X}
+    for index in spaces:
+        board.push((player, index))
+        winner = board.check_terminal_state()
+        if winner is not None:
+            return winner
+        player = other[player]
+    return 0
+
+
+class MCTSPlayer(Player):
+    """
+    Computer player that picks moves with Monte Carlo tree search.
+
+    Every worker grows its own tree from the current position and the
+    root visit counts of all trees are added up (root parallelization),
+    so more workers mean more playouts in the same time.
+    """
+    DEFAULT_ITERATIONS = 2000
+    EXPLORATION = math.sqrt(2)
+
+    def __init__(self, player_type, iterations=None, time_limit=None,
+                 workers=1, seed=None):
+        """
+        Initialize an MCTS player with its budget.
+
+        Args:
+            player_type: The type of the player (e.g., "X" or "O").
+            iterations: Optional number of playouts per move, shared by
+            the workers. Defaults to DEFAULT_ITERATIONS when no
+            time_limit is given either.
+            time_limit: Optional seconds per move.
+            workers: The number of processes to search with, 1 searches
+            in this process and None uses every core.
+            seed: Optional seed that makes the moves repeatable.
+        """
+        super().__init__(player_type)
+        if iterations is None and time_limit is None:
+            iterations = self.DEFAULT_ITERATIONS
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.workers = workers or os.cpu_count() or 1
+        if self.workers < 1:
+            raise ValueError("Invalid number of workers")
+        self.random = random.Random(seed)
+        self.last_search = None
+        self._executor = None
+
+    def make_move(self, board):
+        """
+        Pick the most visited move of all search trees.
+
+        Args:
+            board: The current state of the game board.
+
+        Returns:
+            The chosen action, or None if the game is over.
+        """
+        start = time.perf_counter()
+        cells = list(board.board)
+        shape = (board.rows, board.columns, board.win_length)
+        iterations = self.iterations
+        if iterations is not None:
+            iterations = -(-iterations // self.workers)
+        seeds = [self.random.getrandbits(32) for _ in range(self.workers)]
+        if self.workers == 1:
+            trees = [search_tree(cells, shape, iterations, self.time_limit,
+                                 seeds[0], self.EXPLORATION)]
+        else:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self.workers)
+            futures = [self._executor.submit(
+                search_tree, cells, shape, iterations, self.time_limit,
+                seed, self.EXPLORATION) for seed in seeds]
+            trees = [future.result() for future in futures]
+
+        totals = {}
+        for tree in trees:
+            for index, (visits, wins) in tree.items():
+                total = totals.setdefault(index, [0, 0.0])
+                total[0] += visits
+                total[1] += wins
+        self.last_search = {
+            'iterations': sum(total[0] for total in totals.values()),
+            'workers': self.workers,
+            'elapsed': time.perf_counter() - start,
+        }
+        if not totals:
+            return None
+        index = max(sorted(totals), key=lambda space: totals[space][0])
+        return (board.current_player(), index)
+
+    def close(self):
+        """
+        Shut down the worker processes, if any were started.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
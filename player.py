@@ -1,5 +1,11 @@
 """ Handles actions for  HumanPlayer and ComputerPlayer classes """
+import json
+import random
+import time
 from board import GameBoard
+from engine import IterativeDeepeningEngine, SearchStats, evaluate_lines
+from solver import PerfectPlayTable
+from transposition import TranspositionTable
 
 
 class Player:
@@ -51,20 +57,130 @@ class HumanPlayer(Player):
         the index of the board where the move was made.
         """
         x, y = int(row) - 1, int(column) - 1
-        index = 3 * x + y
+        index = board.columns * x + y
         return (self.player_type, index)
 
 
+class RandomPlayer(Player):
+    """ Plays a random available move, as a baseline for simulations. """
+
+    def __init__(self, player_type, seed=None):
+        """
+        Initialize a random player.
+
+        Args:
+            player_type: The type of the player (e.g., "X" or "O").
+            seed: Optional seed that makes the moves repeatable.
+        """
+        super().__init__(player_type)
+        self.random = random.Random(seed)
+
+    def make_move(self, board):
+        """
+        Pick one of the available moves at random.
+
+        Args:
+            board: The current state of the game board.
+
+        Returns:
+            The chosen action, or None if the board is full.
+        """
+        actions = board.available_actions()
+        return self.random.choice(actions) if actions else None
+
+
 class ComputerPlayer(Player):
     """ Provides base functions for ComputerPlayer to act counterpart for single player games """
-    def __init__(self, player_type):
+    SEARCH_MINIMAX = "minimax"
+    SEARCH_ALPHA_BETA = "alphabeta"
+    SEARCH_PERFECT = "perfect"
+    SEARCH_ITERATIVE = "iterative"
+    # Center first, then corners, then edges
+    MOVE_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+    WIN_SCORE = 10
+    # Seconds per move on boards larger than 3x3 when no budget is given
+    LARGE_BOARD_TIME_LIMIT = 0.5
+    DIFFICULTY_EASY = "easy"
+    DIFFICULTY_MEDIUM = "medium"
+    DIFFICULTY_HARD = "hard"
+    # Search settings of each difficulty level. Easier levels look fewer
+    # plies ahead, stop after fewer nodes on large boards and play a
+    # random move now and then, so they also cost less to compute.
+    DIFFICULTY_LEVELS = {
+        DIFFICULTY_EASY: {'search_mode': SEARCH_ALPHA_BETA, 'max_depth': 1,
+                          'node_limit': 200, 'noise': 0.3},
+        DIFFICULTY_MEDIUM: {'search_mode': SEARCH_ALPHA_BETA, 'max_depth': 3,
+                            'node_limit': 5000, 'noise': 0.1},
+        DIFFICULTY_HARD: {'search_mode': SEARCH_PERFECT},
+    }
+
+    def __init__(self, player_type, search_mode=SEARCH_MINIMAX,
+                 transposition_table=None, max_depth=None,
+                 time_limit=None, node_limit=None, collect_stats=False,
+                 stats_file=None, noise=0.0, seed=None, difficulty=None):
         """
         Initialize a computer player with a specified type.
 
         Args:
             player_type: The type of the player (e.g., "X" or "O").
+            search_mode: The search algorithm used by make_move,
+            SEARCH_MINIMAX, SEARCH_ALPHA_BETA, SEARCH_PERFECT, which
+            looks moves up in the precomputed PerfectPlayTable, or
+            SEARCH_ITERATIVE, the IterativeDeepeningEngine.
+            transposition_table: Optional TranspositionTable used by the
+            alpha-beta search and the IterativeDeepeningEngine. It is
+            kept between moves and may be shared between players of the
+            same board size and search mode. Bound it with max_entries
+            or max_bytes to cap its memory.
+            max_depth: Optional number of plies, counting the computer's
+            own move, after which the search estimates the position
+            with evaluate_position instead of searching on.
+            time_limit: Optional seconds per move for SEARCH_ITERATIVE.
+            node_limit: Optional nodes per move for SEARCH_ITERATIVE.
+            collect_stats: Whether make_move keeps a SearchStats of each
+            move in last_stats.
+            stats_file: Optional path of a file to which the statistics
+            of every move are appended as one JSON line. Implies
+            collect_stats.
+            noise: The probability of playing a random move instead of
+            searching.
+            seed: Optional seed that makes the random moves repeatable.
+            difficulty: Optional key of DIFFICULTY_LEVELS whose settings
+            replace search_mode, max_depth, time_limit, node_limit and
+            noise.
         """
         super().__init__(player_type)
+        if difficulty is not None:
+            if difficulty not in self.DIFFICULTY_LEVELS:
+                raise ValueError("Invalid difficulty")
+            level = self.DIFFICULTY_LEVELS[difficulty]
+            search_mode = level['search_mode']
+            max_depth = level.get('max_depth')
+            time_limit = level.get('time_limit')
+            node_limit = level.get('node_limit')
+            noise = level.get('noise', 0.0)
+        self.difficulty = difficulty
+        self.noise = noise
+        self.random = random.Random(seed)
+        if search_mode not in [self.SEARCH_MINIMAX, self.SEARCH_ALPHA_BETA,
+                               self.SEARCH_PERFECT, self.SEARCH_ITERATIVE]:
+            raise ValueError("Invalid search mode")
+        self.search_mode = search_mode
+        self.transposition_table = transposition_table
+        self.max_depth = max_depth
+        self.win_score = self.WIN_SCORE
+        self._depth_limit = max_depth
+        self.engine = IterativeDeepeningEngine(time_limit, node_limit,
+                                               max_depth, transposition_table)
+        self.last_search = None
+        self.collect_stats = collect_stats or stats_file is not None
+        self.stats_file = stats_file
+        self.last_stats = None
+        self._stats = None
+        self.nodes_visited = 0
+        self.history = {}
+        self._move_rank = {index: rank for rank, index
+                           in enumerate(self.MOVE_ORDER)}
 
     def minimax(self, board, depth, is_maximizing):
         """
@@ -79,27 +195,197 @@ class ComputerPlayer(Player):
         Returns:
             The best score that can be achieved with the current game state.
         """
+        self.nodes_visited += 1
+        if self._stats is not None and depth >= self._stats.max_depth:
+            self._stats.max_depth = depth + 1
         terminal_state = board.check_terminal_state()
         if terminal_state is not None:
             return self.evaluate_terminal_state(terminal_state, depth)
 
         if is_maximizing:
             best_score = float('-inf')
-            for action in board.available_actions():
-                board.apply_action(action)
+            for action in board.unique_actions():
+                board.push(action)
                 score = self.minimax(board, depth + 1, False)
-                board.board[action[1]] = GameBoard.BOARD_EMPTY
+                board.pop()
                 best_score = max(score, best_score)
             return best_score
 
         best_score = float('inf')
-        for action in board.available_actions():
-            board.apply_action(action)
+        for action in board.unique_actions():
+            board.push(action)
             score = self.minimax(board, depth + 1, True)
-            board.board[action[1]] = GameBoard.BOARD_EMPTY
+            board.pop()
             best_score = min(score, best_score)
         return best_score
 
+    def order_actions(self, actions):
+        """
+        Sort actions so the most promising ones are searched first.
+
+        Moves that caused cutoffs earlier (history heuristic) come first,
+        ties are broken by position: center, then corners, then edges.
+
+        Args:
+            actions: A list of (player, index) tuples.
+
+        Returns:
+            The actions as a new list in search order.
+        """
+        return sorted(actions, key=lambda action: (
+            -self.history.get(action[1], 0),
+            self._move_rank.get(action[1], len(self._move_rank))))
+
+    def alphabeta(self, board, depth, alpha, beta, is_maximizing):
+        """
+        Minimax with alpha-beta pruning and move ordering.
+
+        Returns the same score as minimax whenever that score lies
+        strictly between alpha and beta, otherwise a bound on it.
+
+        Args:
+            board: The current state of the game board.
+            depth: The current depth of the game tree.
+            alpha: The score the maximizing player is already assured of.
+            beta: The score the minimizing player is already assured of.
+            is_maximizing: boolean indicating if the
+            current player is maximizing or minimizing.
+
+        Returns:
+            The best score that can be achieved with the current game state.
+        """
+        self.nodes_visited += 1
+        stats = self._stats
+        if stats is not None and depth >= stats.max_depth:
+            stats.max_depth = depth + 1
+        terminal_state = board.check_terminal_state()
+        if terminal_state is not None:
+            return self.evaluate_terminal_state(terminal_state, depth)
+        if self._depth_limit is not None and depth + 1 >= self._depth_limit:
+            return self.evaluate_position(board)
+
+        key = None
+        # Depth limited scores depend on the depth, so they are not stored
+        if self.transposition_table is not None and self._depth_limit is None:
+            key = board.canonical_key()
+            score, alpha, beta = self._probe_table(key, depth, alpha, beta,
+                                                   is_maximizing)
+            if score is not None:
+                return score
+
+        best_score = float('-inf') if is_maximizing else float('inf')
+        child_alpha, child_beta = alpha, beta
+        actions = self.order_actions(board.unique_actions())
+        for action in actions:
+            board.push(action)
+            score = self.alphabeta(board, depth + 1, child_alpha, child_beta,
+                                   not is_maximizing)
+            board.pop()
+            if is_maximizing:
+                best_score = max(score, best_score)
+                child_alpha = max(child_alpha, best_score)
+            else:
+                best_score = min(score, best_score)
+                child_beta = min(child_beta, best_score)
+            if child_alpha >= child_beta:
+                if stats is not None:
+                    stats.cutoffs += 1
+                # Reward moves that refute a line, deeper cutoffs count more
+                self.history[action[1]] = \
+                    self.history.get(action[1], 0) + len(actions) ** 2
+                break
+
+        if key is not None:
+            flag = TranspositionTable.bound_flag(best_score, alpha, beta)
+            # Positions with more empty spaces took longer to search
+            self.transposition_table.store(
+                key, *self._to_table(best_score, flag, depth, is_maximizing),
+                depth=board.board.count(GameBoard.BOARD_EMPTY))
+        return best_score
+
+    def _probe_table(self, key, depth, alpha, beta, is_maximizing):
+        """
+        Narrow the search window with a stored result for the position.
+
+        Args:
+            key: The canonical key of the position.
+            depth: The current depth of the game tree.
+            alpha: The current lower end of the search window.
+            beta: The current upper end of the search window.
+            is_maximizing: Whether this player is the side to move.
+
+        Returns:
+            A tuple (score, alpha, beta). score is None unless the stored
+            result already decides the node.
+        """
+        entry = self.transposition_table.probe(key)
+        if entry is None:
+            return None, alpha, beta
+        score, flag = self._from_table(entry, depth, is_maximizing)
+        if flag == TranspositionTable.EXACT:
+            return score, alpha, beta
+        if flag == TranspositionTable.LOWER_BOUND:
+            alpha = max(alpha, score)
+        else:
+            beta = min(beta, score)
+        return (score if alpha >= beta else None), alpha, beta
+
+    @staticmethod
+    def _to_table(score, flag, depth, is_maximizing):
+        """
+        Convert a search result into a table entry.
+
+        Entries are stored from the view of the side to move and with the
+        distance to the end of the game instead of the search depth,
+        so they can be reused at any depth and by either player.
+
+        Args:
+            score: The score from this player's point of view.
+            flag: The bound type of the score for this player.
+            depth: The depth at which the score was found.
+            is_maximizing: Whether this player is the side to move.
+
+        Returns:
+            A tuple (score, flag) to store.
+        """
+        if not is_maximizing:
+            score = -score
+            if flag == TranspositionTable.LOWER_BOUND:
+                flag = TranspositionTable.UPPER_BOUND
+            elif flag == TranspositionTable.UPPER_BOUND:
+                flag = TranspositionTable.LOWER_BOUND
+        if score > 0:
+            score += depth
+        elif score < 0:
+            score -= depth
+        return score, flag
+
+    @staticmethod
+    def _from_table(entry, depth, is_maximizing):
+        """
+        Convert a table entry back into a search result.
+
+        Args:
+            entry: A tuple (score, flag) read from the table.
+            depth: The depth of the current node.
+            is_maximizing: Whether this player is the side to move.
+
+        Returns:
+            A tuple (score, flag) from this player's point of view.
+        """
+        score, flag = entry
+        if score > 0:
+            score -= depth
+        elif score < 0:
+            score += depth
+        if not is_maximizing:
+            score = -score
+            if flag == TranspositionTable.LOWER_BOUND:
+                flag = TranspositionTable.UPPER_BOUND
+            elif flag == TranspositionTable.UPPER_BOUND:
+                flag = TranspositionTable.LOWER_BOUND
+        return score, flag
+
     def evaluate_terminal_state(self, state, depth):
         """
         Evaluate the score of a terminal game state.
@@ -111,30 +397,170 @@ class ComputerPlayer(Player):
         Returns:
             The score of the terminal state.
         """
+        if self._stats is not None:
+            self._stats.terminal += 1
         if state == self.player_type:
-            return 10 - depth
+            return self.win_score - depth
         if state == GameBoard.BOARD_EMPTY:  # It's a draw
             return 0
         # The opponent wins
-        return depth - 10
+        return depth - self.win_score
 
-    def make_move(self, board):
+    def evaluate_position(self, board):
+        """
+        Estimate the score of an unfinished game from its open lines.
+
+        Args:
+            board: The current state of the game board.
+
+        Returns:
+            The estimated score, strictly between -1 and 1.
+        """
+        return evaluate_lines(board, self.player_type)
+
+    def make_move(self, board, skip_noise=False):
         """
         Make the best move on the game board using the minimax algorithm.
 
+        Boards larger than 3x3 cannot be searched to the end, they are
+        always searched with the IterativeDeepeningEngine, by default
+        for LARGE_BOARD_TIME_LIMIT seconds.
+
+        With collect_stats the search is counted and timed into
+        last_stats, and appended to stats_file if one was given.
+
+        Args:
+            board: The current state of the game board.
+            skip_noise: Whether to search without rolling for a random
+            move, for callers that already rolled with random_move.
+
+        Returns:
+            The best action that can be taken on the current game board.
+        """
+        if not self.collect_stats:
+            return self._search_move(board, skip_noise)
+        stats = self._stats = self.engine.stats = SearchStats()
+        table = self.transposition_table
+        hits = table.hits if table is not None else 0
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            action = self._search_move(board, skip_noise)
+        finally:
+            self._stats = self.engine.stats = None
+        stats.wall_time = time.perf_counter() - wall
+        stats.cpu_time = time.process_time() - cpu
+        stats.nodes = self.nodes_visited
+        if table is not None:
+            stats.cache_hits += table.hits - hits
+        self.last_stats = stats
+        if self.stats_file is not None:
+            record = {'player': self.player_type, 'mode': self.search_mode,
+                      'move': action[1] if action is not None else None}
+            record.update(stats.to_dict())
+            with open(self.stats_file, 'a', encoding='utf-8') as file:
+                file.write(json.dumps(record) + '\n')
+        return action
+
+    def random_move(self, board):
+        """
+        Decide by the player's noise whether to play a random move.
+
         Args:
             board: The current state of the game board.
 
+        Returns:
+            A random available action, or None if the player searches.
+        """
+        if not self.noise or self.random.random() >= self.noise \
+                or board.check_terminal_state() is not None:
+            return None
+        return self.random.choice(board.available_actions())
+
+    def _search_move(self, board, skip_noise=False):
+        """
+        Search the best move with the player's search mode.
+
+        Args:
+            board: The current state of the game board.
+            skip_noise: Whether to search without rolling for a random
+            move.
+
         Returns:
             The best action that can be taken on the current game board.
         """
+        self.nodes_visited = 0
+        if not skip_noise:
+            action = self.random_move(board)
+            if action is not None:
+                return action
+        size = len(board.board)
+        self.win_score = max(self.WIN_SCORE, size + 1)
+        self._depth_limit = self.max_depth
+        if self.search_mode == self.SEARCH_ITERATIVE or size > 9:
+            return self._make_move_iterative(board)
+        if self.search_mode == self.SEARCH_PERFECT:
+            action = PerfectPlayTable.shared().best_action(board)
+            if action is not None:
+                if self._stats is not None:
+                    self._stats.cache_hits += 1
+                return action
+        if self.search_mode != self.SEARCH_MINIMAX \
+                or self._depth_limit is not None:
+            return self._make_move_alpha_beta(board)
         best_score = float('-inf')
         best_action = None
-        for action in board.available_actions():
-            board.apply_action(action)
+        for action in board.unique_actions():
+            board.push(action)
             score = self.minimax(board, 0, False)
-            board.board[action[1]] = GameBoard.BOARD_EMPTY
+            board.pop()
             if score > best_score:
                 best_score = score
                 best_action = action
         return best_action
+
+    def _make_move_alpha_beta(self, board):
+        """
+        Pick the same move as the exhaustive search using alpha-beta.
+
+        Root moves are searched in move order, but with a window one
+        point below the best score so far. Equal scores are then exact and
+        ties resolve to the lowest index, just like the minimax search.
+
+        Args:
+            board: The current state of the game board.
+
+        Returns:
+            The best action that can be taken on the current game board.
+        """
+        self.history = {}
+        self._move_rank = {index: rank for rank, index
+                           in enumerate(board.geometry.move_order)}
+        best_score = float('-inf')
+        best_action = (None, len(board.board))
+        for action in self.order_actions(board.unique_actions()):
+            board.push(action)
+            score = self.alphabeta(board, 0, best_score - 1,
+                                   float('inf'), False)
+            board.pop()
+            if score > best_score or (score == best_score
+                                      and action[1] < best_action[1]):
+                best_score = score
+                best_action = action
+        return best_action if best_action[0] is not None else None
+
+    def _make_move_iterative(self, board):
+        """
+        Pick a move with the anytime engine and keep its report.
+
+        Args:
+            board: The current state of the game board.
+
+        Returns:
+            The best action found within the budget.
+        """
+        deadline = None
+        if self.engine.time_limit is None and self.engine.node_limit is None:
+            deadline = time.perf_counter() + self.LARGE_BOARD_TIME_LIMIT
+        self.last_search = self.engine.search(board, deadline)
+        self.nodes_visited = self.last_search.nodes
+        return self.last_search.action
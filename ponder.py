@@ -0,0 +1,164 @@
+"""Searches the computer's replies while the human player is thinking."""
+
+import threading
+from board import GameBoard
+from player import ComputerPlayer
+
+
+class Ponderer:
+    """
+    Prepares a computer player's answers to the human's possible moves.
+
+    start() searches, on a background thread, the reply to every move the
+    human could make, the move the computer expects first. Each answer
+    is kept under the Zobrist key of the position after the human's move,
+    so take() can hand it out as soon as that move is played. stop()
+    cancels the work in flight, searches with the IterativeDeepeningEngine
+    are interrupted within a few hundred nodes.
+
+    The searches run on a copy of the board with their own ComputerPlayer,
+    which has the same search settings but no transposition table, since
+    tables are not safe to share between threads.
+    """
+
+    def __init__(self, player):
+        """
+        Initialize a ponderer without prepared answers.
+
+        Args:
+            player: The ComputerPlayer whose replies are prepared.
+        """
+        self.player = player
+        self.answers = {}
+        self._thread = None
+        self._cancel = threading.Event()
+        self._changed = threading.Condition()
+        # The key of the position being searched, None between searches
+        self._searching = None
+
+    @staticmethod
+    def worthwhile(player, board):
+        """
+        Tell whether pondering saves the player any time.
+
+        Args:
+            player: The player who moves after the human.
+            board: The current state of the game board.
+
+        Returns:
+            False for human players and for 3x3 boards the player looks
+            up in the PerfectPlayTable, True otherwise.
+        """
+        if not isinstance(player, ComputerPlayer):
+            return False
+        return player.search_mode != ComputerPlayer.SEARCH_PERFECT \
+            or len(board.board) > 9
+
+    def start(self, board):
+        """
+        Start preparing replies, the board itself is not touched.
+
+        Args:
+            board: The position in which the human is to move.
+        """
+        self.stop()
+        self._cancel = threading.Event()
+        copy = GameBoard(board.rows, board.columns, board.win_length)
+        copy.board = list(board.board)
+        searcher = ComputerPlayer(self.player.player_type,
+                                  self.player.search_mode,
+                                  max_depth=self.player.max_depth,
+                                  time_limit=self.player.engine.time_limit,
+                                  node_limit=self.player.engine.node_limit)
+        searcher.engine.stop_event = self._cancel
+        self._thread = threading.Thread(
+            target=self._run, args=(copy, self.expected_moves(copy), searcher),
+            name="ponder", daemon=True)
+        self._thread.start()
+
+    def expected_moves(self, board):
+        """
+        Order the human's moves by how likely the computer thinks they are.
+
+        The reply the computer's last engine search expected comes first,
+        then the board's center-first move order.
+
+        Args:
+            board: The position in which the human is to move.
+
+        Returns:
+            A list of actions.
+        """
+        rank = {index: rank for rank, index
+                in enumerate(board.geometry.move_order)}
+        if self.player.last_search is not None:
+            for index in self.player.engine.principal_variation(board)[:1]:
+                rank[index] = -1
+        return sorted(board.available_actions(),
+                      key=lambda action: rank[action[1]])
+
+    def _run(self, board, actions, searcher):
+        """
+        Search the reply to each action until done or cancelled.
+
+        Args:
+            board: The private copy of the board.
+            actions: The human's moves in search order.
+            searcher: The private ComputerPlayer.
+        """
+        for action in actions:
+            if self._cancel.is_set():
+                break
+            board.push(action)
+            if board.check_terminal_state() is None:
+                key = board.zobrist_key()
+                with self._changed:
+                    self._searching = key
+                reply = searcher.make_move(board)
+                with self._changed:
+                    # A cancelled engine search may be incomplete
+                    if not self._cancel.is_set():
+                        self.answers[key] = reply
+                    self._searching = None
+                    self._changed.notify_all()
+            board.pop()
+
+    def take(self, board):
+        """
+        Hand out the prepared reply to the position and stop pondering.
+
+        If the position is being searched right now, the search is
+        finished first, since that is quicker than starting over. A
+        player with noise rolls for a random move here, so a player
+        searching the position itself must not roll again, see
+        ComputerPlayer.make_move(skip_noise=True).
+
+        Args:
+            board: The position after the human's move.
+
+        Returns:
+            The random or prepared action, or None if there is none and
+            the player has to search the position itself.
+        """
+        action = self.player.random_move(board)
+        if action is not None:
+            self.stop()
+            return action
+        key = board.zobrist_key()
+        with self._changed:
+            while key not in self.answers and self._searching == key:
+                self._changed.wait()
+            action = self.answers.get(key)
+        self.stop()
+        if action is None or board.board[action[1]] != GameBoard.BOARD_EMPTY:
+            return None
+        return action
+
+    def stop(self):
+        """
+        Cancel any work in flight and wait for the thread to end.
+        """
+        self._cancel.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,370 @@
+"""Keeps saved games in one SQLite database instead of a JSON file each.
+
+Every save is a row with the saved-game dictionary of Game.to_dict and
+indexed columns to list and find saves without reading them: the name,
+the time it was saved, the number of human players, the number of moves
+and the status of the game. The database runs in WAL mode, so listing
+saves never waits for a write, and many saves are written in one
+transaction with save_many.
+
+Example:
+    python savestore.py --import-dir savedGames --search 2024
+"""
+
+import argparse
+import json
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from game import Game
+
+
+class SaveStore:
+    """
+    Saved games in an SQLite database, listed page by page.
+
+    Pages are newest first and use keyset pagination: the next page is
+    asked for with the last save of the current one, so any page costs
+    the same however many saves come before it.
+    """
+    DEFAULT_PATH = Path("savedGames", "saves.db")
+    PAGE_SIZE = 20
+    BATCH_SIZE = 500
+    STATUS_PLAYING = "playing"
+    STATUS_DRAW = "draw"
+    # The columns of a save that page() lists
+    SUMMARY = ('id', 'name', 'created', 'num_players', 'moves', 'status')
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS saves (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE COLLATE NOCASE,
+            created REAL NOT NULL,
+            num_players INTEGER NOT NULL,
+            moves INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            state TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS saves_created ON saves (created, id);
+        CREATE INDEX IF NOT EXISTS saves_players
+            ON saves (num_players, created, id);
+        CREATE INDEX IF NOT EXISTS saves_moves ON saves (moves);
+        CREATE INDEX IF NOT EXISTS saves_status
+            ON saves (status, created, id);
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        """
+        Open the database, creating it and its directory if needed.
+
+        Args:
+            path: The database file, or ':memory:' for a private
+            in-memory database.
+        """
+        self.path = path
+        if str(path) == ':memory:':
+            self.created = True
+        else:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self.created = not Path(path).exists()
+        self.connection = sqlite3.connect(str(path))
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        # Safe in WAL mode, a crash loses at most the last transactions
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(self.SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Close the database.
+        """
+        self.connection.close()
+
+    @classmethod
+    def _row(cls, name, state, created=None):
+        """
+        Build the column values of a save.
+
+        Args:
+            name: The name of the save.
+            state: The saved-game dictionary.
+            created: Optional time of the save in seconds since the
+            epoch, now if None.
+
+        Returns:
+            A tuple of the values of name, created, num_players, moves,
+            status and state.
+        """
+        game = Game.from_dict(state)
+        result = game.result()
+        if result is None:
+            status = cls.STATUS_PLAYING
+        elif result == 0:
+            status = cls.STATUS_DRAW
+        else:
+            status = result
+        moves = sum(1 for space in game.board.board
+                    if space != game.board.BOARD_EMPTY)
+        return (name, time.time() if created is None else created,
+                game.num_players, moves, status, json.dumps(state))
+
+    def save(self, name, state, created=None):
+        """
+        Save a game, replacing a save of the same name.
+
+        Args:
+            name: The name of the save, compared without case.
+            state: The saved-game dictionary, see Game.to_dict.
+            created: Optional time of the save, now if None.
+
+        Returns:
+            The id of the save.
+        """
+        return self.save_many([(name, state, created)])[0]
+
+    def save_many(self, saves):
+        """
+        Save several games in one transaction.
+
+        Args:
+            saves: Tuples (name, state, created), created may be None.
+
+        Returns:
+            The ids of the saves, in order.
+        """
+        rows = [self._row(*save) for save in saves]
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO saves (name, created, num_players, moves, "
+                "status, state) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET created = excluded.created, "
+                "num_players = excluded.num_players, moves = excluded.moves, "
+                "status = excluded.status, state = excluded.state", rows)
+            return [self.connection.execute(
+                "SELECT id FROM saves WHERE name = ?", (row[0],)).fetchone()[0]
+                for row in rows]
+
+    def load(self, save_id):
+        """
+        Read a saved game.
+
+        Args:
+            save_id: The id of the save.
+
+        Returns:
+            The saved-game dictionary, or None if there is no such save.
+        """
+        row = self.connection.execute(
+            "SELECT state FROM saves WHERE id = ?", (save_id,)).fetchone()
+        return json.loads(row['state']) if row is not None else None
+
+    def find(self, name):
+        """
+        Look up a save by its name.
+
+        Args:
+            name: The name of the save, compared without case.
+
+        Returns:
+            The id of the save, or None if there is no such save.
+        """
+        row = self.connection.execute(
+            "SELECT id FROM saves WHERE name = ?", (name,)).fetchone()
+        return row['id'] if row is not None else None
+
+    def delete(self, save_id):
+        """
+        Delete a saved game.
+
+        Args:
+            save_id: The id of the save.
+
+        Returns:
+            Whether there was such a save.
+        """
+        with self.connection:
+            cursor = self.connection.execute(
+                "DELETE FROM saves WHERE id = ?", (save_id,))
+        return cursor.rowcount > 0
+
+    @staticmethod
+    def _filters(search, num_players, status):
+        """
+        Build the WHERE conditions shared by page and count.
+
+        Args:
+            search: Optional start of the names to match, without case.
+            num_players: Optional number of human players to match.
+            status: Optional status to match.
+
+        Returns:
+            A tuple (conditions, parameters).
+        """
+        conditions, parameters = [], []
+        if search:
+            escaped = search.replace('\\', '\\\\').replace('%', '\\%') \
+                .replace('_', '\\_')
+            conditions.append("name LIKE ? ESCAPE '\\'")
+            parameters.append(escaped + '%')
+        if num_players is not None:
+            conditions.append("num_players = ?")
+            parameters.append(num_players)
+        if status is not None:
+            conditions.append("status = ?")
+            parameters.append(status)
+        return conditions, parameters
+
+    def page(self, after=None, limit=PAGE_SIZE, search=None,
+             num_players=None, status=None):
+        """
+        List saves, newest first.
+
+        Args:
+            after: Optional last save of the previous page, as returned
+            by this method, None for the first page.
+            limit: The largest number of saves to list.
+            search: Optional start of the names to list, without case.
+            num_players: Optional number of human players to list.
+            status: Optional status to list, STATUS_PLAYING,
+            STATUS_DRAW or the symbol of the winner.
+
+        Returns:
+            A list of dictionaries with the SUMMARY columns.
+        """
+        conditions, parameters = self._filters(search, num_players, status)
+        if after is not None:
+            conditions.append("(created, id) < (?, ?)")
+            parameters += [after['created'], after['id']]
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        rows = self.connection.execute(
+            f"SELECT {', '.join(self.SUMMARY)} FROM saves {where}"
+            "ORDER BY created DESC, id DESC LIMIT ?", parameters + [limit])
+        return [dict(row) for row in rows]
+
+    def count(self, search=None, num_players=None, status=None):
+        """
+        Count saves.
+
+        Args:
+            search: Optional start of the names to count, without case.
+            num_players: Optional number of human players to count.
+            status: Optional status to count.
+
+        Returns:
+            The number of matching saves.
+        """
+        conditions, parameters = self._filters(search, num_players, status)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self.connection.execute(
+            f"SELECT COUNT(*) FROM saves{where}", parameters).fetchone()[0]
+
+    def import_json(self, directory=Path("savedGames")):
+        """
+        Import the JSON files of the saved games directory.
+
+        Each file is saved under its name without .json and the time it
+        was last modified. Names already in the store are kept, so an
+        import can be repeated, and files that are no saved game are
+        skipped.
+
+        Args:
+            directory: The directory of the JSON files.
+
+        Returns:
+            The number of saves imported.
+        """
+        directory = Path(directory)
+        if not directory.is_dir():
+            return 0
+        known = {row[0].lower() for row in
+                 self.connection.execute("SELECT name FROM saves")}
+        imported = 0
+        batch = []
+        for path in sorted(directory.glob('*.json')):
+            if path.stem.lower() in known:
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as file:
+                    state = json.load(file)
+                row = self._row(path.stem, state, path.stat().st_mtime)
+            except (OSError, ValueError, KeyError, TypeError, IndexError,
+                    AttributeError):
+                continue
+            known.add(path.stem.lower())
+            batch.append(row)
+            if len(batch) == self.BATCH_SIZE:
+                imported += self._insert(batch)
+                batch = []
+        return imported + self._insert(batch)
+
+    def _insert(self, rows):
+        """
+        Insert rows of new saves in one transaction.
+
+        Args:
+            rows: Tuples as returned by _row.
+
+        Returns:
+            The number of rows inserted.
+        """
+        if not rows:
+            return 0
+        with self.connection:
+            cursor = self.connection.executemany(
+                "INSERT OR IGNORE INTO saves (name, created, num_players, "
+                "moves, status, state) VALUES (?, ?, ?, ?, ?, ?)", rows)
+        # Rows whose name was saved meanwhile are ignored, not counted
+        return cursor.rowcount
+
+    @staticmethod
+    def describe(save):
+        """
+        Describe a listed save in one line.
+
+        Args:
+            save: A dictionary as returned by page.
+
+        Returns:
+            The name, time, mode, moves and status of the save.
+        """
+        created = datetime.fromtimestamp(save['created'])
+        players = f"{save['num_players']} player" \
+            + ("s" if save['num_players'] != 1 else "")
+        status = save['status']
+        if status not in (SaveStore.STATUS_PLAYING, SaveStore.STATUS_DRAW):
+            status = f"{status} won"
+        return (f"{save['name']} ({created:%Y-%m-%d %H:%M}, {players}, "
+                f"{save['moves']} moves, {status})")
+
+
+def main(argv=None):
+    """
+    Import and list saved games from the command line.
+
+    Args:
+        argv: Optional command line arguments, sys.argv is used if None.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', default=str(SaveStore.DEFAULT_PATH),
+                        help="the database file")
+    parser.add_argument('--import-dir',
+                        help="import the JSON saves of this directory")
+    parser.add_argument('--search', help="list the names starting with this")
+    parser.add_argument('--limit', type=int, default=SaveStore.PAGE_SIZE)
+    args = parser.parse_args(argv)
+    with SaveStore(args.db) as store:
+        if args.import_dir:
+            print(f"Imported {store.import_json(args.import_dir)} saves")
+        print(f"{store.count(args.search)} saves")
+        for save in store.page(limit=args.limit, search=args.search):
+            print(SaveStore.describe(save))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,510 @@
+"""Hosts many games at once over TCP with a line-delimited JSON protocol.
+
+Every request and response is one JSON object on one line. Requests
+name an operation in "op":
+
+    {"op": "new", "size": 3, "computer": "O"}   start a game, "computer"
+                                                 is "X", "O" or null
+    {"op": "move", "index": 4}                   or "row" and "column"
+    {"op": "state"}
+    {"op": "save", "name": "my_game"}
+    {"op": "load", "name": "my_game"}
+
+Responses carry "ok" and either the game state or an "error" message.
+Each connection is one session, idle sessions are closed after
+idle_timeout seconds. Games are saved in the SaveStore database of the
+save directory, the JSON saves found there are imported at start.
+
+Example:
+    python server.py --port 8765 --processes 4
+"""
+
+import argparse
+import asyncio
+import json
+import itertools
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from board import BoardGeometry, GameBoard
+from game import Game
+from player import ComputerPlayer
+from savestore import SaveStore
+from solver import PerfectPlayTable
+
+RESULT_NAMES = {GameBoard.BOARD_PLAYER_X: "X", GameBoard.BOARD_PLAYER_O: "O",
+                0: "draw", None: None}
+
+
+def computer_move(board, player_type):
+    """
+    Search the computer's move, run in the server's executor.
+
+    Args:
+        board: The current state of the game board.
+        player_type: The symbol the computer plays.
+
+    Returns:
+        The action of the computer.
+    """
+    return ComputerPlayer(player_type,
+                          ComputerPlayer.SEARCH_PERFECT).make_move(board)
+
+
+class Session:
+    """The game and bookkeeping of one client connection."""
+
+    def __init__(self, session_id, writer):
+        """
+        Initialize a session without a game.
+
+        Args:
+            session_id: The number of the session.
+            writer: The asyncio StreamWriter of the connection.
+        """
+        self.session_id = session_id
+        self.writer = writer
+        self.game = None
+        self.computer = None
+        self.last_active = time.monotonic()
+
+
+class GameServer:
+    """asyncio TCP server running one Game per connection."""
+    IDLE_TIMEOUT = 300
+    # Pending connections the OS queues while the loop is busy
+    BACKLOG = 4096
+    # Saved game names are shown in the terminal game, so keep them plain
+    SAVE_NAME = re.compile(r"^[\w\- ]{1,64}$")
+
+    def __init__(self, host="127.0.0.1", port=8765, executor=None,
+                 idle_timeout=IDLE_TIMEOUT, save_dir=Path("savedGames")):
+        """
+        Initialize the server.
+
+        Args:
+            host: The address to listen on.
+            port: The TCP port to listen on, 0 picks a free one.
+            executor: Optional concurrent.futures executor for computer
+            moves and database access, the loop's default if None.
+            idle_timeout: Seconds after which a silent session is closed.
+            save_dir: The directory of the save database.
+        """
+        self.host = host
+        self.port = port
+        self.executor = executor
+        self.idle_timeout = idle_timeout
+        self.save_dir = Path(save_dir)
+        self.save_path = self.save_dir / SaveStore.DEFAULT_PATH.name
+        self.sessions = {}
+        self.evicted = 0
+        self._ids = itertools.count(1)
+        self._server = None
+        self._reaper = None
+        # The handle_client tasks of the open connections
+        self._clients = set()
+
+    async def start(self):
+        """
+        Load the perfect play table and import the JSON saves, then start
+        listening and evicting idle sessions.
+
+        Returns:
+            The (host, port) the server listens on.
+        """
+        # Solve the game before the first client waits for it
+        await self._run(PerfectPlayTable.shared)
+        await self._run(self._import_saves, self.save_path)
+        self._server = await asyncio.start_server(
+            self.handle_client, self.host, self.port, backlog=self.BACKLOG)
+        self._reaper = asyncio.create_task(self._evict_idle())
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        """
+        Start the server and run until it is cancelled.
+        """
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """
+        Stop listening and close every session.
+
+        The client tasks are cancelled and awaited, so none is left
+        pending when the loop closes.
+        """
+        tasks = list(self._clients)
+        if self._reaper is not None:
+            tasks.append(self._reaper)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for session in list(self.sessions.values()):
+            session.writer.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def handle_client(self, reader, writer):
+        """
+        Answer the requests of one connection until it is closed.
+
+        Args:
+            reader: The asyncio StreamReader of the connection.
+            writer: The asyncio StreamWriter of the connection.
+        """
+        session = Session(next(self._ids), writer)
+        self.sessions[session.session_id] = session
+        task = asyncio.current_task()
+        self._clients.add(task)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                session.last_active = time.monotonic()
+                response = await self.handle_line(session, line)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            # Cancelled by close(), ending normally keeps asyncio's stream
+            # callback from logging the cancellation as an error
+            pass
+        finally:
+            self._clients.discard(task)
+            del self.sessions[session.session_id]
+            writer.close()
+
+    async def handle_line(self, session, line):
+        """
+        Decode one request line and run its operation.
+
+        Args:
+            session: The Session that sent the request.
+            line: The request as bytes.
+
+        Returns:
+            The response as a dictionary.
+        """
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return {"ok": False, "error": "Invalid JSON"}
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "Request must be an object"}
+        handler = {"new": self.new_game, "move": self.move,
+                   "state": self.state, "save": self.save,
+                   "load": self.load}.get(request.get("op"))
+        if handler is None:
+            return {"ok": False, "error": f"Unknown op {request.get('op')!r}"}
+        try:
+            return await handler(session, request)
+        except KeyError as error:
+            return {"ok": False, "error": f"Missing field {error}"}
+        except (ValueError, TypeError, OSError) as error:
+            return {"ok": False, "error": str(error)}
+
+    async def new_game(self, session, request):
+        """
+        Start a new game in the session.
+
+        Args:
+            session: The Session of the client.
+            request: The request with optional "size" and "computer".
+
+        Returns:
+            The state of the new game.
+        """
+        size = request.get("size", 3)
+        if size not in BoardGeometry.WIN_LENGTHS:
+            raise ValueError(f"Invalid board size {size!r}")
+        computer = request.get("computer", GameBoard.BOARD_PLAYER_O)
+        if computer not in (GameBoard.BOARD_PLAYER_X,
+                            GameBoard.BOARD_PLAYER_O, None):
+            raise ValueError(f"Invalid computer player {computer!r}")
+        session.game = Game(
+            GameBoard(size, size, BoardGeometry.WIN_LENGTHS[size]),
+            1 if computer else 2)
+        session.computer = computer
+        computer_index = await self._computer_turn(session)
+        return self._state(session, computer_index)
+
+    async def move(self, session, request):
+        """
+        Play the client's move and the computer's answer.
+
+        Args:
+            session: The Session of the client.
+            request: The request with "index" or "row" and "column",
+            counted from 1 like the terminal game.
+
+        Returns:
+            The state after both moves.
+        """
+        game = self._game(session)
+        if "index" in request:
+            index = request["index"]
+        else:
+            row, column = request["row"], request["column"]
+            if not isinstance(row, int) or not isinstance(column, int) \
+                    or not 1 <= row <= game.board.rows \
+                    or not 1 <= column <= game.board.columns:
+                raise ValueError("Invalid row or column")
+            index = (row - 1) * game.board.columns + column - 1
+        if session.computer == game.current_player():
+            raise ValueError("It is the computer's turn")
+        game.play(index)
+        computer_index = await self._computer_turn(session)
+        return self._state(session, computer_index)
+
+    async def state(self, session, request):
+        """
+        Report the state of the session's game.
+
+        Args:
+            session: The Session of the client.
+            request: The request, it has no arguments.
+
+        Returns:
+            The state of the game.
+        """
+        del request
+        self._game(session)
+        return self._state(session)
+
+    async def save(self, session, request):
+        """
+        Save the session's game under a name.
+
+        Args:
+            session: The Session of the client.
+            request: The request with the "name" to save under.
+
+        Returns:
+            The saved name.
+        """
+        name = self._save_name(request.get("name"))
+        state = self._game(session).to_dict()
+        await self._run(self._write_save, self.save_path, name, state)
+        return {"ok": True, "name": name}
+
+    async def load(self, session, request):
+        """
+        Replace the session's game with a saved one.
+
+        Single player games are resumed with the computer as O, as in
+        the terminal game.
+
+        Args:
+            session: The Session of the client.
+            request: The request with the "name" of the save.
+
+        Returns:
+            The state of the loaded game.
+        """
+        name = self._save_name(request.get("name"))
+        state = await self._run(self._read_save, self.save_path, name)
+        if state is None:
+            raise ValueError(f"No saved game {name!r}")
+        # Checked first, the board setter fails on a short board
+        if len(state['board']) != state.get('rows', 3) \
+                * state.get('columns', 3):
+            raise ValueError("Damaged saved game")
+        game = Game.from_dict(state)
+        session.game = game
+        session.computer = GameBoard.BOARD_PLAYER_O \
+            if game.num_players == 1 else None
+        computer_index = await self._computer_turn(session)
+        return self._state(session, computer_index)
+
+    @staticmethod
+    def _game(session):
+        """
+        Return the session's game.
+
+        Args:
+            session: The Session of the client.
+
+        Returns:
+            The Game of the session.
+
+        Raises:
+            ValueError: If no game was started.
+        """
+        if session.game is None:
+            raise ValueError("No game, send 'new' or 'load' first")
+        return session.game
+
+    def _save_name(self, name):
+        """
+        Check a save name given by the client.
+
+        Args:
+            name: The name given by the client.
+
+        Returns:
+            The name.
+
+        Raises:
+            ValueError: If the name is not a plain name.
+        """
+        if not isinstance(name, str) or not self.SAVE_NAME.match(name):
+            raise ValueError("Invalid save name")
+        return name
+
+    # The store functions run in the executor, which may be a process
+    # pool, so each opens the database by its path instead of sharing a
+    # connection
+    @staticmethod
+    def _import_saves(path):
+        """
+        Create the save database and import the JSON saves beside it.
+
+        Args:
+            path: The Path of the database.
+        """
+        with SaveStore(path) as store:
+            store.import_json(path.parent)
+
+    @staticmethod
+    def _write_save(path, name, state):
+        """
+        Save a game in the database, run in the executor.
+
+        Args:
+            path: The Path of the database.
+            name: The name of the save.
+            state: The saved-game dictionary.
+        """
+        with SaveStore(path) as store:
+            store.save(name, state)
+
+    @staticmethod
+    def _read_save(path, name):
+        """
+        Read a saved game from the database, run in the executor.
+
+        Args:
+            path: The Path of the database.
+            name: The name of the save.
+
+        Returns:
+            The saved dictionary, or None if there is no such save.
+        """
+        with SaveStore(path) as store:
+            save_id = store.find(name)
+            return store.load(save_id) if save_id is not None else None
+
+    async def _run(self, function, *args):
+        """
+        Run a blocking function in the executor.
+
+        Args:
+            function: The function to run.
+            *args: The arguments of the function.
+
+        Returns:
+            The result of the function.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, function, *args)
+
+    async def _computer_turn(self, session):
+        """
+        Let the computer move if it is its turn.
+
+        Moves that are not in the perfect play table are searched in the
+        executor, so other sessions are served meanwhile.
+
+        Args:
+            session: The Session of the client.
+
+        Returns:
+            The index the computer marked, or None.
+        """
+        game = session.game
+        if session.computer is None or game.result() is not None \
+                or game.current_player() != session.computer:
+            return None
+        # Table lookups take microseconds, only real searches leave the loop
+        action = PerfectPlayTable.shared().best_action(game.board)
+        if action is None:
+            action = await self._run(computer_move, game.board,
+                                     session.computer)
+        game.play(action)
+        return action[1]
+
+    @staticmethod
+    def _state(session, computer_index=None):
+        """
+        Describe the session's game for a response.
+
+        Args:
+            session: The Session of the client.
+            computer_index: The space the computer just marked, if any.
+
+        Returns:
+            The response dictionary.
+        """
+        game = session.game
+        state = game.to_dict()
+        state.update({"ok": True, "session": session.session_id,
+                      "computer": session.computer,
+                      "computer_move": computer_index,
+                      "result": RESULT_NAMES[game.result()],
+                      "legal_moves": game.legal_moves()})
+        return state
+
+    async def _evict_idle(self):
+        """
+        Close sessions that sent nothing for idle_timeout seconds.
+        """
+        while True:
+            await asyncio.sleep(max(self.idle_timeout / 4, 0.01))
+            deadline = time.monotonic() - self.idle_timeout
+            for session in list(self.sessions.values()):
+                if session.last_active < deadline:
+                    self.evicted += 1
+                    session.writer.close()
+
+
+def main(argv=None):
+    """
+    Run the server from the command line.
+
+    Args:
+        argv: Optional command line arguments, sys.argv is used if None.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--processes", type=int, default=0,
+                        help="processes for computer moves, 0 for threads")
+    parser.add_argument("--idle-timeout", type=float,
+                        default=GameServer.IDLE_TIMEOUT)
+    args = parser.parse_args(argv)
+    executor = ProcessPoolExecutor(args.processes) if args.processes else None
+    server = GameServer(args.host, args.port, executor, args.idle_timeout)
+
+    async def run():
+        host, port = await server.start()
+        print(f"Serving games on {host}:{port}")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
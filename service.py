@@ -0,0 +1,367 @@
+"""HTTP service answering "what is the best move for this board?".
+
+POST a board to /best-move:
+
+    {"board": ["X", 0, 0, 0, "O", 0, 0, 0, 0]}
+
+Square boards of the game's sizes may leave out "rows", "columns" and
+"win_length", other boards give them. Empty
+spaces may be 0, "", " " or null. The answer holds the best "move", its
+"score" for the side to move (positive wins, 0 draws) and the principal
+variation "pv", the moves both sides are expected to play from here.
+GET /metrics reports the cache hit ratio and request latency.
+
+Example:
+    python service.py --port 8080
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from board import BoardGeometry, GameBoard
+from engine import IterativeDeepeningEngine
+from solver import PerfectPlayTable
+
+
+class LRUCache:
+    """Thread safe mapping that forgets the least recently used entries."""
+
+    def __init__(self, maxsize):
+        """
+        Initialize an empty cache.
+
+        Args:
+            maxsize: The largest number of entries kept.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """
+        Return the number of cached entries.
+        """
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Look up an entry and mark it as recently used.
+
+        Args:
+            key: The key of the entry.
+
+        Returns:
+            The cached value, or None if the key is not cached.
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        """
+        Store an entry, evicting the least recently used one when full.
+
+        Args:
+            key: The key of the entry.
+            value: The value to cache, not None.
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def hit_ratio(self):
+        """
+        Return the share of lookups that were hits, 0 before any lookup.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class BestMoveService:
+    """Finds best moves and keeps the results and request metrics."""
+    CACHE_SIZE = 100000
+    # Nodes searched on boards larger than 3x3, fixed so that cached
+    # answers do not depend on how busy the machine was
+    NODE_LIMIT = 50000
+    LATENCY_WINDOW = 10000
+    EMPTY_SPACES = (0, "", " ", None)
+
+    def __init__(self, cache_size=CACHE_SIZE, node_limit=NODE_LIMIT):
+        """
+        Initialize the service with an empty cache.
+
+        Args:
+            cache_size: The number of positions whose answers are kept.
+            node_limit: Nodes searched per position larger than 3x3.
+        """
+        self.cache = LRUCache(cache_size)
+        self.node_limit = node_limit
+        self.requests = 0
+        self.errors = 0
+        self._latencies = deque(maxlen=self.LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def parse_board(self, request):
+        """
+        Build a GameBoard from a request body.
+
+        Args:
+            request: The decoded JSON body.
+
+        Returns:
+            The GameBoard.
+
+        Raises:
+            ValueError: If the board is missing, malformed or impossible.
+        """
+        if not isinstance(request, dict) or \
+                not isinstance(request.get("board"), list):
+            raise ValueError("Expected an object with a 'board' list")
+        spaces = request["board"]
+        size = len(spaces)
+        side = round(size ** 0.5)
+        rows = request.get("rows", side)
+        columns = request.get("columns", side)
+        win_length = request.get("win_length")
+        if win_length is None and rows == columns:
+            win_length = BoardGeometry.WIN_LENGTHS.get(rows)
+        for value in (rows, columns, win_length):
+            if not isinstance(value, int) or not 1 <= value <= 10:
+                raise ValueError("Invalid board dimensions")
+        if rows * columns != size:
+            raise ValueError(f"A {rows}x{columns} board has "
+                             f"{rows * columns} spaces, not {size}")
+        board = GameBoard(rows, columns, win_length)
+        cells = []
+        for space in spaces:
+            if space in self.EMPTY_SPACES:
+                cells.append(GameBoard.BOARD_EMPTY)
+            elif space in (GameBoard.BOARD_PLAYER_X, GameBoard.BOARD_PLAYER_O):
+                cells.append(space)
+            else:
+                raise ValueError(f"Invalid space {space!r}")
+        x_count = cells.count(GameBoard.BOARD_PLAYER_X)
+        if x_count - cells.count(GameBoard.BOARD_PLAYER_O) not in (0, 1):
+            raise ValueError("Impossible number of X and O marks")
+        board.board = cells
+        return board
+
+    def best_move(self, board):
+        """
+        Answer a position, from the cache when it was seen before.
+
+        Positions are cached under their canonical key, with the moves
+        stored for the canonical board and mapped back to this one.
+
+        Args:
+            board: The current state of the game board.
+
+        Returns:
+            A dictionary with "move", "score", "pv" and "cached".
+
+        Raises:
+            ValueError: If the game is already over.
+        """
+        if board.check_terminal_state() is not None:
+            raise ValueError("The game is over")
+        key, symmetry = board.canonical_form()
+        key = (board.rows, board.columns, board.win_length, key)
+        cached = self.cache.get(key)
+        if cached is None:
+            score, variation = self._search(board)
+            # Store the moves for the canonical board
+            inverse = {index: position
+                       for position, index in enumerate(symmetry)}
+            cached = (score, tuple(inverse[index] for index in variation))
+            self.cache.put(key, cached)
+            hit = False
+        else:
+            hit = True
+        score, variation = cached
+        variation = [symmetry[position] for position in variation]
+        return {"move": variation[0], "score": score, "pv": variation,
+                "cached": hit}
+
+    def _search(self, board):
+        """
+        Find the score and principal variation of a position.
+
+        3x3 boards are looked up in the perfect play table, larger ones
+        searched by the IterativeDeepeningEngine.
+
+        Args:
+            board: The current state of the game board.
+
+        Returns:
+            A tuple (score, variation) with variation a list of indexes.
+        """
+        table = PerfectPlayTable.shared()
+        entry = table.lookup(board)
+        if entry is not None:
+            variation = []
+            action = table.best_action(board)
+            while action is not None:
+                board.push(action)
+                variation.append(action[1])
+                action = table.best_action(board)
+            for _ in variation:
+                board.pop()
+            return entry[0], variation
+        engine = IterativeDeepeningEngine(node_limit=self.node_limit)
+        result = engine.search(board)
+        variation = engine.principal_variation(board) or [result.action[1]]
+        return result.score, variation
+
+    def record(self, seconds, error=False):
+        """
+        Count a request and its latency.
+
+        Args:
+            seconds: The time taken to answer the request.
+            error: Whether the request failed.
+        """
+        with self._lock:
+            self.requests += 1
+            self.errors += error
+            self._latencies.append(seconds)
+
+    def metrics(self):
+        """
+        Report cache and latency figures.
+
+        Returns:
+            A dictionary of metrics, latencies in milliseconds over the
+            last LATENCY_WINDOW requests.
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            requests, errors = self.requests, self.errors
+        metrics = {
+            "requests": requests,
+            "errors": errors,
+            "cache_size": len(self.cache),
+            "cache_hits": self.cache.hits,
+            "cache_misses": self.cache.misses,
+            "cache_hit_ratio": self.cache.hit_ratio(),
+        }
+        if latencies:
+            metrics["latency_ms"] = {
+                "mean": statistics.fmean(latencies) * 1000,
+                "p50": latencies[int(0.50 * (len(latencies) - 1))] * 1000,
+                "p99": latencies[int(0.99 * (len(latencies) - 1))] * 1000,
+                "max": latencies[-1] * 1000,
+            }
+        return metrics
+
+
+class BestMoveHandler(BaseHTTPRequestHandler):
+    """Routes HTTP requests to the server's BestMoveService."""
+    MAX_BODY = 65536
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """
+        Serve GET /metrics.
+        """
+        if self.path.rstrip("/") == "/metrics":
+            self._send(200, self.server.service.metrics())
+        else:
+            self._send(404, {"error": "Not found"})
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """
+        Serve POST /best-move.
+        """
+        if self.path.rstrip("/") != "/best-move":
+            self._send(404, {"error": "Not found"})
+            return
+        service = self.server.service
+        start = time.perf_counter()
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            if not 0 < length <= self.MAX_BODY:
+                raise ValueError("Missing or too large request body")
+            request = json.loads(self.rfile.read(length))
+            status, body = 200, service.best_move(service.parse_board(request))
+        except ValueError as error:
+            status, body = 400, {"error": str(error)}
+        service.record(time.perf_counter() - start, status != 200)
+        self._send(status, body)
+
+    def _send(self, status, body):
+        """
+        Write a JSON response.
+
+        Args:
+            status: The HTTP status code.
+            body: The dictionary to send as JSON.
+        """
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """
+        Keep the request log quiet, /metrics reports the traffic.
+        """
+
+
+def make_server(host="127.0.0.1", port=8080, service=None):
+    """
+    Create the HTTP server, one thread per connection.
+
+    Args:
+        host: The address to listen on.
+        port: The TCP port to listen on, 0 picks a free one.
+        service: Optional BestMoveService, a new one if None.
+
+    Returns:
+        The ThreadingHTTPServer, with the service as its service attribute.
+    """
+    server = ThreadingHTTPServer((host, port), BestMoveHandler)
+    server.service = service or BestMoveService()
+    return server
+
+
+def main(argv=None):
+    """
+    Run the service from the command line.
+
+    Args:
+        argv: Optional command line arguments, sys.argv is used if None.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--cache-size", type=int,
+                        default=BestMoveService.CACHE_SIZE)
+    args = parser.parse_args(argv)
+    PerfectPlayTable.shared()
+    server = make_server(args.host, args.port,
+                         BestMoveService(args.cache_size))
+    print(f"Serving best moves on {args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
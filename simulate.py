@@ -0,0 +1,189 @@
+"""Plays games between computer players without the terminal interface.
+
+Example:
+    python simulate.py --games 100000 --x random --o perfect --out games.jsonl
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from board import BoardGeometry, GameBoard
+from game import Game
+from mcts import MCTSPlayer
+from player import ComputerPlayer, RandomPlayer
+
+# Player names accepted by the simulator, each a factory (symbol, seed)
+PLAYERS = {
+    'random': RandomPlayer,
+    'minimax': lambda symbol, seed: ComputerPlayer(
+        symbol, ComputerPlayer.SEARCH_MINIMAX),
+    'alphabeta': lambda symbol, seed: ComputerPlayer(
+        symbol, ComputerPlayer.SEARCH_ALPHA_BETA),
+    'perfect': lambda symbol, seed: ComputerPlayer(
+        symbol, ComputerPlayer.SEARCH_PERFECT),
+    'iterative': lambda symbol, seed: ComputerPlayer(
+        symbol, ComputerPlayer.SEARCH_ITERATIVE, node_limit=20000),
+    'mcts': lambda symbol, seed: MCTSPlayer(symbol, iterations=500,
+                                            seed=seed),
+}
+
+
+def play_game(x_player, o_player, shape=(3, 3, 3)):
+    """
+    Play one game to the end.
+
+    Args:
+        x_player: The Player making the X moves.
+        o_player: The Player making the O moves.
+        shape: A tuple (rows, columns, win_length) of the board.
+
+    Returns:
+        A dictionary with the moves, the winner ("X", "O" or "draw"),
+        the number of plies and the seconds spent by each player.
+    """
+    game = Game(GameBoard(*shape), 0)
+    players = {GameBoard.BOARD_PLAYER_X: x_player,
+               GameBoard.BOARD_PLAYER_O: o_player}
+    seconds = {GameBoard.BOARD_PLAYER_X: 0.0, GameBoard.BOARD_PLAYER_O: 0.0}
+    moves = []
+    winner = game.result()
+    while winner is None:
+        symbol = game.current_player()
+        start = time.perf_counter()
+        action = players[symbol].make_move(game.board)
+        seconds[symbol] += time.perf_counter() - start
+        game.play(action)
+        moves.append(action[1])
+        winner = game.result()
+    return {'moves': moves, 'winner': winner or 'draw', 'plies': len(moves),
+            'seconds': seconds}
+
+
+def play_games(first_game, count, x_name, o_name, shape, seed):
+    """
+    Play a run of games, the unit of work of a worker process.
+
+    Args:
+        first_game: The number of the first game of the run.
+        count: The number of games to play.
+        x_name: The PLAYERS name of the X player.
+        o_name: The PLAYERS name of the O player.
+        shape: A tuple (rows, columns, win_length) of the board.
+        seed: The base seed, game n seeds its players with seed + 2n
+        and seed + 2n + 1.
+
+    Returns:
+        A list of game records as returned by play_game, each with its
+        game number and player names added.
+    """
+    records = []
+    for game in range(first_game, first_game + count):
+        record = {'game': game, 'x': x_name, 'o': o_name}
+        record.update(play_game(
+            PLAYERS[x_name](GameBoard.BOARD_PLAYER_X, seed + 2 * game),
+            PLAYERS[o_name](GameBoard.BOARD_PLAYER_O, seed + 2 * game + 1),
+            shape))
+        records.append(record)
+    return records
+
+
+def simulate(games, x_name, o_name, output, shape=(3, 3, 3), workers=1,
+             chunk_size=1000, seed=0):
+    """
+    Play many games on a process pool and stream the records as JSONL.
+
+    Records are written in game order as soon as their run is done.
+
+    Args:
+        games: The number of games to play.
+        x_name: The PLAYERS name of the X player.
+        o_name: The PLAYERS name of the O player.
+        output: A text file to write one JSON record per line to.
+        shape: A tuple (rows, columns, win_length) of the board.
+        workers: The number of processes, 1 plays in this process and
+        None uses every core.
+        chunk_size: The number of games per unit of work.
+        seed: The base seed of the random players.
+
+    Returns:
+        A dictionary counting the wins of "X" and "O" and the "draw"s.
+    """
+    for name in (x_name, o_name):
+        if name not in PLAYERS:
+            raise ValueError(f"Unknown player '{name}'")
+    workers = workers or os.cpu_count() or 1
+    starts = range(0, games, chunk_size)
+    arguments = (list(starts),
+                 [min(chunk_size, games - start) for start in starts],
+                 [x_name] * len(starts), [o_name] * len(starts),
+                 [shape] * len(starts), [seed] * len(starts))
+    totals = {GameBoard.BOARD_PLAYER_X: 0, GameBoard.BOARD_PLAYER_O: 0,
+              'draw': 0}
+    if workers == 1:
+        _write_records(map(play_games, *arguments), output, totals)
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            _write_records(executor.map(play_games, *arguments),
+                           output, totals)
+    return totals
+
+
+def _write_records(runs, output, totals):
+    """
+    Write the records of finished runs and count the results.
+
+    Args:
+        runs: An iterable of record lists.
+        output: A text file to write one JSON record per line to.
+        totals: A dictionary of result counts, updated in place.
+    """
+    for records in runs:
+        output.writelines(json.dumps(record) + "\n" for record in records)
+        for record in records:
+            totals[record['winner']] += 1
+
+
+def main(argv=None):
+    """
+    Run a simulation from the command line and print a summary.
+
+    Args:
+        argv: Optional command line arguments, sys.argv is used if None.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--x', choices=sorted(PLAYERS), default='random')
+    parser.add_argument('--o', choices=sorted(PLAYERS), default='random')
+    parser.add_argument('--size', type=int, default=3,
+                        choices=sorted(BoardGeometry.WIN_LENGTHS))
+    parser.add_argument('--win-length', type=int, default=None)
+    parser.add_argument('--workers', type=int, default=None,
+                        help="processes to use, every core by default")
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default='-',
+                        help="JSONL file to write, '-' for stdout")
+    args = parser.parse_args(argv)
+    shape = (args.size, args.size,
+             args.win_length or BoardGeometry.WIN_LENGTHS[args.size])
+
+    start = time.perf_counter()
+    if args.out == '-':
+        totals = simulate(args.games, args.x, args.o, sys.stdout, shape,
+                          args.workers, args.chunk_size, args.seed)
+    else:
+        with open(args.out, 'w', encoding='utf-8') as output:
+            totals = simulate(args.games, args.x, args.o, output, shape,
+                              args.workers, args.chunk_size, args.seed)
+    elapsed = time.perf_counter() - start
+    print(f"X wins: {totals['X']}, O wins: {totals['O']}, "
+          f"draws: {totals['draw']}, "
+          f"{args.games / elapsed * 3600:,.0f} games per hour",
+          file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+"""Solves the game once so that perfect moves can be looked up."""
+
+from array import array
+from pathlib import Path
+import sys
+from board import GameBoard
+
+
+class PerfectPlayTable:
+    """
+    Minimax values and optimal moves for every reachable position.
+
+    Positions are indexed by a base-3 hash of the board, cell i adding
+    code * 3**i with 0 = empty, 1 = X and 2 = O. Values are seen from
+    the side to move: a win in n plies scores 11 - n, a loss -(11 - n)
+    and a draw 0, so a finished game scores -11 for the side that lost.
+    """
+    VERSION = 1
+    MAGIC = b"TTT"
+    SIZE = 3 ** 9
+    UNREACHABLE = -128
+    DEFAULT_PATH = Path(__file__).with_name("perfect_play.bin")
+    _shared = None
+
+    def __init__(self):
+        """
+        Initialize an empty table in which no position is reachable.
+        """
+        self.values = array('b', [self.UNREACHABLE]) * self.SIZE
+        self.moves = array('H', [0]) * self.SIZE
+        self.positions = 0
+
+    @staticmethod
+    def index_of(cells):
+        """
+        Compute the base-3 index of a board.
+
+        Args:
+            cells: The board as a list of 9 symbols.
+
+        Returns:
+            The index of the board in the table.
+        """
+        index = 0
+        for space in reversed(cells):
+            index = index * 3 + GameBoard.CELL_CODES[space]
+        return index
+
+    @classmethod
+    def build(cls):
+        """
+        Solve every position reachable from the empty board.
+
+        Returns:
+            A filled PerfectPlayTable.
+        """
+        table = cls()
+        table.solve(GameBoard(), 0)
+        return table
+
+    def solve(self, board, index):
+        """
+        Solve a position and every position reachable from it.
+
+        Args:
+            board: The board to solve, restored before returning.
+            index: The base-3 index of the board.
+
+        Returns:
+            The value of the position for the side to move.
+        """
+        value = self.values[index]
+        if value != self.UNREACHABLE:
+            return value
+        self.positions += 1
+        terminal_state = board.check_terminal_state()
+        if terminal_state is not None:
+            value = -11 if terminal_state else 0
+            self.values[index] = value
+            return value
+
+        best_value = -11
+        best_moves = 0
+        for action in board.available_actions():
+            player, cell = action
+            board.push(action)
+            child_value = -self.solve(
+                board, index + GameBoard.CELL_CODES[player] * 3 ** cell)
+            board.pop()
+            # Results further away are worth one point less per ply
+            if child_value > 0:
+                child_value -= 1
+            elif child_value < 0:
+                child_value += 1
+            if child_value > best_value:
+                best_value = child_value
+                best_moves = 0
+            if child_value == best_value:
+                best_moves |= 1 << cell
+        self.values[index] = best_value
+        self.moves[index] = best_moves
+        return best_value
+
+    def lookup(self, board):
+        """
+        Look up a position.
+
+        Args:
+            board: The current state of the game board.
+
+        Returns:
+            A tuple (value, moves) where moves is a bitmask of the optimal
+            cells, or None if the position is not reachable in a game.
+        """
+        if len(board.board) != 9 or board.rows != 3 \
+                or board.win_length != 3:
+            return None
+        try:
+            index = self.index_of(board.board)
+        except (KeyError, TypeError):
+            return None
+        if index >= self.SIZE or self.values[index] == self.UNREACHABLE:
+            return None
+        return self.values[index], self.moves[index]
+
+    def best_action(self, board):
+        """
+        Pick the optimal move with the lowest index, as minimax does.
+
+        Args:
+            board: The current state of the game board.
+
+        Returns:
+            An action tuple, or None if the game is over or the position
+            is not in the table.
+        """
+        entry = self.lookup(board)
+        if entry is None or not entry[1]:
+            return None
+        moves = entry[1]
+        return (board.current_player(), (moves & -moves).bit_length() - 1)
+
+    def save(self, path=DEFAULT_PATH):
+        """
+        Write the table to a versioned binary file.
+
+        Args:
+            path: The file to write.
+        """
+        with open(path, 'wb') as file:
+            file.write(self.MAGIC + bytes([self.VERSION]))
+            self.values.tofile(file)
+            moves = array('H', self.moves)
+            if sys.byteorder != 'little':
+                moves.byteswap()
+            moves.tofile(file)
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH):
+        """
+        Read a table written by save.
+
+        Args:
+            path: The file to read.
+
+        Returns:
+            The loaded table, or None if the file is missing, damaged
+            or written by another version.
+        """
+        table = cls()
+        try:
+            with open(path, 'rb') as file:
+                if file.read(4) != cls.MAGIC + bytes([cls.VERSION]):
+                    return None
+                table.values = array('b')
+                table.values.fromfile(file, cls.SIZE)
+                table.moves = array('H')
+                table.moves.fromfile(file, cls.SIZE)
+        except (OSError, EOFError):
+            return None
+        if sys.byteorder != 'little':
+            table.moves.byteswap()
+        table.positions = sum(1 for value in table.values
+                              if value != cls.UNREACHABLE)
+        return table
+
+    @classmethod
+    def shared(cls):
+        """
+        Return the process wide table, loading or building it on first use.
+
+        Returns:
+            The shared PerfectPlayTable.
+        """
+        if cls._shared is None:
+            cls._shared = cls.load() or cls.build()
+        return cls._shared
+
+
+if __name__ == '__main__':
+    PerfectPlayTable.build().save()
+    print(f"Perfect play table written to '{PerfectPlayTable.DEFAULT_PATH}'")
@@ -0,0 +1,75 @@
+"""Unit tests for the NumPy batch evaluation."""
+import itertools
+import unittest
+from board import GameBoard
+
+try:
+    import numpy as np
+    import batch
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestEvaluateBoards(unittest.TestCase):
+    """Unit tests for evaluate_boards."""
+
+    def test_matches_game_board(self):
+        """Test every 3x3 board with at most one winner against GameBoard."""
+        cells = np.array(list(itertools.product((0, 1, 2), repeat=9)),
+                         dtype=np.int8)
+        result = batch.evaluate_boards(cells)
+        symbols = (GameBoard.BOARD_EMPTY, GameBoard.BOARD_PLAYER_X,
+                   GameBoard.BOARD_PLAYER_O)
+        board = GameBoard()
+        checked = 0
+        for row in range(0, len(cells), 7):
+            board.board = [symbols[code] for code in cells[row]]
+            lines = board.geometry.lines
+            owners = {board.board[line[0]] for line in lines
+                      if board.board[line[0]] != GameBoard.BOARD_EMPTY
+                      and len({board.board[i] for i in line}) == 1}
+            if len(owners) > 1:
+                continue
+            checked += 1
+            state = board.check_terminal_state()
+            winner = symbols.index(state) if state else 0
+            self.assertEqual(result.winners[row], winner)
+            self.assertEqual(bool(result.draws[row]), state == 0)
+            player = board.current_player() if state is None else 0
+            self.assertEqual(result.to_move[row], symbols.index(player))
+            legal = [action[1] for action in board.available_actions()] \
+                if state is None else []
+            self.assertEqual(np.flatnonzero(result.legal[row]).tolist(),
+                             legal)
+        self.assertGreater(checked, 2000)
+
+    def test_to_array(self):
+        """Test that GameBoards are encoded with the cell codes."""
+        board = GameBoard()
+        board.apply_action(("X", 4))
+        board.apply_action(("O", 0))
+        array = batch.to_array([GameBoard(), board])
+        self.assertEqual(array.shape, (2, 9))
+        self.assertEqual(array[1].tolist(), [2, 0, 0, 0, 1, 0, 0, 0, 0])
+        result = batch.evaluate_boards(array)
+        self.assertEqual(result.to_move.tolist(), [1, 1])
+        self.assertEqual(len(result), 2)
+
+    def test_larger_board(self):
+        """Test a diagonal of four on a 5x5 board."""
+        cells = np.zeros((1, 25), dtype=np.int8)
+        cells[0, [1, 7, 13, 19]] = 1
+        cells[0, [0, 5, 10]] = 2
+        result = batch.evaluate_boards(cells, 5, 5, 4)
+        self.assertEqual(result.winners.tolist(), [1])
+        self.assertFalse(result.legal.any())
+
+    def test_invalid_shape(self):
+        """Test that boards of the wrong size are rejected."""
+        with self.assertRaises(ValueError):
+            batch.evaluate_boards(np.zeros((4, 8), dtype=np.int8))
+
+
+if __name__ == '__main__':
+    unittest.main()
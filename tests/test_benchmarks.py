@@ -0,0 +1,46 @@
+"""Unit tests for the benchmark suite."""
+import unittest
+from benchmarks.suite import BENCHMARKS, compare, run_suite, time_case
+
+
+class TestSuite(unittest.TestCase):
+    """Unit tests for timing and comparing benchmark reports."""
+
+    def test_time_case(self):
+        """Test that a case is warmed up and timed the requested times."""
+        calls = []
+        result = time_case(lambda stack: lambda: calls.append(1), 10,
+                           repeat=3, warmup=2)
+        self.assertEqual(len(calls), 50)
+        self.assertEqual(result['repeat'], 3)
+        self.assertLessEqual(result['min'], result['median'])
+
+    def test_before_run(self):
+        """Test that before_run prepares every run outside the timing."""
+        calls = []
+
+        def function():
+            calls.append('call')
+        function.before_run = lambda: calls.append('setup')
+        time_case(lambda stack: function, 2, repeat=2, warmup=1)
+        self.assertEqual(calls, ['setup', 'call', 'call'] * 3)
+
+    def test_save_load_round_trip(self):
+        """Test that the persistence case runs without touching savedGames."""
+        report = run_suite(['save_load_round_trip'], repeat=1, warmup=0)
+        self.assertIn('save_load_round_trip', report['results'])
+        self.assertIn('make_move[perfect,empty]', BENCHMARKS)
+
+    def test_compare(self):
+        """Test the verdicts against a baseline."""
+        baseline = {'results': {'a': {'median': 1.0}, 'b': {'median': 1.0},
+                                'c': {'median': 1.0}}}
+        report = {'results': {'a': {'median': 1.5}, 'b': {'median': 0.5},
+                              'c': {'median': 1.05}, 'd': {'median': 1.0}}}
+        verdicts = {row[0]: row[4] for row in compare(report, baseline, 0.1)}
+        self.assertEqual(verdicts, {'a': 'regression', 'b': 'faster',
+                                    'c': 'ok', 'd': 'new'})
+
+
+if __name__ == '__main__':
+    unittest.main()
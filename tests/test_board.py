@@ -1,7 +1,7 @@
 """Unit tests for the game board and player classes."""
 import unittest
 from unittest.mock import MagicMock
-from board import GameBoard
+from board import GameBoard, BitBoard, BoardGeometry
 from player import HumanPlayer
 from player import ComputerPlayer
 
@@ -129,6 +129,123 @@ class TestGameBoard(unittest.TestCase):
                           GameBoard.BOARD_EMPTY,
                           GameBoard.BOARD_EMPTY])
 
+    def test_push_and_pop(self):
+        """Test that pop undoes push in place and returns the action."""
+        self.board.push((GameBoard.BOARD_PLAYER_X, 4))
+        self.board.push((GameBoard.BOARD_PLAYER_O, 0))
+        self.assertEqual(self.board.board[0], GameBoard.BOARD_PLAYER_O)
+        self.assertEqual(self.board.move_stack,
+                         [(GameBoard.BOARD_PLAYER_X, 4),
+                          (GameBoard.BOARD_PLAYER_O, 0)])
+        self.assertEqual(self.board.pop(), (GameBoard.BOARD_PLAYER_O, 0))
+        self.assertEqual(self.board.pop(), (GameBoard.BOARD_PLAYER_X, 4))
+        self.assertEqual(self.board.board, [GameBoard.BOARD_EMPTY] * 9)
+        self.assertEqual(self.board.move_stack, [])
+
+    def test_pop_restores_overwritten_mark(self):
+        """Test that pop puts back the mark a push overwrote."""
+        self.board.board = ["X", "X", 0, "O", "O", 0, 0, 0, 0]
+        key = self.board.zobrist_key()
+        self.board.push((GameBoard.BOARD_PLAYER_X, 3))
+        self.assertEqual(self.board.check_terminal_state(), None)
+        self.board.push((GameBoard.BOARD_PLAYER_X, 2))
+        self.assertEqual(self.board.check_terminal_state(),
+                         GameBoard.BOARD_PLAYER_X)
+        self.board.pop()
+        self.board.pop()
+        self.assertEqual(self.board.board,
+                         ["X", "X", 0, "O", "O", 0, 0, 0, 0])
+        self.assertEqual(self.board.zobrist_key(), key)
+        self.assertEqual(self.board.current_player(), GameBoard.BOARD_PLAYER_X)
+        self.assertEqual([index for _, index in self.board.available_actions()],
+                         [2, 5, 6, 7, 8])
+
+    def test_state_follows_push_and_pop(self):
+        """Test that winner and side to move follow pushed moves."""
+        for index in (0, 3, 1, 4):
+            self.board.push((self.board.current_player(), index))
+        self.assertIsNone(self.board.check_terminal_state())
+        self.board.push((GameBoard.BOARD_PLAYER_X, 2))
+        self.assertEqual(self.board.check_terminal_state(),
+                         GameBoard.BOARD_PLAYER_X)
+        self.board.pop()
+        self.assertIsNone(self.board.check_terminal_state())
+        self.assertEqual(self.board.current_player(), GameBoard.BOARD_PLAYER_X)
+        self.assertEqual([index for _, index in self.board.available_actions()],
+                         [2, 5, 6, 7, 8])
+
+    def test_state_follows_apply_action(self):
+        """Test that apply_action updates winner and available actions."""
+        for index in (6, 0, 7, 1, 8):
+            self.board.apply_action((self.board.current_player(), index))
+        self.assertEqual(self.board.check_terminal_state(),
+                         GameBoard.BOARD_PLAYER_X)
+        self.assertEqual(len(self.board.available_actions()), 4)
+        self.board.apply_action((GameBoard.BOARD_PLAYER_O, 8))
+        self.assertIsNone(self.board.check_terminal_state())
+
+    def test_zobrist_key_follows_moves(self):
+        """Test that the incremental hash matches one computed afresh."""
+        keys = self.board.geometry.zobrist
+        self.assertEqual(self.board.zobrist_key(), 0)
+        self.board.push((GameBoard.BOARD_PLAYER_X, 4))
+        self.assertEqual(self.board.zobrist_key(),
+                         keys[4][GameBoard.BOARD_PLAYER_X]
+                         ^ self.board.geometry.zobrist_side)
+        seen = {self.board.zobrist_key()}
+        for index in (0, 8, 2):
+            self.board.push((self.board.current_player(), index))
+            fresh = type(self.board)()
+            fresh.board = self.board.board
+            self.assertEqual(self.board.zobrist_key(), fresh.zobrist_key())
+            seen.add(self.board.zobrist_key())
+        self.assertEqual(len(seen), 4)
+        self.board.apply_action((GameBoard.BOARD_PLAYER_X, 8))
+        fresh = type(self.board)()
+        fresh.board = self.board.board
+        self.assertEqual(self.board.zobrist_key(), fresh.zobrist_key())
+        self.board.apply_action((GameBoard.BOARD_PLAYER_O, 8))
+        for _ in range(4):
+            self.board.pop()
+        self.assertEqual(self.board.zobrist_key(), 0)
+
+    def test_zobrist_key_transpositions(self):
+        """Test that move order does not change the hash."""
+        other = type(self.board)()
+        for index in (0, 4, 8):
+            self.board.push((self.board.current_player(), index))
+        for index in (8, 4, 0):
+            other.push((GameBoard.BOARD_PLAYER_O if index == 4
+                        else GameBoard.BOARD_PLAYER_X, index))
+        self.assertEqual(self.board.zobrist_key(), other.zobrist_key())
+        # A mirror image is a different position
+        other.board = [0, 0, "X", 0, "O", 0, "X", 0, 0]
+        self.assertNotEqual(self.board.zobrist_key(), other.zobrist_key())
+
+    def test_unique_actions(self):
+        """Test that moves equivalent by symmetry are left out."""
+        def indexes():
+            return [index for _, index in self.board.unique_actions()]
+        self.assertEqual(indexes(), [0, 1, 4])
+        self.board.push((GameBoard.BOARD_PLAYER_X, 4))
+        self.assertEqual(indexes(), [0, 1])
+        self.board.push((GameBoard.BOARD_PLAYER_O, 0))
+        # Only the diagonal through 0, 4 and 8 remains a mirror
+        self.assertEqual(indexes(), [1, 2, 5, 8])
+        self.board.push((GameBoard.BOARD_PLAYER_X, 1))
+        self.assertEqual(self.board.unique_actions(),
+                         self.board.available_actions())
+
+    def test_make_move_restores_board(self):
+        """Test that the computer's search leaves the board unchanged."""
+        cells = ["X", "O", 0, 0, "X", 0, 0, 0, 0]
+        self.board.board = list(cells)
+        action = ComputerPlayer("O", ComputerPlayer.SEARCH_ALPHA_BETA) \
+            .make_move(self.board)
+        self.assertEqual(action, ("O", 8))
+        self.assertEqual(self.board.board, cells)
+        self.assertEqual(self.board.move_stack, [])
+
     def test_check_terminal_state_x_wins(self):
         """Test the check terminal state method when X wins."""
         self.board.board = [
@@ -211,7 +328,9 @@ class TestGameBoard(unittest.TestCase):
         scores = {2: 10, 5: 0, 6: 0, 7: 0, 8: 0}
         self.player.minimax = MagicMock(
             side_effect=lambda board, depth, is_maximizing: scores[board.board.index(None)])
-        expected_action = (0, 2)
+        # Each move is undone before the next, so only the moves that
+        # leave space 2 empty score 10, the first of them is (2, 0)
+        expected_action = (2, 0)
         chosen_action = self.player.make_move(self.board)
         self.assertEqual(chosen_action, expected_action)
 
@@ -258,6 +377,15 @@ class TestGameBoard(unittest.TestCase):
         self.board.board = ["X", "O", "X", "X", "O", "O", "O", "X", "X"]
         self.assertIsNone(self.board._calculate_current_player())
 
+    def test_larger_board_not_full_after_nine(self):
+        """Test the current player on a 4x4 board with 9 and 16 marks."""
+        board = GameBoard(4, 4, 4)
+        board.board = ["X", "O"] * 4 + ["X"] + [GameBoard.BOARD_EMPTY] * 7
+        self.assertEqual(board._calculate_current_player(),
+                         GameBoard.BOARD_PLAYER_O)
+        board.board = ["X", "O", "X", "O", "O", "X", "O", "X"] * 2
+        self.assertIsNone(board._calculate_current_player())
+
     def test_equal_number_of_x_and_o(self):
         """Test the current player when there is an equal number of X and O."""
         self.board.board = [
@@ -307,5 +435,280 @@ class TestGameBoard(unittest.TestCase):
         self.assertEqual(score, expected_score, "Test successful")
 
 
+class TestBitBoard(TestGameBoard):
+    """Runs the GameBoard tests against the BitBoard representation."""
+    def setUp(self):
+        """Set up the test environment."""
+        self.board = BitBoard()
+        self.player = HumanPlayer(GameBoard.BOARD_PLAYER_X)
+
+    def test_bits_follow_board(self):
+        """Test that assigning the board sets the player bits."""
+        self.board.board = ["X", 0, "O", 0, "X", 0, 0, 0, 0]
+        self.assertEqual(self.board.x_bits, 0b000010001)
+        self.assertEqual(self.board.o_bits, 0b000000100)
+
+    def test_apply_action_overwrites(self):
+        """Test that apply_action replaces the previous mark of a cell."""
+        self.board.apply_action(("X", 3))
+        self.board.apply_action(("O", 3))
+        self.assertEqual(self.board.board[3], "O")
+        self.assertEqual(self.board.x_bits, 0)
+        self.board.apply_action((GameBoard.BOARD_EMPTY, 3))
+        self.assertEqual(self.board.board, [GameBoard.BOARD_EMPTY] * 9)
+
+    def test_terminal_state_matches_game_board(self):
+        """Test every win line and a few other positions against GameBoard."""
+        positions = [[0] * 9, ["X", "O", "X", "O", "X", "O", "O", "X", "O"]]
+        for mask in BitBoard.WIN_MASKS:
+            for player in ("X", "O"):
+                positions.append([player if mask >> i & 1 else 0
+                                  for i in range(9)])
+        for cells in positions:
+            reference = GameBoard()
+            reference.board = list(cells)
+            self.board.board = list(cells)
+            self.assertEqual(self.board.check_terminal_state(),
+                             reference.check_terminal_state())
+            self.assertEqual(self.board.available_actions(),
+                             reference.available_actions())
+
+
+class TestAlphaBeta(unittest.TestCase):
+    """Unit tests for the alpha-beta search of the ComputerPlayer class."""
+
+    def test_invalid_search_mode(self):
+        """Test that an unknown search mode is rejected."""
+        with self.assertRaises(ValueError):
+            ComputerPlayer("X", "Invalid")
+
+    def test_order_actions_center_corners_edges(self):
+        """Test the static move ordering without history."""
+        agent = ComputerPlayer("X", ComputerPlayer.SEARCH_ALPHA_BETA)
+        actions = [("X", i) for i in range(9)]
+        ordered = [index for _, index in agent.order_actions(actions)]
+        self.assertEqual(ordered, [4, 0, 2, 6, 8, 1, 3, 5, 7])
+
+    def test_order_actions_history_first(self):
+        """Test that moves with a history score are searched first."""
+        agent = ComputerPlayer("X", ComputerPlayer.SEARCH_ALPHA_BETA)
+        agent.history = {7: 4}
+        actions = [("X", i) for i in range(9)]
+        self.assertEqual(agent.order_actions(actions)[0], ("X", 7))
+
+    def test_same_move_as_minimax(self):
+        """Test that alpha-beta picks the same move as the full minimax."""
+        positions = [
+            ["X", 0, 0, 0, 0, 0, 0, 0, 0],
+            ["X", "O", 0, 0, "X", 0, 0, 0, 0],
+            ["X", "X", 0, "O", "O", 0, 0, 0, 0],
+            [0, "O", 0, 0, "X", 0, 0, "X", 0],
+        ]
+        for cells in positions:
+            minimax_board = GameBoard()
+            minimax_board.board = list(cells)
+            player = minimax_board.current_player()
+            alphabeta_board = GameBoard()
+            alphabeta_board.board = list(cells)
+            minimax_agent = ComputerPlayer(player)
+            alphabeta_agent = ComputerPlayer(
+                player, ComputerPlayer.SEARCH_ALPHA_BETA)
+            self.assertEqual(alphabeta_agent.make_move(alphabeta_board),
+                             minimax_agent.make_move(minimax_board))
+            self.assertLess(alphabeta_agent.nodes_visited,
+                            minimax_agent.nodes_visited)
+            self.assertEqual(alphabeta_board.board, cells)
+
+    def test_symmetry_pruning_cuts_nodes(self):
+        """Test that symmetric positions search fewer nodes, same move."""
+        cells = ["O", 0, 0, 0, "X", 0, 0, 0, "X"]
+        for search_mode in (ComputerPlayer.SEARCH_MINIMAX,
+                            ComputerPlayer.SEARCH_ALPHA_BETA):
+            pruned_board = GameBoard()
+            pruned_board.board = list(cells)
+            full_board = GameBoard()
+            full_board.board = list(cells)
+            full_board.unique_actions = full_board.available_actions
+            pruned = ComputerPlayer("O", search_mode)
+            full = ComputerPlayer("O", search_mode)
+            self.assertEqual(pruned.make_move(pruned_board),
+                             full.make_move(full_board))
+            self.assertLess(pruned.nodes_visited, full.nodes_visited)
+
+    def test_alphabeta_exact_inside_window(self):
+        """Test that alpha-beta returns the minimax score with a full window."""
+        board = GameBoard()
+        board.board = ["X", "O", 0, 0, "X", 0, 0, 0, 0]
+        agent = ComputerPlayer("O", ComputerPlayer.SEARCH_ALPHA_BETA)
+        expected = ComputerPlayer("O").minimax(board, 0, True)
+        score = agent.alphabeta(board, 0, float('-inf'), float('inf'), True)
+        self.assertEqual(score, expected)
+
+
+class TestLargeBoard(unittest.TestCase):
+    """Unit tests for boards larger than 3x3."""
+
+    def test_geometry_lines(self):
+        """Test the number of winning lines of a few board shapes."""
+        self.assertEqual(len(BoardGeometry.get(3, 3, 3).lines), 8)
+        self.assertEqual(len(BoardGeometry.get(4, 4, 4).lines), 10)
+        self.assertEqual(len(BoardGeometry.get(5, 5, 4).lines), 28)
+        self.assertEqual(len(BoardGeometry.get(3, 4, 3).symmetries), 4)
+        self.assertEqual(BoardGeometry.get(3, 3, 3).move_order,
+                         ComputerPlayer.MOVE_ORDER)
+
+    def test_invalid_dimensions(self):
+        """Test that a win length longer than the board is rejected."""
+        with self.assertRaises(ValueError):
+            GameBoard(3, 3, 4)
+
+    def test_diagonal_win(self):
+        """Test a diagonal of four on a 5x5 board."""
+        board = GameBoard(5, 5, 4)
+        for index in (1, 0, 7, 5, 13, 10):
+            board.push((board.current_player(), index))
+        self.assertIsNone(board.check_terminal_state())
+        board.push((GameBoard.BOARD_PLAYER_X, 19))
+        self.assertEqual(board.check_terminal_state(), GameBoard.BOARD_PLAYER_X)
+        board.pop()
+        self.assertIsNone(board.check_terminal_state())
+
+    def test_full_board_draw(self):
+        """Test that a full 4x4 board without four in a row is a draw."""
+        board = GameBoard(4, 4, 4)
+        board.board = ["X", "O", "X", "O",
+                       "X", "O", "X", "O",
+                       "O", "X", "O", "X",
+                       "O", "X", "O", "X"]
+        self.assertIsNone(board.current_player())
+        self.assertEqual(board.check_terminal_state(), 0)
+
+    def test_human_move_index(self):
+        """Test that row and column map to the index on a wide board."""
+        board = GameBoard(5, 5, 4)
+        player = HumanPlayer(GameBoard.BOARD_PLAYER_X)
+        self.assertEqual(player.make_move(board, 2, 3), ("X", 7))
+
+    def test_canonical_key_symmetric(self):
+        """Test that a rotated 4x4 position has the same key."""
+        board = GameBoard(4, 4, 4)
+        board.board = ["X", "O"] + [0] * 14
+        rotated = GameBoard(4, 4, 4)
+        rotated.board = [board.board[index]
+                         for index in board.geometry.symmetries[5]]
+        self.assertEqual(board.canonical_key(), rotated.canonical_key())
+
+    def test_canonical_form_maps_spaces(self):
+        """Test that the canonical symmetry maps spaces back to the board."""
+        board = GameBoard(4, 4, 4)
+        board.board = ["X"] + [0] * 15
+        key, symmetry = board.canonical_form()
+        self.assertEqual(key, board.canonical_key())
+        canonical = [board.board[index] for index in symmetry]
+        self.assertEqual(canonical.index("X"), 15)
+        self.assertEqual(symmetry[15], 0)
+
+    def test_zobrist_keys_stable(self):
+        """Test that every process draws the same 64-bit keys."""
+        geometry = BoardGeometry(5, 5, 4)
+        self.assertEqual(geometry.zobrist, BoardGeometry.get(5, 5, 4).zobrist)
+        keys = [key for space in geometry.zobrist for key in space.values()]
+        keys.append(geometry.zobrist_side)
+        self.assertEqual(len(set(keys)), 51)
+        self.assertTrue(all(0 <= key < 2 ** 64 for key in keys))
+        self.assertNotEqual(geometry.zobrist[0],
+                            BoardGeometry.get(5, 5, 5).zobrist[0])
+
+    def test_computer_takes_win(self):
+        """Test that the computer completes four in a row on 4x4."""
+        board = GameBoard(4, 4, 4)
+        board.board = ["O", "O", "O", 0,
+                       "X", "X", "X", 0,
+                       0, 0, 0, 0,
+                       "X", 0, 0, 0]
+        agent = ComputerPlayer("O")
+        self.assertEqual(agent.make_move(board), ("O", 3))
+
+    def test_computer_blocks_loss(self):
+        """Test that the computer blocks four in a row on 5x5."""
+        board = GameBoard(5, 5, 4)
+        for index in (6, 5, 7, 24, 8):
+            board.push((board.current_player(), index))
+        agent = ComputerPlayer("O", ComputerPlayer.SEARCH_PERFECT)
+        self.assertEqual(agent.make_move(board), ("O", 9))
+
+    def test_evaluate_position_range(self):
+        """Test that the estimate never reaches a win or a loss."""
+        board = GameBoard(4, 4, 4)
+        board.board = ["X", "X", "X", 0] + [0] * 12
+        agent = ComputerPlayer("X")
+        score = agent.evaluate_position(board)
+        self.assertGreater(score, 0)
+        self.assertLess(score, 1)
+
+
+
+class TestDifficulty(unittest.TestCase):
+    """Unit tests for the difficulty levels of the computer player."""
+
+    def test_levels(self):
+        """Test that a level sets the search settings of the player."""
+        easy = ComputerPlayer("O", difficulty=ComputerPlayer.DIFFICULTY_EASY)
+        self.assertEqual(easy.search_mode, ComputerPlayer.SEARCH_ALPHA_BETA)
+        self.assertEqual(easy.max_depth, 1)
+        self.assertEqual(easy.engine.node_limit, 200)
+        self.assertEqual(easy.noise, 0.3)
+        hard = ComputerPlayer("O", ComputerPlayer.SEARCH_MINIMAX,
+                              difficulty=ComputerPlayer.DIFFICULTY_HARD)
+        self.assertEqual(hard.search_mode, ComputerPlayer.SEARCH_PERFECT)
+        self.assertIsNone(hard.max_depth)
+        self.assertEqual(hard.noise, 0.0)
+
+    def test_invalid_level(self):
+        """Test that an unknown level is rejected."""
+        with self.assertRaises(ValueError):
+            ComputerPlayer("O", difficulty="impossible")
+
+    def test_noise(self):
+        """Test that noise plays repeatable random moves."""
+        board = GameBoard()
+        board.board = ["X", "X", 0, 0, "O", 0, 0, 0, 0]
+        first = ComputerPlayer("O", noise=1.0, seed=5)
+        second = ComputerPlayer("O", noise=1.0, seed=5)
+        moves = [first.make_move(board) for _ in range(10)]
+        self.assertEqual(moves, [second.make_move(board) for _ in range(10)])
+        self.assertGreater(len(set(moves)), 1)
+        self.assertEqual(first.nodes_visited, 0)
+        self.assertIsNone(ComputerPlayer("O").random_move(board))
+
+    def test_levels_win_and_block(self):
+        """Test that medium blocks a threat and easy takes a win."""
+        board = GameBoard()
+        board.board = ["X", "X", 0, 0, "O", 0, 0, 0, 0]
+        easy = ComputerPlayer("O", difficulty=ComputerPlayer.DIFFICULTY_EASY)
+        easy.noise = 0.0
+        medium = ComputerPlayer("O",
+                                difficulty=ComputerPlayer.DIFFICULTY_MEDIUM)
+        medium.noise = 0.0
+        self.assertEqual(medium.make_move(board), ("O", 2))
+        board.board = ["X", "X", 0, "O", "O", 0, 0, 0, "X"]
+        self.assertEqual(easy.make_move(board), ("O", 5))
+
+    def test_easier_is_cheaper(self):
+        """Test that easier levels visit fewer nodes on a large board."""
+        board = GameBoard(5, 5, 4)
+        for index in (12, 6, 7):
+            board.push((board.current_player(), index))
+        nodes = []
+        for level in (ComputerPlayer.DIFFICULTY_EASY,
+                      ComputerPlayer.DIFFICULTY_MEDIUM):
+            agent = ComputerPlayer("O", difficulty=level)
+            agent.noise = 0.0
+            agent.make_move(board)
+            nodes.append(agent.nodes_visited)
+        self.assertLess(nodes[0], nodes[1])
+        self.assertLessEqual(nodes[1], 5000)
+
+
 if __name__ == '__main__':
     unittest.main()
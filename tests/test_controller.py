@@ -6,6 +6,7 @@ import unittest.mock
 from controller import GameManager
 from board import GameBoard
 from player import HumanPlayer, ComputerPlayer
+from savestore import SaveStore
 
 
 
@@ -81,6 +82,18 @@ class TestController(unittest.TestCase):
             mock_json_load.assert_called_once()
             mock_os_listdir.assert_called_once()
 
+    @patch('os.listdir', return_value=['saves.db', 'saves.db-wal', 'game.json'])
+    def test_load_game_state_lists_json_only(self, mock_os_listdir):
+        """ Test that load_game_state lists only the JSON saves """
+        with patch('view.GameView.display_message') as mock_display, \
+                patch('view.GameView.input_prompt', return_value='exit'), \
+                patch.object(self.game_manager, 'start_menu'):
+            self.assertFalse(self.game_manager.load_game_state())
+        listed = [call.args[0] for call in mock_display.call_args_list]
+        self.assertEqual(listed, ["Please select a game to load:",
+                                  "1. game.json"])
+        mock_os_listdir.assert_called_once_with('savedGames')
+
     def test_game_initialization_two_players(self):
         """ Test that start_new_game initializes two HumanPlayer objects """
         with patch("builtins.input", return_value="2"):
@@ -95,10 +108,55 @@ class TestController(unittest.TestCase):
             self.assertIsInstance(self.game_manager.players[0], HumanPlayer)
             self.assertIsInstance(self.game_manager.players[1], ComputerPlayer)
 
-    # def test_binary_rain(self):
-    #     """ Test the binary_rain method
-    #     Test this method by raising a KeyboardInterrupt exception (Ctrl+C)"""
-    #     self.game_manager.binary_rain()
+    @patch('view.GameView.input_prompt', side_effect=['5', '2'])
+    def test_start_new_game_board_size(self, mock_input_prompt):
+        """ Test that start_new_game builds a board of the chosen size """
+        self.game_manager.start_new_game()
+        self.assertEqual(self.game_manager.board.rows, 5)
+        self.assertEqual(self.game_manager.board.columns, 5)
+        self.assertEqual(self.game_manager.board.win_length, 4)
+        mock_input_prompt.assert_called_with('Enter number of players [1-2]: ')
+
+    @patch('view.GameView.display_message')
+    @patch('view.GameView.input_prompt', side_effect=['9', '1', ''])
+    def test_start_new_game_invalid_board_size(self, mock_input_prompt,
+                                               mock_display_message):
+        """ Test that an unsupported board size falls back to 3x3 """
+        self.game_manager.start_new_game()
+        self.assertEqual(len(self.game_manager.board.board), 9)
+        mock_display_message.assert_called_once_with(
+            "Invalid board size. Defaulting to 3x3.")
+        mock_input_prompt.assert_any_call('Enter number of players [1-2]: ')
+
+    @patch('view.GameView.input_prompt', side_effect=['', '1', '1'])
+    def test_start_new_game_difficulty(self, mock_input_prompt):
+        """ Test that start_new_game sets up the chosen difficulty """
+        self.game_manager.start_new_game()
+        self.assertEqual(self.game_manager.game.difficulty,
+                         ComputerPlayer.DIFFICULTY_EASY)
+        computer = self.game_manager.players[1]
+        self.assertEqual(computer.difficulty, ComputerPlayer.DIFFICULTY_EASY)
+        self.assertEqual(computer.max_depth, 1)
+        self.assertEqual(mock_input_prompt.call_count, 3)
+
+    @patch('view.GameView.display_message')
+    @patch('view.GameView.input_prompt', side_effect=['', '1', 'impossible'])
+    def test_start_new_game_invalid_difficulty(self, mock_input_prompt,
+                                               mock_display_message):
+        """ Test that an unknown difficulty falls back to hard """
+        self.game_manager.start_new_game()
+        self.assertEqual(self.game_manager.players[1].search_mode,
+                         ComputerPlayer.SEARCH_PERFECT)
+        self.assertEqual(self.game_manager.game.difficulty,
+                         ComputerPlayer.DIFFICULTY_HARD)
+        mock_display_message.assert_called_once_with(
+            "Invalid difficulty. Defaulting to hard.")
+
+    @patch('view.GameView.binary_rain', return_value={'frames': 3})
+    def test_binary_rain(self, mock_binary_rain):
+        """ Test that binary_rain plays the animation of the view """
+        self.assertEqual(self.game_manager.binary_rain(30, 3), {'frames': 3})
+        mock_binary_rain.assert_called_once_with(30, 3)
 
     @patch('controller.GameManager.game_loop')
     @patch('controller.GameManager.start_new_game')
@@ -245,6 +303,70 @@ class TestController(unittest.TestCase):
         # Ensure post_game was called due to terminal state or full board
         mock_post_game.assert_called_once()
 
+    @patch('view.GameView.print_board')
+    @patch('controller.GameManager.post_game')
+    @patch('view.GameView.choose_move', return_value=(3, 3))
+    def test_game_loop_plays_pondered_move(self, mock_choose_move,
+                                           mock_post_game, mock_print_board):
+        """ Test that the computer answers with the reply prepared
+        while the human chose a move """
+        computer = ComputerPlayer(GameBoard.BOARD_PLAYER_O,
+                                  ComputerPlayer.SEARCH_ALPHA_BETA)
+        self.game_manager.players = [HumanPlayer(GameBoard.BOARD_PLAYER_X),
+                                     computer]
+        self.game_manager.board.board = ["X", "O", "X", 0, "O", 0, 0, 0, 0]
+        with patch('ponder.Ponderer.take', return_value=("O", 7)) \
+                as mock_take, \
+                patch.object(computer, 'make_move') as mock_make_move, \
+                patch('view.GameView.clear_screen'):
+            self.game_manager.game_loop()
+        mock_take.assert_called_once()
+        mock_make_move.assert_not_called()
+        self.assertEqual(self.game_manager.board.board[7], "O")
+        self.assertIsNone(self.game_manager.ponderer)
+        mock_post_game.assert_called_once()
+
+    @patch('view.GameView.print_board')
+    @patch('controller.GameManager.post_game')
+    @patch('view.GameView.choose_move', return_value=(3, 3))
+    def test_game_loop_missed_ponder_skips_noise(self, mock_choose_move,
+                                                 mock_post_game,
+                                                 mock_print_board):
+        """ Test that the computer searching after a missed pondered move
+        does not roll for noise a second time """
+        computer = ComputerPlayer(GameBoard.BOARD_PLAYER_O,
+                                  ComputerPlayer.SEARCH_ALPHA_BETA)
+        self.game_manager.players = [HumanPlayer(GameBoard.BOARD_PLAYER_X),
+                                     computer]
+        self.game_manager.board.board = ["X", "O", "X", 0, "O", 0, 0, 0, 0]
+        with patch('ponder.Ponderer.take', return_value=None), \
+                patch.object(computer, 'make_move',
+                             return_value=("O", 7)) as mock_make_move, \
+                patch('view.GameView.clear_screen'):
+            self.game_manager.game_loop()
+        mock_make_move.assert_called_once_with(self.game_manager.board,
+                                               skip_noise=True)
+        mock_post_game.assert_called_once()
+
+    @patch('view.GameView.print_board')
+    @patch('view.GameView.choose_move', return_value='save')
+    def test_game_loop_save_stops_pondering(self, mock_choose_move,
+                                            mock_print_board):
+        """ Test that pondering is cancelled before the game is saved """
+        self.game_manager.players = [
+            HumanPlayer(GameBoard.BOARD_PLAYER_X),
+            ComputerPlayer(GameBoard.BOARD_PLAYER_O,
+                           ComputerPlayer.SEARCH_ITERATIVE, time_limit=30)]
+        self.game_manager.board = GameBoard(7, 7, 5)
+        with patch('ponder.Ponderer.stop', autospec=True) as mock_stop, \
+                patch('ponder.Ponderer.start') as mock_start, \
+                patch('controller.GameManager.save_game_state',
+                      side_effect=lambda: mock_stop.assert_called()), \
+                patch('view.GameView.clear_screen'):
+            self.game_manager.game_loop()
+        mock_start.assert_called_once()
+        self.assertIsNone(self.game_manager.ponderer)
+
 
 
 
@@ -261,8 +383,13 @@ class TestSerialization(unittest.TestCase):
     @patch('builtins.open', new_callable=unittest.mock.mock_open)
     def test_save_game_with_savename(self, mock_open, mock_start_menu):
         """ Test that save_game_state with a specific filename"""
-        with patch('view.GameView.input_prompt', return_value="test_save") as mock_input_prompt:
+        with patch('view.GameView.input_prompt', return_value="test_save") as mock_input_prompt, \
+                patch('json.dump') as mock_json_dump:
             self.game_manager.save_game_state()
+            self.assertEqual(mock_json_dump.call_args[0][0]['rows'], 3)
+            self.assertEqual(mock_json_dump.call_args[0][0]['win_length'], 3)
+            self.assertEqual(mock_json_dump.call_args[0][0]['difficulty'],
+                             ComputerPlayer.DIFFICULTY_HARD)
             mock_input_prompt.assert_called_once_with("Enter a name for your save"
                           "(leave blank to use the current datetime): ")
             mock_open.assert_called_once_with(Path("savedGames", "test_save.json"),
@@ -377,6 +504,36 @@ class TestSerialization(unittest.TestCase):
         mock_human_player.assert_called_once()
         mock_computer_player.assert_called_once()
 
+    @patch('json.load', return_value={"board": [0, 0, 0, 0, "X", 0, 0, 0, 0],
+                                      "num_players": 1, "current_turn": "O"})
+    def test_load_game_state_pve_computer_turn(self, mock_json_load):
+        """ Test that a loaded single player game resumes with the computer """
+        with patch('builtins.open', new_callable=unittest.mock.mock_open), \
+                patch('view.GameView.input_prompt', return_value="1"), \
+                patch('view.GameView.display_message'), \
+                patch('os.listdir', return_value=['game1.json']):
+            self.assertTrue(self.game_manager.load_game_state())
+        mock_json_load.assert_called_once()
+        self.assertIsInstance(self.game_manager.players[0], ComputerPlayer)
+        self.assertEqual(self.game_manager.game.current_player(),
+                         GameBoard.BOARD_PLAYER_O)
+
+    @patch('json.load', return_value={"board": [0, 0, 0, 0, "X", 0, 0, 0, 0],
+                                      "num_players": 1, "current_turn": "O",
+                                      "difficulty": "medium"})
+    def test_load_game_state_difficulty(self, mock_json_load):
+        """ Test that a loaded game restores the computer's difficulty """
+        with patch('builtins.open', new_callable=unittest.mock.mock_open), \
+                patch('view.GameView.input_prompt', return_value="1"), \
+                patch('view.GameView.display_message'), \
+                patch('os.listdir', return_value=['game1.json']):
+            self.assertTrue(self.game_manager.load_game_state())
+        mock_json_load.assert_called_once()
+        self.assertEqual(self.game_manager.game.difficulty,
+                         ComputerPlayer.DIFFICULTY_MEDIUM)
+        self.assertEqual(self.game_manager.players[0].difficulty,
+                         ComputerPlayer.DIFFICULTY_MEDIUM)
+
     @patch('os.listdir')
     @patch('controller.GameView')
     def test_load_game_state_no_saved_games(self, mock_game_view, mock_os_listdir):
@@ -428,5 +585,84 @@ class TestSerialization(unittest.TestCase):
         mock_listdir.assert_called_once()
         self.assertTrue(mock_display_message.call_args_list == calls)
 
+
+class TestSaveStoreBackend(unittest.TestCase):
+    """ This class contains tests for saving to and loading from a SaveStore. """
+
+    def setUp(self):
+        """ Set up a GameManager with an in-memory save store """
+        self.store = SaveStore(':memory:')
+        self.game_manager = GameManager(self.store)
+
+    def tearDown(self):
+        """ Close the save store """
+        self.store.close()
+
+    def save_games(self, count):
+        """ Fill the store with single player games named by number """
+        state = self.game_manager.game.to_dict()
+        self.store.save_many([(f"game {i}", state, float(i))
+                              for i in range(count)])
+
+    @patch('controller.GameManager.start_menu')
+    @patch('view.GameView.display_message')
+    def test_save_game(self, mock_display_message, mock_start_menu):
+        """ Test that save_game_state writes to the store, not a file """
+        self.game_manager.game.play(4)
+        with patch('view.GameView.input_prompt', return_value="my game"), \
+                patch('builtins.open') as mock_open:
+            self.game_manager.save_game_state()
+        mock_open.assert_not_called()
+        save = self.store.page()[0]
+        self.assertEqual((save['name'], save['moves']), ("my game", 1))
+        mock_display_message.assert_called_once_with(
+            "Game saved as 'my game'")
+        mock_start_menu.assert_called_once()
+
+    @patch('view.GameView.display_message')
+    def test_load_game_pages(self, mock_display_message):
+        """ Test that the user can page through saves and load one """
+        self.save_games(25)
+        with patch('view.GameView.input_prompt',
+                   side_effect=['n', 'n', 'p', 'n', '2']), \
+                patch('os.listdir') as mock_listdir:
+            self.assertTrue(self.game_manager.load_game_state())
+        mock_listdir.assert_not_called()
+        mock_display_message.assert_any_call(
+            "5. " + SaveStore.describe(self.store.page(limit=25)[-1]))
+        self.assertIsInstance(self.game_manager.players[1], ComputerPlayer)
+        mock_display_message.assert_called_with("Game loaded successfully.")
+
+    @patch('view.GameView.display_message')
+    def test_load_game_search(self, mock_display_message):
+        """ Test that text searches the names of the saves """
+        self.save_games(15)
+        self.store.save("Finished", {"board": ["X", "X", "X", "O", "O",
+                                               0, 0, 0, 0],
+                                     "num_players": 2, "current_turn": "O"})
+        with patch('view.GameView.input_prompt',
+                   side_effect=['nothing', 'fin', '1']):
+            self.assertTrue(self.game_manager.load_game_state())
+        mock_display_message.assert_any_call(
+            "No saved games start with 'nothing'.")
+        self.assertEqual(self.game_manager.num_players, 2)
+        self.assertEqual(self.game_manager.game.result(),
+                         GameBoard.BOARD_PLAYER_X)
+
+    @patch('view.GameView.display_message')
+    def test_load_game_empty_store(self, mock_display_message):
+        """ Test that an empty store has nothing to load """
+        self.assertFalse(self.game_manager.load_game_state())
+        mock_display_message.assert_called_once_with("No saved games found.")
+
+    @patch('view.GameView.display_message')
+    def test_load_game_invalid_selection(self, mock_display_message):
+        """ Test that a number not on the page is rejected """
+        self.save_games(3)
+        with patch('view.GameView.input_prompt', return_value='4'):
+            self.assertFalse(self.game_manager.load_game_state())
+        mock_display_message.assert_called_with("Invalid selection.")
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,105 @@
+"""Unit tests for the perfect play dataset export."""
+import tempfile
+import unittest
+from pathlib import Path
+from board import GameBoard
+from player import ComputerPlayer
+from solver import PerfectPlayTable
+
+try:
+    import numpy as np
+    import dataset
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestDataset(unittest.TestCase):
+    """Unit tests for build_dataset, export and load."""
+    SYMBOLS = (GameBoard.BOARD_EMPTY, GameBoard.BOARD_PLAYER_X,
+               GameBoard.BOARD_PLAYER_O)
+
+    @classmethod
+    def setUpClass(cls):
+        """Build the dataset once for all tests."""
+        cls.columns = dataset.build_dataset()
+
+    def board(self, row):
+        """Return the GameBoard of a dataset row."""
+        board = GameBoard()
+        board.board = [self.SYMBOLS[code]
+                       for code in self.columns['boards'][row]]
+        return board
+
+    def test_every_reachable_position(self):
+        """Test the row count and the columns of the empty board."""
+        columns = self.columns
+        self.assertEqual(len(columns['index']),
+                         PerfectPlayTable.shared().positions)
+        self.assertEqual(len(columns['index']), 5478)
+        self.assertEqual(columns['index'][0], 0)
+        self.assertEqual(columns['to_move'][0], 1)
+        self.assertEqual(columns['value'][0], 0)
+        self.assertEqual(columns['distance'][0], 9)
+        self.assertTrue(columns['optimal'][0].all())
+        self.assertEqual(int((columns['to_move'] == 0).sum()), 958)
+
+    def test_matches_table(self):
+        """Test every row against PerfectPlayTable.lookup."""
+        table = PerfectPlayTable.shared()
+        for row in range(len(self.columns['index'])):
+            board = self.board(row)
+            value, moves = table.lookup(board)
+            self.assertEqual(self.columns['score'][row], value)
+            self.assertEqual(
+                sum(1 << cell for cell in np.flatnonzero(
+                    self.columns['optimal'][row])), moves)
+            player = board.current_player()
+            if board.check_terminal_state() is not None:
+                player = None
+            self.assertEqual(self.columns['to_move'][row],
+                             GameBoard.CELL_CODES.get(player, 0))
+
+    def test_matches_minimax(self):
+        """Test sampled values and optimal moves against minimax."""
+        for row in range(0, len(self.columns['index']), 97):
+            board = self.board(row)
+            if self.columns['to_move'][row] == 0 \
+                    or self.columns['plies'][row] < 2:
+                continue
+            agent = ComputerPlayer(board.current_player())
+            scores = {}
+            for action in board.available_actions():
+                board.push(action)
+                scores[action[1]] = agent.minimax(board, 0, False)
+                board.pop()
+            best = max(scores.values())
+            self.assertEqual(self.columns['value'][row], np.sign(best))
+            self.assertEqual(
+                list(np.flatnonzero(self.columns['optimal'][row])),
+                sorted(cell for cell, score in scores.items()
+                       if score == best))
+            if best:
+                # minimax counts depth from the position after the move
+                self.assertEqual(self.columns['distance'][row],
+                                 agent.win_score - abs(best) + 1)
+
+    def test_export_and_load(self):
+        """Test that both layouts load back, directories memory-mapped."""
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ("columns", "columns.npz"):
+                path = Path(directory) / name
+                self.assertEqual(dataset.export(path, self.columns), 5478)
+                loaded = dataset.load(path)
+                self.assertEqual(set(loaded), set(dataset.COLUMNS))
+                for column, values in self.columns.items():
+                    np.testing.assert_array_equal(loaded[column], values)
+                    self.assertEqual(loaded[column].dtype, values.dtype)
+                if name == "columns":
+                    self.assertIsInstance(loaded['boards'], np.memmap)
+                    self.assertTrue((path / "manifest.json").exists())
+                del loaded
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,221 @@
+"""Unit tests for the iterative deepening engine."""
+import json
+import os
+import tempfile
+import threading
+import unittest
+from board import GameBoard
+from engine import IterativeDeepeningEngine, evaluate_lines
+from player import ComputerPlayer
+from solver import PerfectPlayTable
+from transposition import TranspositionTable
+
+
+class TestIterativeDeepeningEngine(unittest.TestCase):
+    """Unit tests for the IterativeDeepeningEngine class."""
+
+    def test_solves_empty_board(self):
+        """Test that an unlimited search of 3x3 proves the draw."""
+        board = GameBoard()
+        result = IterativeDeepeningEngine().search(board)
+        self.assertEqual(result.depth, 9)
+        self.assertEqual(result.score, 0)
+        self.assertEqual(board.board, [GameBoard.BOARD_EMPTY] * 9)
+        self.assertEqual(board.move_stack, [])
+
+    def test_moves_are_optimal(self):
+        """Test the engine against the perfect play table on 3x3."""
+        table = PerfectPlayTable.shared()
+        board = GameBoard()
+        for index in (0, 4, 8):
+            board.apply_action((board.current_player(), index))
+            result = IterativeDeepeningEngine().search(board)
+            value, moves = table.lookup(board)
+            self.assertTrue(moves & (1 << result.action[1]))
+            self.assertEqual(result.score > 0, value > 0)
+
+    def test_takes_immediate_win(self):
+        """Test that a win in one is found and ends the search."""
+        board = GameBoard(5, 5, 4)
+        for index in (0, 5, 1, 6, 2, 7):
+            board.push((board.current_player(), index))
+        result = IterativeDeepeningEngine(time_limit=1).search(board)
+        self.assertEqual(result.action, (GameBoard.BOARD_PLAYER_X, 3))
+        self.assertGreaterEqual(result.score, 1)
+        self.assertEqual(result.depth, 1)
+
+    def test_principal_variation(self):
+        """Test that the variation of a solved position plays it out."""
+        board = GameBoard()
+        board.board = ["X", "X", 0, "O", "O", 0, 0, 0, 0]
+        engine = IterativeDeepeningEngine()
+        engine.search(board)
+        self.assertEqual(engine.principal_variation(board), [2])
+        self.assertEqual(board.move_stack, [])
+
+    def test_node_limit(self):
+        """Test that the node budget stops the search with a move ready."""
+        board = GameBoard(7, 7, 5)
+        engine = IterativeDeepeningEngine(node_limit=500)
+        result = engine.search(board)
+        self.assertLessEqual(result.nodes, 501)
+        self.assertGreaterEqual(result.depth, 1)
+        self.assertEqual(result.action[0], GameBoard.BOARD_PLAYER_X)
+        self.assertEqual(board.move_stack, [])
+        self.assertEqual(board.available_actions()[0][1], 0)
+
+    def test_tiny_budget_still_moves(self):
+        """Test that a budget too small for one iteration still moves."""
+        board = GameBoard(7, 7, 5)
+        result = IterativeDeepeningEngine(node_limit=1).search(board)
+        self.assertEqual(result.depth, 0)
+        self.assertEqual(result.action, (GameBoard.BOARD_PLAYER_X, 24))
+        self.assertEqual(board.move_stack, [])
+
+    def test_time_limit(self):
+        """Test that the deadline is kept and reported."""
+        board = GameBoard(7, 7, 5)
+        result = IterativeDeepeningEngine(time_limit=0.05).search(board)
+        self.assertLess(result.elapsed, 0.5)
+        self.assertIn('depth', result.to_dict())
+        self.assertEqual(board.move_stack, [])
+
+    def test_stop_event(self):
+        """Test that a set stop event ends the search like a deadline."""
+        stop = threading.Event()
+        stop.set()
+        engine = IterativeDeepeningEngine()
+        engine.stop_event = stop
+        board = GameBoard(7, 7, 5)
+        result = engine.search(board)
+        self.assertLessEqual(result.nodes,
+                             IterativeDeepeningEngine.CLOCK_INTERVAL)
+        self.assertIsNotNone(result.action)
+        self.assertEqual(board.move_stack, [])
+
+    def test_transposition_table_same_score(self):
+        """Test that a bounded table saves nodes but not the score."""
+        board = GameBoard(4, 4, 4)
+        for index in (5, 6, 10, 9):
+            board.push((board.current_player(), index))
+        plain = IterativeDeepeningEngine(max_depth=4).search(board)
+        table = TranspositionTable(max_entries=512,
+                                   policy=TranspositionTable.POLICY_DEPTH)
+        engine = IterativeDeepeningEngine(max_depth=4,
+                                          transposition_table=table)
+        result = engine.search(board)
+        self.assertAlmostEqual(result.score, plain.score)
+        self.assertLess(result.nodes, plain.nodes)
+        self.assertGreater(table.hits, 0)
+        self.assertAlmostEqual(engine.search(board).score, plain.score)
+
+    def test_finished_game(self):
+        """Test that a finished game has no move."""
+        board = GameBoard()
+        board.board = ["X", "X", "X", "O", "O", 0, 0, 0, 0]
+        self.assertIsNone(IterativeDeepeningEngine().search(board).action)
+
+    def test_evaluate_lines(self):
+        """Test that the heuristic is symmetric and below a win."""
+        board = GameBoard(5, 5, 4)
+        board.apply_action((GameBoard.BOARD_PLAYER_X, 12))
+        score = evaluate_lines(board, GameBoard.BOARD_PLAYER_X)
+        self.assertTrue(0 < score < 1)
+        self.assertEqual(evaluate_lines(board, GameBoard.BOARD_PLAYER_O),
+                         -score)
+
+
+class TestIterativePlayer(unittest.TestCase):
+    """Unit tests for ComputerPlayer in SEARCH_ITERATIVE mode."""
+
+    def test_reports_last_search(self):
+        """Test that the player keeps the report of its last move."""
+        board = GameBoard(4, 4, 4)
+        agent = ComputerPlayer("X", ComputerPlayer.SEARCH_ITERATIVE,
+                               node_limit=2000)
+        action = agent.make_move(board)
+        self.assertEqual(action, agent.last_search.action)
+        self.assertEqual(agent.nodes_visited, agent.last_search.nodes)
+        self.assertGreaterEqual(agent.last_search.depth, 1)
+
+
+class TestSearchStats(unittest.TestCase):
+    """Unit tests for the statistics ComputerPlayer collects per move."""
+
+    def setUp(self):
+        """Set up a midgame position with O to move."""
+        self.board = GameBoard()
+        self.board.board = ["O", 0, 0, 0, "X", 0, 0, 0, "X"]
+
+    def test_disabled_by_default(self):
+        """Test that no statistics are kept unless asked for."""
+        agent = ComputerPlayer("O", ComputerPlayer.SEARCH_ALPHA_BETA)
+        agent.make_move(self.board)
+        self.assertIsNone(agent.last_stats)
+
+    def test_minimax_counts(self):
+        """Test the counters of an exhaustive search."""
+        agent = ComputerPlayer("O", collect_stats=True)
+        action = agent.make_move(self.board)
+        stats = agent.last_stats.to_dict()
+        self.assertEqual(action, ComputerPlayer("O").make_move(self.board))
+        self.assertEqual(stats['nodes'], agent.nodes_visited)
+        self.assertGreater(stats['terminal'], 0)
+        self.assertLess(stats['terminal'], stats['nodes'])
+        self.assertEqual(stats['max_depth'], 6)
+        self.assertEqual(stats['cutoffs'], 0)
+        self.assertGreater(stats['wall_time'], 0)
+        self.assertGreaterEqual(stats['cpu_time'], 0)
+
+    def test_alpha_beta_counts_cutoffs_and_hits(self):
+        """Test that alpha-beta reports cutoffs and table hits."""
+        table = TranspositionTable()
+        agent = ComputerPlayer("O", ComputerPlayer.SEARCH_ALPHA_BETA,
+                               transposition_table=table, collect_stats=True)
+        agent.make_move(self.board)
+        stats = agent.last_stats
+        self.assertGreater(stats.cutoffs, 0)
+        self.assertEqual(stats.cache_hits, table.hits)
+        self.assertGreater(stats.cache_hits, 0)
+
+    def test_perfect_lookup_is_a_cache_hit(self):
+        """Test that a perfect play table answer counts as one hit."""
+        agent = ComputerPlayer("O", ComputerPlayer.SEARCH_PERFECT,
+                               collect_stats=True)
+        agent.make_move(self.board)
+        self.assertEqual(agent.last_stats.cache_hits, 1)
+        self.assertEqual(agent.last_stats.nodes, 0)
+
+    def test_iterative_counts(self):
+        """Test that the engine fills in the counters."""
+        agent = ComputerPlayer("X", ComputerPlayer.SEARCH_ITERATIVE,
+                               node_limit=2000, collect_stats=True)
+        agent.make_move(GameBoard(4, 4, 4))
+        stats = agent.last_stats
+        self.assertEqual(stats.nodes, agent.last_search.nodes)
+        self.assertGreaterEqual(stats.max_depth, agent.last_search.depth)
+        self.assertGreater(stats.cutoffs, 0)
+        self.assertIsNone(agent.engine.stats)
+
+    def test_stats_file(self):
+        """Test that every move is appended as one JSON line."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "stats.jsonl")
+            agent = ComputerPlayer("O", ComputerPlayer.SEARCH_ALPHA_BETA,
+                                   stats_file=path)
+            first = agent.make_move(self.board)
+            self.board.push(first)
+            self.board.push(("X", self.board.available_actions()[0][1]))
+            second = agent.make_move(self.board)
+            with open(path, "r", encoding="utf-8") as file:
+                records = [json.loads(line) for line in file]
+        self.assertEqual([record['move'] for record in records],
+                         [first[1], second[1]])
+        self.assertEqual(records[0]['player'], "O")
+        self.assertEqual(records[0]['mode'],
+                         ComputerPlayer.SEARCH_ALPHA_BETA)
+        self.assertEqual(records[1]['nodes'], agent.last_stats.nodes)
+
+
+if __name__ == '__main__':
+    unittest.main()
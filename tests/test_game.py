@@ -0,0 +1,81 @@
+"""Unit tests for the Game engine."""
+import json
+import unittest
+from board import GameBoard
+from game import Game
+
+
+class TestGame(unittest.TestCase):
+    """Unit tests for the Game class."""
+
+    def test_new_game(self):
+        """Test that a new game starts empty with X to move."""
+        game = Game()
+        self.assertEqual(game.legal_moves(), list(range(9)))
+        self.assertEqual(game.current_player(), GameBoard.BOARD_PLAYER_X)
+        self.assertIsNone(game.result())
+
+    def test_play_to_win(self):
+        """Test that moves alternate and a line wins the game."""
+        game = Game()
+        for move in (0, 3, 1, 4):
+            game.play(move)
+        self.assertEqual(game.current_player(), GameBoard.BOARD_PLAYER_X)
+        self.assertNotIn(4, game.legal_moves())
+        game.play((GameBoard.BOARD_PLAYER_X, 2))
+        self.assertEqual(game.result(), GameBoard.BOARD_PLAYER_X)
+        self.assertEqual(game.legal_moves(), [])
+
+    def test_draw(self):
+        """Test that a full board without a line is a draw."""
+        game = Game()
+        for move in (0, 1, 2, 4, 3, 5, 7, 6, 8):
+            game.play(move)
+        self.assertEqual(game.result(), 0)
+
+    def test_illegal_moves(self):
+        """Test that illegal moves are rejected and change nothing."""
+        game = Game()
+        game.play(4)
+        with self.assertRaises(ValueError):
+            game.play(4)
+        with self.assertRaises(ValueError):
+            game.play(9)
+        with self.assertRaises(ValueError):
+            game.play("1")
+        with self.assertRaises(ValueError):
+            game.play((GameBoard.BOARD_PLAYER_X, 0))
+        self.assertEqual(game.board.board.count(GameBoard.BOARD_EMPTY), 8)
+
+    def test_no_move_after_win(self):
+        """Test that no move is accepted once the game is won."""
+        game = Game()
+        for move in (0, 3, 1, 4, 2):
+            game.play(move)
+        with self.assertRaises(ValueError):
+            game.play(5)
+
+    def test_round_trip(self):
+        """Test that to_dict and from_dict restore a game through JSON."""
+        game = Game(GameBoard(5, 5, 4), 2, "easy")
+        game.play(12)
+        game.play(0)
+        state = json.loads(json.dumps(game.to_dict()))
+        restored = Game.from_dict(state)
+        self.assertEqual(restored.board.board, game.board.board)
+        self.assertEqual(restored.board.win_length, 4)
+        self.assertEqual(restored.num_players, 2)
+        self.assertEqual(restored.difficulty, "easy")
+        self.assertEqual(restored.current_player(), GameBoard.BOARD_PLAYER_X)
+
+    def test_from_old_save(self):
+        """Test that saves without dimensions load as 3x3."""
+        game = Game.from_dict({"board": [0, 0, 0, 0, "X", 0, 0, 0, 0],
+                               "num_players": 1, "current_turn": "O"})
+        self.assertEqual(game.board.rows, 3)
+        self.assertIsNone(game.difficulty)
+        self.assertEqual(game.current_player(), GameBoard.BOARD_PLAYER_O)
+
+
+if __name__ == '__main__':
+    unittest.main()
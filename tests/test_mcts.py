@@ -0,0 +1,83 @@
+"""Unit tests for the Monte Carlo tree search player."""
+import unittest
+from board import GameBoard
+from mcts import MCTSPlayer, search_tree
+
+
+class TestMCTSPlayer(unittest.TestCase):
+    """Unit tests for the MCTSPlayer class."""
+
+    def test_takes_win(self):
+        """Test that the player completes its row."""
+        board = GameBoard()
+        board.board = ["X", "X", 0, "O", "O", 0, 0, 0, 0]
+        agent = MCTSPlayer("X", iterations=500, seed=1)
+        self.assertEqual(agent.make_move(board), ("X", 2))
+
+    def test_blocks_win(self):
+        """Test that the player blocks the opponent's row."""
+        board = GameBoard()
+        board.board = ["X", "X", 0, "O", 0, 0, 0, 0, 0]
+        agent = MCTSPlayer("O", iterations=2000, seed=1)
+        self.assertEqual(agent.make_move(board), ("O", 2))
+
+    def test_board_restored(self):
+        """Test that searching leaves the board unchanged."""
+        board = GameBoard(4, 4, 4)
+        board.apply_action(("X", 5))
+        MCTSPlayer("O", iterations=200, seed=1).make_move(board)
+        self.assertEqual(board.board, [0] * 5 + ["X"] + [0] * 10)
+        self.assertEqual(board.move_stack, [])
+
+    def test_iteration_budget(self):
+        """Test that the iterations are counted in the root children."""
+        agent = MCTSPlayer("X", iterations=300, seed=1)
+        action = agent.make_move(GameBoard(5, 5, 4))
+        self.assertEqual(action[0], "X")
+        self.assertEqual(agent.last_search['iterations'], 300)
+
+    def test_time_budget(self):
+        """Test that a time budget ends the search."""
+        agent = MCTSPlayer("X", time_limit=0.05, seed=1)
+        agent.make_move(GameBoard(7, 7, 5))
+        self.assertLess(agent.last_search['elapsed'], 0.5)
+        self.assertGreater(agent.last_search['iterations'], 0)
+
+    def test_repeatable(self):
+        """Test that the same seed picks the same moves."""
+        board = GameBoard(4, 4, 4)
+        first = MCTSPlayer("X", iterations=300, seed=7).make_move(board)
+        second = MCTSPlayer("X", iterations=300, seed=7).make_move(board)
+        self.assertEqual(first, second)
+
+    def test_game_over(self):
+        """Test that a finished game has no move."""
+        board = GameBoard()
+        board.board = ["X", "X", "X", "O", "O", 0, 0, 0, 0]
+        self.assertIsNone(MCTSPlayer("O", iterations=10).make_move(board))
+
+    def test_workers(self):
+        """Test that the trees of several processes are added up."""
+        agent = MCTSPlayer("X", iterations=400, workers=2, seed=1)
+        try:
+            action = agent.make_move(GameBoard(4, 4, 4))
+        finally:
+            agent.close()
+        self.assertEqual(action[0], "X")
+        self.assertEqual(agent.last_search['iterations'], 400)
+        self.assertEqual(agent.last_search['workers'], 2)
+
+    def test_invalid_workers(self):
+        """Test that a negative number of workers is rejected."""
+        with self.assertRaises(ValueError):
+            MCTSPlayer("X", workers=-1)
+
+    def test_search_tree(self):
+        """Test that one tree visits every root move of a small board."""
+        tree = search_tree([0] * 9, (3, 3, 3), iterations=100, seed=1)
+        self.assertEqual(sorted(tree), list(range(9)))
+        self.assertEqual(sum(visits for visits, _ in tree.values()), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
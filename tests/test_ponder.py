@@ -0,0 +1,120 @@
+"""Unit tests for the ponder module."""
+import time
+import unittest
+from board import GameBoard
+from player import ComputerPlayer, HumanPlayer
+from ponder import Ponderer
+
+
+class TestPonderer(unittest.TestCase):
+    """Unit tests for the Ponderer class."""
+
+    def setUp(self):
+        """Set up a 3x3 board on which X, the human, is to move."""
+        self.board = GameBoard()
+        self.board.board = ["X", 0, 0, 0, "O", 0, 0, 0, 0]
+        self.player = ComputerPlayer("O", ComputerPlayer.SEARCH_ALPHA_BETA)
+
+    def finish(self, ponderer):
+        """Wait until the ponderer has searched every reply."""
+        ponderer._thread.join()  # pylint: disable=protected-access
+
+    def test_worthwhile(self):
+        """Test that only searches that take time are pondered."""
+        perfect = ComputerPlayer("O", ComputerPlayer.SEARCH_PERFECT)
+        self.assertTrue(Ponderer.worthwhile(self.player, self.board))
+        self.assertFalse(Ponderer.worthwhile(perfect, self.board))
+        self.assertTrue(Ponderer.worthwhile(perfect, GameBoard(4, 4, 4)))
+        self.assertFalse(Ponderer.worthwhile(HumanPlayer("O"), self.board))
+
+    def test_prepares_every_reply(self):
+        """Test that each human move gets the reply make_move would play."""
+        ponderer = Ponderer(self.player)
+        ponderer.start(self.board)
+        self.finish(ponderer)
+        self.assertEqual(len(ponderer.answers), 7)
+        self.assertEqual(self.board.board, ["X", 0, 0, 0, "O", 0, 0, 0, 0])
+        for action in self.board.available_actions():
+            self.board.push(action)
+            self.assertEqual(ponderer.answers[self.board.zobrist_key()],
+                             self.player.make_move(self.board))
+            self.board.pop()
+
+    def test_take(self):
+        """Test that take hands out the prepared reply and stops."""
+        ponderer = Ponderer(self.player)
+        ponderer.start(self.board)
+        self.finish(ponderer)
+        self.board.apply_action(("X", 8))
+        self.assertEqual(ponderer.take(self.board),
+                         self.player.make_move(self.board))
+        self.assertIsNone(ponderer._thread)  # pylint: disable=protected-access
+
+    def test_noise_rolled_once_on_miss(self):
+        """Test that a missed take and the fallback search roll once."""
+        player = ComputerPlayer("O", difficulty=ComputerPlayer.DIFFICULTY_EASY,
+                                seed=3)
+        rolls = []
+        roll = player.random_move
+
+        def counted(board):
+            action = roll(board)
+            rolls.append(action is not None)
+            return action
+        player.random_move = counted
+        moves = 4000
+        for _ in range(moves):
+            if Ponderer(player).take(self.board) is None:
+                player.make_move(self.board, skip_noise=True)
+        self.assertEqual(len(rolls), moves)
+        self.assertAlmostEqual(sum(rolls) / moves, player.noise, delta=0.03)
+
+    def test_take_unknown_position(self):
+        """Test that a position that was not pondered has no reply."""
+        ponderer = Ponderer(self.player)
+        ponderer.start(self.board)
+        self.finish(ponderer)
+        self.board.board = ["X", "X", 0, 0, "O", 0, 0, 0, "O"]
+        self.assertIsNone(ponderer.take(self.board))
+
+    def test_take_waits_for_search_in_flight(self):
+        """Test that the reply being searched is finished, not dropped."""
+        board = GameBoard(5, 5, 4)
+        board.apply_action(("X", 12))
+        board.apply_action(("O", 6))
+        player = ComputerPlayer("O", ComputerPlayer.SEARCH_ITERATIVE,
+                                time_limit=0.2)
+        ponderer = Ponderer(player)
+        first = ponderer.expected_moves(board)[0]
+        ponderer.start(board)
+        time.sleep(0.05)
+        board.apply_action(first)
+        self.assertIsNotNone(ponderer.take(board))
+
+    def test_expected_move_first(self):
+        """Test that the reply the engine expects is pondered first."""
+        board = GameBoard(4, 4, 4)
+        player = ComputerPlayer("O", ComputerPlayer.SEARCH_ITERATIVE,
+                                max_depth=3)
+        board.apply_action(("X", 0))
+        board.apply_action(player.make_move(board))
+        expected = player.engine.principal_variation(board)[0]
+        moves = Ponderer(player).expected_moves(board)
+        self.assertEqual(moves[0][1], expected)
+        self.assertEqual(sorted(moves), board.available_actions())
+
+    def test_stop_cancels(self):
+        """Test that stop ends a long search quickly and keeps nothing."""
+        player = ComputerPlayer("O", ComputerPlayer.SEARCH_ITERATIVE,
+                                time_limit=30)
+        ponderer = Ponderer(player)
+        ponderer.start(GameBoard(7, 7, 5))
+        time.sleep(0.05)
+        start = time.perf_counter()
+        ponderer.stop()
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertEqual(ponderer.answers, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
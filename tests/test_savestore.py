@@ -0,0 +1,159 @@
+"""Unit tests for the SQLite save store."""
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from board import GameBoard
+from game import Game
+from savestore import SaveStore
+
+
+def game_state(moves=(), num_players=1):
+    """Return the saved-game dictionary of a 3x3 game."""
+    game = Game(GameBoard(), num_players)
+    for move in moves:
+        game.play(move)
+    return game.to_dict()
+
+
+class TestSaveStore(unittest.TestCase):
+    """Unit tests for the SaveStore class."""
+
+    def setUp(self):
+        """Set up an empty store in a temporary directory."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name, "saves.db")
+        self.store = SaveStore(self.path)
+
+    def tearDown(self):
+        """Close the store and remove its directory."""
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_wal_and_indexes(self):
+        """Test that the database runs in WAL mode with indexed columns."""
+        self.assertTrue(self.store.created)
+        mode = self.store.connection.execute(
+            "PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+        plan = " ".join(row[3] for row in self.store.connection.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM saves WHERE status = ? "
+            "ORDER BY created DESC, id DESC", ("X",)))
+        self.assertIn("saves_status", plan)
+        self.store.close()
+        self.store = SaveStore(self.path)
+        self.assertFalse(self.store.created)
+
+    def test_save_and_load(self):
+        """Test that a save keeps the game and its summary columns."""
+        state = game_state([4, 0, 8])
+        save_id = self.store.save("Evening game", state, created=100.0)
+        self.assertEqual(self.store.load(save_id), state)
+        self.assertEqual(self.store.page(), [{
+            'id': save_id, 'name': "Evening game", 'created': 100.0,
+            'num_players': 1, 'moves': 3, 'status': SaveStore.STATUS_PLAYING}])
+        self.assertIsNone(self.store.load(save_id + 1))
+
+    def test_find(self):
+        """Test that a save is found by its name in any case."""
+        save_id = self.store.save("Evening game", game_state([4]))
+        self.assertEqual(self.store.find("evening GAME"), save_id)
+        self.assertIsNone(self.store.find("Morning game"))
+
+    def test_same_name_replaces(self):
+        """Test that saving under a known name, in any case, replaces it."""
+        first = self.store.save("game", game_state([4]))
+        second = self.store.save("GAME", game_state([0, 3, 1, 4, 2],
+                                                    num_players=2))
+        self.assertEqual(first, second)
+        self.assertEqual(self.store.count(), 1)
+        self.assertEqual(self.store.page()[0]['status'],
+                         GameBoard.BOARD_PLAYER_X)
+
+    def test_pages(self):
+        """Test that pages list every save once, newest first."""
+        self.store.save_many([(f"game {i}", game_state(), float(i))
+                              for i in range(45)])
+        names = []
+        page = self.store.page(limit=20)
+        while page:
+            names += [save['name'] for save in page]
+            page = self.store.page(page[-1], limit=20)
+        self.assertEqual(names, [f"game {i}" for i in reversed(range(45))])
+
+    def test_search_and_filters(self):
+        """Test name search and the player mode and status filters."""
+        self.store.save_many([
+            ("Alice 1", game_state([0, 3, 1, 4, 2]), 1.0),
+            ("alice 2", game_state([4], num_players=2), 2.0),
+            ("Bob", game_state(), 3.0),
+            ("100%_sure", game_state(), 4.0)])
+        self.assertEqual([save['name'] for save in
+                          self.store.page(search="ALICE")],
+                         ["alice 2", "Alice 1"])
+        self.assertEqual(self.store.count(search="100%_"), 1)
+        self.assertEqual(self.store.count(search="1%"), 0)
+        self.assertEqual(self.store.count(num_players=2), 1)
+        self.assertEqual([save['name'] for save in self.store.page(
+            status=GameBoard.BOARD_PLAYER_X)], ["Alice 1"])
+
+    def test_delete(self):
+        """Test that a deleted save is gone."""
+        save_id = self.store.save("game", game_state())
+        self.assertTrue(self.store.delete(save_id))
+        self.assertFalse(self.store.delete(save_id))
+        self.assertEqual(self.store.count(), 0)
+
+    def test_import_json(self):
+        """Test that JSON saves are imported once and damaged ones skipped."""
+        saved = Path(self.directory.name, "savedGames")
+        saved.mkdir()
+        for name, state in (("first", game_state([4])),
+                            ("second", game_state([4, 0], num_players=2))):
+            with open(saved / f"{name}.json", 'w', encoding='utf-8') as file:
+                json.dump(state, file)
+        (saved / "broken.json").write_text("invalid", encoding='utf-8')
+        (saved / "list.json").write_text("[]", encoding='utf-8')
+        os.utime(saved / "first.json", (50, 50))
+        self.assertEqual(self.store.import_json(saved), 2)
+        self.assertEqual(self.store.import_json(saved), 0)
+        oldest = self.store.page()[-1]
+        self.assertEqual((oldest['name'], oldest['created']), ("first", 50))
+        self.assertEqual(self.store.load(oldest['id']), game_state([4]))
+        self.assertEqual(self.store.import_json(saved / "missing"), 0)
+
+    def test_import_counts_inserted_rows(self):
+        """Test that saves written during an import are not counted."""
+        saved = Path(self.directory.name, "savedGames")
+        saved.mkdir()
+        for name in ("first", "second"):
+            with open(saved / f"{name}.json", 'w', encoding='utf-8') as file:
+                json.dump(game_state([4]), file)
+        original = SaveStore._row
+        with SaveStore(self.path) as other:
+            def row(name, state, created=None):
+                """Save the first game from another connection meanwhile."""
+                values = original(name, state, created)
+                if name == "first":
+                    with other.connection:
+                        other.connection.execute(
+                            "INSERT INTO saves (name, created, num_players, "
+                            "moves, status, state) VALUES (?, ?, ?, ?, ?, ?)",
+                            values)
+                return values
+            with patch.object(SaveStore, '_row', side_effect=row):
+                self.assertEqual(self.store.import_json(saved), 1)
+        self.assertEqual(self.store.count(), 2)
+
+    def test_describe(self):
+        """Test the one line description of a listed save."""
+        self.store.save("won", game_state([0, 3, 1, 4, 2], num_players=2))
+        self.assertRegex(SaveStore.describe(self.store.page()[0]),
+                         r"^won \(\d{4}-\d\d-\d\d \d\d:\d\d, 2 players, "
+                         r"5 moves, X won\)$")
+
+
+if __name__ == '__main__':
+    unittest.main()
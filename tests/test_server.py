@@ -0,0 +1,140 @@
+"""Unit tests for the asyncio game server."""
+import asyncio
+import json
+import tempfile
+import unittest
+from savestore import SaveStore
+from server import GameServer
+
+
+class TestGameServer(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for the GameServer class."""
+
+    async def asyncSetUp(self):
+        """Start a server on a free port with its own save directory."""
+        self.save_dir = tempfile.TemporaryDirectory()
+        self.server = GameServer(port=0, idle_timeout=60,
+                                 save_dir=self.save_dir.name)
+        self.host, self.port = await self.server.start()
+        self.reader, self.writer = await asyncio.open_connection(
+            self.host, self.port)
+
+    async def asyncTearDown(self):
+        """Close the connection and the server."""
+        self.writer.close()
+        await self.server.close()
+        self.save_dir.cleanup()
+
+    async def request(self, **request):
+        """Send one request and return the decoded response."""
+        self.writer.write(json.dumps(request).encode() + b"\n")
+        await self.writer.drain()
+        return json.loads(await self.reader.readline())
+
+    async def test_play_against_computer(self):
+        """Test that the computer answers every move until the end."""
+        state = await self.request(op="new")
+        self.assertTrue(state["ok"])
+        self.assertEqual(state["legal_moves"], list(range(9)))
+        while state["result"] is None:
+            state = await self.request(op="move",
+                                       index=state["legal_moves"][0])
+            self.assertTrue(state["ok"])
+            if state["result"] is None:
+                self.assertIsNotNone(state["computer_move"])
+        self.assertIn(state["result"], ("O", "draw"))
+
+    async def test_computer_moves_first(self):
+        """Test that a computer playing X opens the game."""
+        state = await self.request(op="new", computer="X")
+        self.assertIsNotNone(state["computer_move"])
+        self.assertEqual(state["current_turn"], "O")
+
+    async def test_row_and_column(self):
+        """Test a move given as row and column on a larger board."""
+        state = await self.request(op="new", size=4, computer=None)
+        state = await self.request(op="move", row=2, column=3)
+        self.assertEqual(state["board"][6], "X")
+        self.assertEqual(state["current_turn"], "O")
+
+    async def test_errors(self):
+        """Test that bad requests are answered with an error."""
+        self.writer.write(b"not json\n")
+        self.assertFalse(json.loads(await self.reader.readline())["ok"])
+        self.assertFalse((await self.request(op="move", index=0))["ok"])
+        self.assertFalse((await self.request(op="fly"))["ok"])
+        await self.request(op="new")
+        await self.request(op="move", index=4)
+        response = await self.request(op="move", index=4)
+        self.assertEqual(response["error"], "Space already taken")
+        self.assertFalse((await self.request(op="save", name="../x"))["ok"])
+        self.assertFalse((await self.request(op="load", name="nothing"))["ok"])
+
+    async def test_save_and_load(self):
+        """Test that a saved game is restored by another session."""
+        await self.request(op="new", computer=None)
+        await self.request(op="move", index=0)
+        self.assertTrue((await self.request(op="save", name="game"))["ok"])
+        with SaveStore(self.server.save_path) as store:
+            self.assertIsNotNone(store.find("game"))
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        writer.write(b'{"op": "load", "name": "game"}\n')
+        state = json.loads(await reader.readline())
+        writer.close()
+        self.assertEqual(state["board"][0], "X")
+        self.assertEqual(state["current_turn"], "O")
+        self.assertIsNone(state["computer"])
+
+    async def test_load_damaged_save(self):
+        """Test that a save with a short board is answered with an error."""
+        with SaveStore(self.server.save_path) as store:
+            store.connection.execute(
+                "INSERT INTO saves (name, created, num_players, moves, "
+                "status, state) VALUES ('short', 0, 2, 0, 'playing', ?)",
+                (json.dumps({"board": [0] * 4, "num_players": 2}),))
+            store.connection.commit()
+        response = await self.request(op="load", name="short")
+        self.assertEqual(response, {"ok": False,
+                                    "error": "Damaged saved game"})
+
+    async def test_idle_eviction(self):
+        """Test that a silent session is closed."""
+        server = GameServer(port=0, idle_timeout=0.05,
+                            save_dir=self.save_dir.name)
+        host, port = await server.start()
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(b'{"op": "new"}\n')
+        await reader.readline()
+        await asyncio.sleep(0.3)
+        self.assertEqual(await reader.readline(), b"")
+        self.assertEqual(server.sessions, {})
+        self.assertEqual(server.evicted, 1)
+        writer.close()
+        await server.close()
+
+    async def test_close_cancels_clients(self):
+        """Test that closing the server ends the open connections."""
+        await self.request(op="new")
+        await self.server.close()
+        self.assertEqual(self.server._clients, set())
+        self.assertEqual(self.server.sessions, {})
+        self.assertEqual(await self.reader.readline(), b"")
+
+    async def test_concurrent_sessions(self):
+        """Test that many sessions are served at once."""
+        async def play(index):
+            reader, writer = await asyncio.open_connection(self.host,
+                                                           self.port)
+            writer.write(b'{"op": "new"}\n')
+            await reader.readline()
+            writer.write(json.dumps({"op": "move",
+                                     "index": index % 9}).encode() + b"\n")
+            state = json.loads(await reader.readline())
+            writer.close()
+            return state["ok"]
+        results = await asyncio.gather(*(play(index) for index in range(50)))
+        self.assertTrue(all(results))
+
+
+if __name__ == '__main__':
+    unittest.main()
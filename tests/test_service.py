@@ -0,0 +1,125 @@
+"""Unit tests for the best-move HTTP service."""
+import json
+import threading
+import unittest
+from http.client import HTTPConnection
+from service import BestMoveService, LRUCache, make_server
+
+
+class TestLRUCache(unittest.TestCase):
+    """Unit tests for the LRUCache class."""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest unused entry is evicted first."""
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+        self.assertAlmostEqual(cache.hit_ratio(), 2 / 3)
+
+
+class TestBestMoveService(unittest.TestCase):
+    """Unit tests for the BestMoveService class."""
+
+    def setUp(self):
+        """Create a service with an empty cache."""
+        self.service = BestMoveService()
+
+    def answer(self, board, **shape):
+        """Answer a board given as a list, like a request body."""
+        request = dict(shape, board=board)
+        return self.service.best_move(self.service.parse_board(request))
+
+    def test_takes_win(self):
+        """Test that a win in one is the move and the whole variation."""
+        result = self.answer(["X", "X", 0, "O", "O", 0, 0, 0, 0])
+        self.assertEqual(result["move"], 2)
+        self.assertEqual(result["pv"], [2])
+        self.assertEqual(result["score"], 10)
+
+    def test_empty_board(self):
+        """Test that the empty board is a draw played to the end."""
+        result = self.answer([0] * 9)
+        self.assertEqual(result["score"], 0)
+        self.assertEqual(len(result["pv"]), 9)
+        self.assertEqual(len(set(result["pv"])), 9)
+
+    def test_symmetric_hit(self):
+        """Test that a mirrored position is answered from the cache."""
+        first = self.answer(["X", "X", 0, "O", "O", 0, 0, 0, 0])
+        mirrored = self.answer([0, "X", "X", 0, "O", "O", 0, 0, 0])
+        self.assertFalse(first["cached"])
+        self.assertTrue(mirrored["cached"])
+        self.assertEqual(mirrored["move"], 0)
+        self.assertEqual(self.service.cache.hit_ratio(), 0.5)
+
+    def test_larger_board(self):
+        """Test that a 4x4 board is searched and its move is legal."""
+        board = ["X", "X", "X", 0, "O", "O", "O", 0] + [0] * 8
+        result = self.answer(board)
+        self.assertEqual(result["move"], 3)
+        self.assertGreaterEqual(result["score"], 1)
+
+    def test_invalid_boards(self):
+        """Test that malformed and finished boards are rejected."""
+        for request in ({}, {"board": [0] * 8}, {"board": ["Y"] + [0] * 8},
+                        {"board": ["X", "X"] + [0] * 7},
+                        {"board": [0] * 6, "rows": "2", "columns": 3}):
+            with self.assertRaises(ValueError):
+                self.service.parse_board(request)
+        with self.assertRaises(ValueError):
+            self.answer(["X", "X", "X", "O", "O", 0, 0, 0, 0])
+
+
+class TestHTTP(unittest.TestCase):
+    """Unit tests for the HTTP endpoints."""
+
+    def setUp(self):
+        """Start the service on a free port."""
+        self.server = make_server(port=0)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.connection = HTTPConnection(*self.server.server_address)
+
+    def tearDown(self):
+        """Stop the service."""
+        self.connection.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def request(self, method, path, body=None):
+        """Send a request and return the status and decoded body."""
+        data = None if body is None else json.dumps(body)
+        self.connection.request(method, path, data)
+        response = self.connection.getresponse()
+        return response.status, json.loads(response.read())
+
+    def test_best_move_and_metrics(self):
+        """Test a best move request and the metrics it leaves behind."""
+        status, body = self.request(
+            "POST", "/best-move", {"board": ["X", 0, 0, 0, 0, 0, 0, 0, 0]})
+        self.assertEqual(status, 200)
+        self.assertEqual(body["move"], 4)
+        self.request("POST", "/best-move",
+                     {"board": [0, 0, "X", 0, 0, 0, 0, 0, 0]})
+        status, metrics = self.request("GET", "/metrics")
+        self.assertEqual(status, 200)
+        self.assertEqual(metrics["requests"], 2)
+        self.assertEqual(metrics["cache_hit_ratio"], 0.5)
+        self.assertIn("p99", metrics["latency_ms"])
+
+    def test_errors(self):
+        """Test bad requests and unknown paths."""
+        self.assertEqual(self.request("POST", "/best-move", {"x": 1})[0], 400)
+        self.assertEqual(self.request("GET", "/nothing")[0], 404)
+        self.assertEqual(self.request("GET", "/metrics")[1]["errors"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""Unit tests for the headless simulator."""
+import io
+import json
+import unittest
+from board import GameBoard
+from player import ComputerPlayer, RandomPlayer
+from simulate import play_game, simulate
+
+
+class TestRandomPlayer(unittest.TestCase):
+    """Unit tests for the RandomPlayer class."""
+
+    def test_picks_available_move(self):
+        """Test that only empty spaces are picked."""
+        board = GameBoard()
+        board.board = ["X", "O", "X", "O", 0, "X", "O", "X", "O"]
+        self.assertEqual(RandomPlayer("X", seed=3).make_move(board), ("X", 4))
+
+    def test_full_board(self):
+        """Test that a full board has no move."""
+        board = GameBoard()
+        board.board = ["X", "O", "X", "X", "O", "O", "O", "X", "X"]
+        self.assertIsNone(RandomPlayer("X").make_move(board))
+
+
+class TestSimulate(unittest.TestCase):
+    """Unit tests for play_game and simulate."""
+
+    def test_play_game(self):
+        """Test that the perfect player never loses to a random one."""
+        for seed in range(20):
+            record = play_game(
+                ComputerPlayer("X", ComputerPlayer.SEARCH_PERFECT),
+                RandomPlayer("O", seed))
+            self.assertIn(record['winner'], ("X", "draw"))
+            self.assertEqual(record['plies'], len(record['moves']))
+            self.assertEqual(len(set(record['moves'])), record['plies'])
+
+    def test_records_streamed(self):
+        """Test that every game is written as one JSON line in order."""
+        output = io.StringIO()
+        totals = simulate(25, 'random', 'random', output, chunk_size=10)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 25)
+        records = [json.loads(line) for line in lines]
+        self.assertEqual([record['game'] for record in records],
+                         list(range(25)))
+        self.assertEqual(sum(totals.values()), 25)
+        self.assertEqual(set(records[0]),
+                         {'game', 'x', 'o', 'moves', 'winner', 'plies',
+                          'seconds'})
+
+    def test_workers_repeatable(self):
+        """Test that a process pool plays the same games as one process."""
+        single, pooled = io.StringIO(), io.StringIO()
+        simulate(12, 'random', 'random', single, chunk_size=5, seed=4)
+        simulate(12, 'random', 'random', pooled, workers=2, chunk_size=5,
+                 seed=4)
+        moves = [[json.loads(line)['moves'] for line in output.getvalue()
+                  .splitlines()] for output in (single, pooled)]
+        self.assertEqual(moves[0], moves[1])
+
+    def test_larger_board(self):
+        """Test games on a 4x4 board."""
+        output = io.StringIO()
+        simulate(3, 'random', 'random', output, shape=(4, 4, 4))
+        for line in output.getvalue().splitlines():
+            self.assertLessEqual(json.loads(line)['plies'], 16)
+
+    def test_unknown_player(self):
+        """Test that an unknown player name is rejected."""
+        with self.assertRaises(ValueError):
+            simulate(1, 'random', 'nobody', io.StringIO())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+"""Unit tests for the perfect play table."""
+import tempfile
+import unittest
+from pathlib import Path
+from board import GameBoard
+from player import ComputerPlayer
+from solver import PerfectPlayTable
+
+
+class TestPerfectPlayTable(unittest.TestCase):
+    """Unit tests for the PerfectPlayTable class."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Solve the game once for all tests."""
+        cls.table = PerfectPlayTable.build()
+
+    def test_reachable_positions(self):
+        """Test that every reachable position is solved exactly once."""
+        self.assertEqual(self.table.positions, 5478)
+
+    def test_index_of(self):
+        """Test the base-3 index of a board."""
+        self.assertEqual(PerfectPlayTable.index_of([0] * 9), 0)
+        self.assertEqual(PerfectPlayTable.index_of(["X"] + [0] * 8), 1)
+        self.assertEqual(PerfectPlayTable.index_of([0] * 8 + ["O"]),
+                         2 * 3 ** 8)
+
+    def test_empty_board_is_draw(self):
+        """Test that perfect play from the empty board is a draw."""
+        value, moves = self.table.lookup(GameBoard())
+        self.assertEqual(value, 0)
+        self.assertEqual(moves, 0b111111111)
+
+    def test_finished_game_value(self):
+        """Test that a won game is lost for the side to move."""
+        board = GameBoard()
+        board.board = ["X", "X", "X", "O", "O", 0, 0, 0, 0]
+        self.assertEqual(self.table.lookup(board), (-11, 0))
+        self.assertIsNone(self.table.best_action(board))
+
+    def test_unreachable_position(self):
+        """Test that impossible positions are not in the table."""
+        board = GameBoard()
+        board.board = ["O", "O", 0, 0, 0, 0, 0, 0, 0]
+        self.assertIsNone(self.table.lookup(board))
+
+    def test_best_action_matches_minimax(self):
+        """Test that the table picks the same move as minimax."""
+        positions = [
+            [0, "O", 0, 0, "X", 0, 0, "X", 0],
+            ["X", "X", 0, "O", "O", 0, 0, 0, 0],
+            ["X", "O", 0, 0, "X", 0, 0, 0, 0],
+            ["X", 0, 0, 0, 0, 0, 0, 0, 0],
+        ]
+        for cells in positions:
+            board = GameBoard()
+            board.board = list(cells)
+            expected = ComputerPlayer(board.current_player()).make_move(board)
+            self.assertEqual(self.table.best_action(board), expected)
+
+    def test_save_and_load(self):
+        """Test that a saved table loads back unchanged."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory, "table.bin")
+            self.table.save(path)
+            loaded = PerfectPlayTable.load(path)
+        self.assertEqual(loaded.values, self.table.values)
+        self.assertEqual(loaded.moves, self.table.moves)
+        self.assertEqual(loaded.positions, 5478)
+
+    def test_load_rejects_other_version(self):
+        """Test that files of another version are ignored."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory, "table.bin")
+            path.write_bytes(PerfectPlayTable.MAGIC + bytes([0]))
+            self.assertIsNone(PerfectPlayTable.load(path))
+            self.assertIsNone(PerfectPlayTable.load(Path(directory, "none")))
+
+    def test_computer_player_perfect_mode(self):
+        """Test that the computer player uses the table."""
+        board = GameBoard()
+        board.board = ["X", "X", 0, "O", 0, 0, 0, 0, 0]
+        agent = ComputerPlayer("O", ComputerPlayer.SEARCH_PERFECT)
+        self.assertEqual(agent.make_move(board), ("O", 2))
+        self.assertEqual(agent.nodes_visited, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
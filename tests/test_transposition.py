@@ -0,0 +1,177 @@
+"""Unit tests for the transposition table."""
+import unittest
+from board import GameBoard
+from player import ComputerPlayer
+from transposition import TranspositionTable
+
+
+class TestTranspositionTable(unittest.TestCase):
+    """Unit tests for the TranspositionTable class."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.table = TranspositionTable()
+
+    def test_probe_counts_misses_and_hits(self):
+        """Test that probe counts unknown and known positions."""
+        self.assertIsNone(self.table.probe(42))
+        self.table.store(42, 7, TranspositionTable.EXACT)
+        self.assertEqual(self.table.probe(42), (7, TranspositionTable.EXACT))
+        self.assertEqual(self.table.hits, 1)
+        self.assertEqual(self.table.misses, 1)
+        self.assertEqual(len(self.table), 1)
+
+    def test_bound_flag(self):
+        """Test the bound type of scores below, inside and above a window."""
+        self.assertEqual(TranspositionTable.bound_flag(-1, -1, 1),
+                         TranspositionTable.UPPER_BOUND)
+        self.assertEqual(TranspositionTable.bound_flag(0, -1, 1),
+                         TranspositionTable.EXACT)
+        self.assertEqual(TranspositionTable.bound_flag(1, -1, 1),
+                         TranspositionTable.LOWER_BOUND)
+
+    def test_clear(self):
+        """Test that clear removes entries and resets the counters."""
+        self.table.store(1, 0, TranspositionTable.LOWER_BOUND)
+        self.table.probe(1)
+        self.table.clear()
+        self.assertEqual(len(self.table), 0)
+        self.assertEqual(self.table.hits, 0)
+
+    def test_probe_depth(self):
+        """Test that results searched too shallow count as misses."""
+        self.table.store(7, 1, TranspositionTable.EXACT, depth=3)
+        self.assertIsNone(self.table.probe(7, depth=4))
+        self.assertEqual(self.table.probe(7, depth=3),
+                         (1, TranspositionTable.EXACT))
+        self.assertEqual((self.table.hits, self.table.misses), (1, 1))
+
+    def test_lru_evicts_least_recently_used(self):
+        """Test that a full LRU table forgets the oldest unused entry."""
+        table = TranspositionTable(max_entries=2)
+        table.store(1, 0, TranspositionTable.EXACT)
+        table.store(2, 0, TranspositionTable.EXACT)
+        table.probe(1)
+        table.store(3, 0, TranspositionTable.EXACT)
+        self.assertIsNone(table.probe(2))
+        self.assertIsNotNone(table.probe(1))
+        self.assertIsNotNone(table.probe(3))
+        self.assertEqual(table.stats()['evictions'], 1)
+        self.assertEqual(table.occupancy(), 1.0)
+
+    def test_depth_preferred_keeps_deeper(self):
+        """Test that a shallow result does not replace a deeper one."""
+        table = TranspositionTable(max_entries=4,
+                                   policy=TranspositionTable.POLICY_DEPTH)
+        table.store(1, 5, TranspositionTable.EXACT, depth=6)
+        # 5 maps to the same slot as 1
+        table.store(5, 2, TranspositionTable.EXACT, depth=2)
+        self.assertIsNone(table.probe(5))
+        self.assertEqual(table.probe(1), (5, TranspositionTable.EXACT))
+        table.store(5, 2, TranspositionTable.EXACT, depth=6)
+        self.assertIsNone(table.probe(1))
+        self.assertEqual(table.probe(5), (2, TranspositionTable.EXACT))
+        stats = table.stats()
+        self.assertEqual((stats['rejected'], stats['evictions']), (1, 1))
+        self.assertEqual((stats['entries'], stats['occupancy']), (1, 0.25))
+
+    def test_always_replace(self):
+        """Test that an always-replace slot keeps the newest result."""
+        table = TranspositionTable(max_entries=4,
+                                   policy=TranspositionTable.POLICY_ALWAYS)
+        table.store(1, 5, TranspositionTable.EXACT, depth=6)
+        table.store(5, 2, TranspositionTable.LOWER_BOUND, depth=2)
+        self.assertIsNone(table.probe(1))
+        self.assertEqual(table.probe(5), (2, TranspositionTable.LOWER_BOUND))
+        self.assertEqual(len(table), 1)
+        table.clear()
+        self.assertEqual(table.stats()['entries'], 0)
+        self.assertEqual(table.stats()['evictions'], 0)
+
+    def test_memory_cap(self):
+        """Test that max_bytes limits the number of entries."""
+        table = TranspositionTable(max_bytes=10000)
+        self.assertEqual(table.max_entries, 10000 // table.ENTRY_BYTES[
+            TranspositionTable.POLICY_LRU])
+        for key in range(1000):
+            table.store(key, 0, TranspositionTable.EXACT)
+        self.assertEqual(len(table), table.max_entries)
+        self.assertLessEqual(table.stats()['bytes'], 10000)
+        with self.assertRaises(ValueError):
+            TranspositionTable(max_bytes=10)
+        with self.assertRaises(ValueError):
+            TranspositionTable(policy="random")
+
+    def test_bounded_tables_play_perfectly(self):
+        """Test that tiny tables of every policy still find best moves."""
+        for policy in (TranspositionTable.POLICY_LRU,
+                       TranspositionTable.POLICY_DEPTH,
+                       TranspositionTable.POLICY_ALWAYS):
+            table = TranspositionTable(max_entries=32, policy=policy)
+            board = GameBoard()
+            while board.check_terminal_state() is None:
+                player = board.current_player()
+                reference = GameBoard()
+                reference.board = list(board.board)
+                agent = ComputerPlayer(player,
+                                       ComputerPlayer.SEARCH_ALPHA_BETA, table)
+                action = agent.make_move(board)
+                self.assertEqual(action,
+                                 ComputerPlayer(player).make_move(reference))
+                board.apply_action(action)
+            self.assertEqual(board.check_terminal_state(), 0)
+            self.assertGreater(table.stats()['evictions'], 0)
+
+    def test_canonical_key_symmetric(self):
+        """Test that all rotations and reflections share one key."""
+        cells = ["X", "O", 0, 0, 0, "X", 0, 0, 0]
+        keys = set()
+        for symmetry in GameBoard().geometry.symmetries:
+            board = GameBoard()
+            board.board = [cells[index] for index in symmetry]
+            keys.add(board.canonical_key())
+        self.assertEqual(len(keys), 1)
+
+    def test_canonical_key_distinct(self):
+        """Test that different positions get different keys."""
+        corner = GameBoard()
+        corner.apply_action(("X", 0))
+        center = GameBoard()
+        center.apply_action(("X", 4))
+        self.assertNotEqual(corner.canonical_key(), center.canonical_key())
+
+    def test_table_shared_across_moves(self):
+        """Test that later moves in a game reuse earlier results."""
+        board = GameBoard()
+        agent = ComputerPlayer("X", ComputerPlayer.SEARCH_ALPHA_BETA,
+                               self.table)
+        board.apply_action(agent.make_move(board))
+        board.apply_action(("O", 4))
+        misses = self.table.misses
+        reference = GameBoard()
+        reference.board = list(board.board)
+        action = agent.make_move(board)
+        self.assertEqual(action, ComputerPlayer("X").make_move(reference))
+        self.assertGreater(self.table.hits, self.table.misses - misses)
+
+    def test_shared_table_same_moves_as_minimax(self):
+        """Test that two players sharing a table still play perfectly."""
+        board = GameBoard()
+        board.apply_action(("X", 1))
+        players = {"X": ComputerPlayer("X", ComputerPlayer.SEARCH_ALPHA_BETA,
+                                       self.table),
+                   "O": ComputerPlayer("O", ComputerPlayer.SEARCH_ALPHA_BETA,
+                                       self.table)}
+        while board.check_terminal_state() is None:
+            player = board.current_player()
+            reference = GameBoard()
+            reference.board = list(board.board)
+            action = players[player].make_move(board)
+            self.assertEqual(action,
+                             ComputerPlayer(player).make_move(reference))
+            board.apply_action(action)
+        self.assertEqual(board.check_terminal_state(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
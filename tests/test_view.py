@@ -1,7 +1,18 @@
 """ Test the output functions of the GameView class """
+import io
+import os
 import unittest
 from unittest.mock import patch, Mock
-from view import GameView
+from board import GameBoard
+from view import BinaryRain, GameView, TerminalRenderer
+
+
+class FakeTerminal(io.StringIO):
+    """ A text stream that claims to be a terminal """
+
+    def isatty(self):
+        """ Report a terminal so the renderer uses ANSI sequences """
+        return True
 
 class TestOutput(unittest.TestCase):
     """ Test the output functions of the GameView class """
@@ -26,9 +37,15 @@ class TestOutput(unittest.TestCase):
 
     @patch('os.system')
     def test_clear_screen(self, mock_system):
-        """ Test the clear_screen method """
-        GameView.clear_screen()
-        mock_system.assert_called_once()
+        """ Test that clear_screen clears with ANSI codes, not a shell """
+        terminal = FakeTerminal()
+        with patch.object(GameView, 'renderer', TerminalRenderer(terminal)):
+            GameView.clear_screen()
+            self.assertEqual(terminal.getvalue(), '')
+            with patch('builtins.print'):
+                GameView.display_message("Test message")
+        mock_system.assert_not_called()
+        self.assertEqual(terminal.getvalue(), "\x1b[H\x1b[2J")
 
     @patch('builtins.input', return_value='test')
     def test_input_prompt(self, mock_input):
@@ -45,6 +62,8 @@ class TestOutput(unittest.TestCase):
         mock_board.BOARD_PLAYER_X = 'X'
         mock_board.BOARD_PLAYER_O = 'O'
         mock_board.BOARD_EMPTY = ' '
+        mock_board.rows = 3
+        mock_board.columns = 3
         # Define the board layout
         mock_board.board = [
             mock_board.BOARD_PLAYER_X, mock_board.BOARD_PLAYER_O, mock_board.BOARD_PLAYER_X,
@@ -53,10 +72,39 @@ class TestOutput(unittest.TestCase):
         ]
 
         # Call the print_board method with the board layout
-        GameView.print_board(mock_board)
+        with patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+            GameView.print_board(mock_board)
 
-        # Check that print was called (at least once)
-        mock_print.assert_called()
+        # The board is written at once, without print
+        mock_print.assert_not_called()
+        self.assertIn('| X | O | X |', mock_stdout.getvalue())
+
+    @patch('builtins.print')
+    def test_print_board_large(self, mock_print):
+        """ Test that print_board draws every column of a 4x4 board """
+        board = GameBoard(4, 4, 4)
+        board.apply_action((GameBoard.BOARD_PLAYER_X, 15))
+        with patch('sys.stdout', new_callable=Mock) as mock_stdout:
+            GameView.print_board(board)
+        mock_print.assert_not_called()
+        mock_stdout.write.assert_called_once()
+        frame = mock_stdout.write.call_args[0][0]
+        self.assertTrue(frame.startswith('\n+---+---+---+---+\n'))
+        self.assertIn('\n|   |   |   | X |\n', frame)
+        self.assertEqual(frame.count('\n'), 10)
+
+    @patch('builtins.input', side_effect=['5', '4', '4'])
+    @patch('builtins.print')
+    def test_choose_move_large(self, mock_print, mock_input):
+        """ Test the choose_move method on a 4x4 board """
+        board = GameBoard(4, 4, 4)
+        board.apply_action((GameBoard.BOARD_PLAYER_O, 14))
+        mock_player = Mock()
+        mock_player.player_type = 'X'
+        result = GameView.choose_move(board, mock_player)
+        mock_print.assert_any_call("Invalid input. Please enter a number between 1 to 4.")
+        mock_input.assert_any_call('Enter column [1-4]: ')
+        self.assertEqual(result, ('4', '4'))
 
     @patch('builtins.input', side_effect=['save'])
     @patch('builtins.print')
@@ -65,6 +113,8 @@ class TestOutput(unittest.TestCase):
         mock_board = Mock()
         mock_board.board = [' '] * 9
         mock_board.BOARD_EMPTY = ' '
+        mock_board.rows = 3
+        mock_board.columns = 3
         mock_player = Mock()
         mock_player.player_type = 'X'
 
@@ -81,6 +131,8 @@ class TestOutput(unittest.TestCase):
         mock_board = Mock()
         mock_board.board = [' '] * 9
         mock_board.BOARD_EMPTY = ' '
+        mock_board.rows = 3
+        mock_board.columns = 3
         mock_player = Mock()
         mock_player.player_type = 'X'
 
@@ -98,6 +150,8 @@ class TestOutput(unittest.TestCase):
         mock_board = Mock()
         mock_board.board = ['X', ' ', ' ', ' ', ' ', ' ', ' ', ' ', ' ']
         mock_board.BOARD_EMPTY = ' '
+        mock_board.rows = 3
+        mock_board.columns = 3
         mock_player = Mock()
         mock_player.player_type = 'X'
 
@@ -116,6 +170,8 @@ class TestOutput(unittest.TestCase):
         mock_board = Mock()
         mock_board.board = [' '] * 9
         mock_board.BOARD_EMPTY = ' '
+        mock_board.rows = 3
+        mock_board.columns = 3
         mock_player = Mock()
         mock_player.player_type = 'X'
         result = GameView.choose_move(mock_board, mock_player)
@@ -132,6 +188,8 @@ class TestOutput(unittest.TestCase):
         mock_board = Mock()
         mock_board.board = [' '] * 9
         mock_board.BOARD_EMPTY = ' '
+        mock_board.rows = 3
+        mock_board.columns = 3
         mock_player = Mock()
         mock_player.player_type = 'X'
         result = GameView.choose_move(mock_board, mock_player)
@@ -148,6 +206,8 @@ class TestOutput(unittest.TestCase):
         mock_board = Mock()
         mock_board.board = [' '] * 9
         mock_board.BOARD_EMPTY = ' '
+        mock_board.rows = 3
+        mock_board.columns = 3
         mock_player = Mock()
         mock_player.player_type = 'X'
         result = GameView.choose_move(mock_board, mock_player)
@@ -164,6 +224,8 @@ class TestOutput(unittest.TestCase):
         mock_board = Mock()
         mock_board.board = [' '] * 9
         mock_board.BOARD_EMPTY = ' '
+        mock_board.rows = 3
+        mock_board.columns = 3
         mock_player = Mock()
         mock_player.player_type = 'X'
         result = GameView.choose_move(mock_board, mock_player)
@@ -180,6 +242,8 @@ class TestOutput(unittest.TestCase):
         mock_board = Mock()
         mock_board.board = [' '] * 9
         mock_board.BOARD_EMPTY = ' '
+        mock_board.rows = 3
+        mock_board.columns = 3
         mock_board.is_valid_move.return_value = True
         mock_player = Mock()
         mock_player.player_type = 'X'
@@ -190,5 +254,179 @@ class TestOutput(unittest.TestCase):
         mock_input.assert_any_call('Enter column [1-3]: ')
         self.assertEqual(result, 'save')
 
+
+class TestTerminalRenderer(unittest.TestCase):
+    """ Test the ANSI board renderer """
+
+    def setUp(self):
+        """ Set up a renderer on a fake terminal """
+        self.terminal = FakeTerminal()
+        self.renderer = TerminalRenderer(self.terminal)
+        self.board = GameBoard()
+        size = os.terminal_size((80, 24))
+        patcher = patch('shutil.get_terminal_size', return_value=size)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def draw(self):
+        """ Clear and draw the board like the game loop, return the output """
+        self.terminal.seek(0)
+        self.terminal.truncate()
+        self.renderer.clear()
+        self.renderer.draw_board(self.board)
+        return self.terminal.getvalue()
+
+    def test_first_frame_redraws_in_place(self):
+        """ Test that the first frame overwrites the screen from home """
+        output = self.draw()
+        self.assertTrue(output.startswith(TerminalRenderer.HOME))
+        self.assertNotIn(TerminalRenderer.ERASE_SCREEN, output)
+        self.assertIn('|   |   |   |' + TerminalRenderer.ERASE_LINE, output)
+        self.assertTrue(output.endswith(TerminalRenderer.ERASE_BELOW))
+
+    def test_only_changed_cells(self):
+        """ Test that later frames rewrite the changed cells only """
+        self.draw()
+        self.board.apply_action((GameBoard.BOARD_PLAYER_X, 5))
+        self.assertEqual(self.draw(),
+                         "\x1b[H\x1b[5;11HX\x1b[9;1H\x1b[J")
+        self.assertEqual(self.draw(), "\x1b[H\x1b[9;1H\x1b[J")
+
+    def test_scrolled_screen_redraws(self):
+        """ Test that a full redraw follows output that may have scrolled """
+        self.draw()
+        self.renderer.wrote("\n" * 20)
+        self.board.apply_action((GameBoard.BOARD_PLAYER_X, 0))
+        self.assertIn('| X |   |   |', self.draw())
+
+    def test_new_shape_redraws(self):
+        """ Test that a board of another size is drawn in full """
+        self.draw()
+        self.board = GameBoard(4, 4, 4)
+        self.assertIn('+---+---+---+---+', self.draw())
+
+    def test_other_output_clears(self):
+        """ Test that a pending clear is done before other output """
+        self.draw()
+        self.renderer.clear()
+        self.renderer.flush()
+        self.assertTrue(self.terminal.getvalue().endswith(
+            TerminalRenderer.HOME + TerminalRenderer.ERASE_SCREEN))
+        self.board.apply_action((GameBoard.BOARD_PLAYER_X, 0))
+        self.assertIn('| X |   |   |', self.draw())
+
+    def test_plain_stream(self):
+        """ Test that streams other than terminals get plain text """
+        stream = io.StringIO()
+        renderer = TerminalRenderer(stream)
+        renderer.clear()
+        renderer.draw_board(self.board)
+        renderer.clear()
+        renderer.flush()
+        self.assertEqual(stream.getvalue(),
+                         TerminalRenderer.frame([' '] * 9, 3, 3))
+
+
+    @patch('view.ctypes')
+    @patch('view.os.name', 'nt')
+    @patch.object(TerminalRenderer, '_virtual_terminal', None)
+    def test_windows_console_switched_once(self, mock_ctypes):
+        """ Test that a Windows console is switched to process ANSI once """
+        kernel32 = mock_ctypes.windll.kernel32
+        kernel32.GetConsoleMode.return_value = 1
+        kernel32.SetConsoleMode.return_value = 1
+        mock_ctypes.c_uint32.return_value.value = 3
+        output = self.draw()
+        self.draw()
+        self.assertTrue(output.startswith(TerminalRenderer.HOME))
+        kernel32.SetConsoleMode.assert_called_once_with(
+            kernel32.GetStdHandle.return_value, 3 | 0x0004)
+
+    @patch('view.ctypes')
+    @patch('view.os.name', 'nt')
+    @patch.object(TerminalRenderer, '_virtual_terminal', None)
+    def test_windows_console_without_ansi(self, mock_ctypes):
+        """ Test that an old Windows console gets plain text """
+        mock_ctypes.windll.kernel32.GetConsoleMode.return_value = 0
+        self.assertEqual(self.draw(), TerminalRenderer.frame([' '] * 9, 3, 3))
+        mock_ctypes.windll.kernel32.SetConsoleMode.assert_not_called()
+
+
+class TestBinaryRain(unittest.TestCase):
+    """ Test the binary rain animation """
+
+    def test_step_keeps_layout(self):
+        """ Test that frames only hold digits and spaces in place """
+        rain = BinaryRain(30, 8, seed=3)
+        size = len(rain.buffer)
+        for _ in range(50):
+            rain.step()
+        self.assertEqual(len(rain.buffer), size)
+        lines = bytes(rain.buffer[len(BinaryRain.HOME):]).split(b'\n')
+        self.assertEqual(lines[-1], b'')
+        self.assertEqual([len(line) for line in lines[:-1]], [30] * 8)
+        self.assertTrue(set(b''.join(lines)) <= set(b' 01'))
+        self.assertTrue(set(b''.join(lines)) & set(b'01'))
+
+    def test_drops_fall(self):
+        """ Test that heads move down by their speed and restart """
+        rain = BinaryRain(5, 4, seed=1)
+        heads = list(rain.heads)
+        rain.step()
+        for column, head in enumerate(heads):
+            moved = head + rain.speeds[column]
+            if rain.heads[column] != moved:
+                self.assertLessEqual(rain.heads[column], 0)
+
+    def test_seed_repeats(self):
+        """ Test that a seed makes the animation repeatable """
+        first, second = BinaryRain(20, 6, seed=7), BinaryRain(20, 6, seed=7)
+        for _ in range(10):
+            first.step()
+            second.step()
+        self.assertEqual(first.buffer, second.buffer)
+
+    def test_run_paces_frames(self):
+        """ Test that run shows the frames at the given rate """
+        stream = io.StringIO()
+        stats = BinaryRain(10, 3, seed=1).run(stream, fps=100, frames=5)
+        self.assertEqual(stats['frames'], 5)
+        self.assertGreaterEqual(stats['seconds'], 0.04)
+        self.assertLessEqual(stats['fps'], 101)
+        self.assertGreaterEqual(stats['cpu_seconds'], 0)
+        output = stream.getvalue()
+        self.assertEqual(output.count('\x1b[H'), 7)
+        self.assertTrue(output.endswith(BinaryRain.SHOW_CURSOR))
+
+    def test_run_writes_bytes_at_once(self):
+        """ Test that binary streams get the buffer in one write """
+        stream = Mock()
+        BinaryRain(10, 3, seed=1).run(stream, fps=1000, frames=3)
+        self.assertEqual(stream.buffer.write.call_count, 3)
+        self.assertIsInstance(stream.buffer.write.call_args[0][0], bytearray)
+
+    @patch('shutil.get_terminal_size', return_value=os.terminal_size((40, 12)))
+    def test_game_view_fills_terminal(self, mock_size):
+        """ Test that the animation is sized to the terminal """
+        GameView.renderer.forget()
+        with patch('view.BinaryRain.run', autospec=True,
+                   return_value={'frames': 1}) as mock_run:
+            GameView.binary_rain(frames=1)
+        mock_size.assert_called()
+        rain = mock_run.call_args[0][0]
+        self.assertEqual((rain.columns, rain.rows), (40, 11))
+
+    @patch.object(TerminalRenderer, 'enable_virtual_terminal',
+                  return_value=False)
+    def test_game_view_skips_without_ansi(self, mock_enable):
+        """ Test that consoles without ANSI support get no animation """
+        with patch('view.BinaryRain.run') as mock_run, \
+                patch('builtins.print') as mock_print:
+            self.assertIsNone(GameView.binary_rain(frames=1))
+        mock_enable.assert_called_once_with()
+        mock_run.assert_not_called()
+        mock_print.assert_called_once()
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,187 @@
+"""Caches search results for positions that were already evaluated."""
+
+from collections import OrderedDict
+
+
+class TranspositionTable:
+    """
+    Stores scores and bound types of searched positions.
+
+    Without a limit every position is kept. With max_entries or max_bytes
+    the table holds at most that many positions and makes room according
+    to its replacement policy:
+
+    POLICY_LRU forgets the least recently used position.
+    POLICY_DEPTH keeps positions in a fixed number of slots, picked by
+    the key. A new position only replaces one searched to the same or a
+    smaller depth, so the results that were most expensive to find stay.
+    POLICY_ALWAYS keeps positions in slots like POLICY_DEPTH, but a new
+    position always replaces the old one.
+    """
+    EXACT = 0
+    LOWER_BOUND = 1
+    UPPER_BOUND = 2
+    POLICY_LRU = "lru"
+    POLICY_DEPTH = "depth"
+    POLICY_ALWAYS = "always"
+    # Estimated bytes per stored position, the key included
+    ENTRY_BYTES = {POLICY_LRU: 200, POLICY_DEPTH: 120, POLICY_ALWAYS: 120}
+
+    def __init__(self, max_entries=None, max_bytes=None, policy=POLICY_LRU):
+        """
+        Initialize an empty table with zeroed counters.
+
+        Args:
+            max_entries: Optional largest number of positions kept.
+            max_bytes: Optional memory cap, converted to a number of
+            positions with ENTRY_BYTES. The smaller limit applies when
+            both are given.
+            policy: POLICY_LRU, POLICY_DEPTH or POLICY_ALWAYS, used once
+            the table is bounded.
+        """
+        if policy not in self.ENTRY_BYTES:
+            raise ValueError("Invalid replacement policy")
+        if max_bytes is not None:
+            fitting = max_bytes // self.ENTRY_BYTES[policy]
+            max_entries = fitting if max_entries is None \
+                else min(max_entries, fitting)
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("The table needs room for at least one entry")
+        self.max_entries = max_entries
+        self.policy = policy
+        self.entries = None
+        self._slots = None
+        self._occupied = 0
+        self.clear()
+
+    def __len__(self):
+        """
+        Return the number of stored positions.
+        """
+        if self._slots is not None:
+            return self._occupied
+        return len(self.entries)
+
+    def probe(self, key, depth=0):
+        """
+        Look up a position and count the hit or miss.
+
+        Args:
+            key: The position key, e.g. GameBoard.canonical_key().
+            depth: The depth the position must have been searched to at
+            least, shallower results count as a miss.
+
+        Returns:
+            A tuple (score, flag) or None if the position is unknown.
+        """
+        if self._slots is not None:
+            slot = self._slots[hash(key) % self.max_entries]
+            if slot is not None and slot[0] != key:
+                slot = None
+        else:
+            slot = self.entries.get(key)
+            if slot is not None and self.max_entries is not None:
+                self.entries.move_to_end(key)
+        if slot is None or slot[-2] < depth:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return slot[-1]
+
+    @classmethod
+    def bound_flag(cls, score, alpha, beta):
+        """
+        Tell what a score found with an alpha-beta window says.
+
+        Args:
+            score: The best score of the search.
+            alpha: The lower end of the window the search started with.
+            beta: The upper end of the window.
+
+        Returns:
+            UPPER_BOUND if the score failed low, LOWER_BOUND if it failed
+            high and EXACT if it is inside the window.
+        """
+        if score <= alpha:
+            return cls.UPPER_BOUND
+        if score >= beta:
+            return cls.LOWER_BOUND
+        return cls.EXACT
+
+    def store(self, key, score, flag, depth=0):
+        """
+        Store the result of a search.
+
+        Args:
+            key: The position key, e.g. GameBoard.canonical_key().
+            score: The score found by the search.
+            flag: EXACT, LOWER_BOUND or UPPER_BOUND.
+            depth: How deep the position was searched, POLICY_DEPTH keeps
+            the deeper of two positions competing for a slot.
+        """
+        self.stores += 1
+        if self._slots is not None:
+            index = hash(key) % self.max_entries
+            slot = self._slots[index]
+            if slot is None:
+                self._occupied += 1
+            elif slot[0] != key:
+                if self.policy == self.POLICY_DEPTH and slot[1] > depth:
+                    self.rejected += 1
+                    return
+                self.evictions += 1
+            self._slots[index] = (key, depth, (score, flag))
+            return
+        self.entries[key] = (depth, (score, flag))
+        if self.max_entries is not None:
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def occupancy(self):
+        """
+        Return the share of the table in use, 0 for an unbounded table.
+        """
+        if self.max_entries is None:
+            return 0.0
+        return len(self) / self.max_entries
+
+    def stats(self):
+        """
+        Report the size and traffic of the table.
+
+        Returns:
+            A dictionary with the policy, capacity, entries, occupancy,
+            estimated bytes, hits, misses, stores, evictions and the
+            stores rejected by POLICY_DEPTH.
+        """
+        return {
+            'policy': self.policy if self.max_entries is not None else None,
+            'capacity': self.max_entries,
+            'entries': len(self),
+            'occupancy': self.occupancy(),
+            'bytes': len(self) * self.ENTRY_BYTES[self.policy],
+            'hits': self.hits,
+            'misses': self.misses,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'rejected': self.rejected,
+        }
+
+    def clear(self):
+        """
+        Remove all entries and reset the counters.
+        """
+        if self.max_entries is None:
+            self.entries = {}
+        elif self.policy == self.POLICY_LRU:
+            self.entries = OrderedDict()
+        else:
+            self._slots = [None] * self.max_entries
+            self._occupied = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.rejected = 0
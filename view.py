@@ -1,15 +1,377 @@
 """Handles the user interface for the game."""
 
+import ctypes
 import os
+import random
+import shutil
+import sys
+import time
+
+
+class TerminalRenderer:
+    """
+    Draws boards with ANSI escape sequences instead of clearing the screen.
+
+    A requested clear is held back until the next output. When that
+    output is a board of the shape already on screen, only the changed
+    cells are rewritten and everything below the board is erased, all in
+    one write, so the screen is never blank in between. Output that is
+    not a terminal gets plain text without escape sequences, and so does
+    a Windows console that cannot be switched to process them.
+    """
+    HOME = "\x1b[H"
+    ERASE_LINE = "\x1b[K"
+    ERASE_BELOW = "\x1b[J"
+    ERASE_SCREEN = "\x1b[2J"
+    # Windows console API values
+    STD_OUTPUT_HANDLE = -11
+    ENABLE_VIRTUAL_TERMINAL_PROCESSING = 0x0004
+    # Whether the Windows console processes escape sequences, None
+    # until it was switched
+    _virtual_terminal = None
+
+    def __init__(self, stream=None):
+        """
+        Initialize a renderer with nothing on screen.
+
+        Args:
+            stream: Optional text stream to draw on, sys.stdout at the
+            time of drawing if None.
+        """
+        self.stream = stream
+        self._pending_clear = False
+        # The cells and shape of the board drawn at the top of the
+        # screen, None when the screen content is unknown
+        self._cells = None
+        self._shape = None
+        self._lines_below = 0
+
+    def _output(self):
+        """
+        Return the stream to draw on and whether it understands ANSI.
+        """
+        stream = self.stream or sys.stdout
+        isatty = getattr(stream, 'isatty', None)
+        return stream, bool(isatty and isatty()
+                            and self.enable_virtual_terminal())
+
+    @classmethod
+    def enable_virtual_terminal(cls):
+        """
+        Make the console process ANSI escape sequences.
+
+        Other systems than Windows process them anyway. A Windows console
+        is switched to virtual terminal processing the first time only.
+
+        Returns:
+            Whether the console processes escape sequences.
+        """
+        if os.name != 'nt':
+            return True
+        if cls._virtual_terminal is None:
+            cls._virtual_terminal = cls._set_console_mode()
+        return cls._virtual_terminal
+
+    @classmethod
+    def _set_console_mode(cls):
+        """
+        Turn on virtual terminal processing for the Windows console.
+
+        Returns:
+            Whether the console mode was set, False for consoles older
+            than Windows 10 and for output that is not a console.
+        """
+        try:
+            kernel32 = ctypes.windll.kernel32
+            handle = kernel32.GetStdHandle(cls.STD_OUTPUT_HANDLE)
+            mode = ctypes.c_uint32()
+            if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+                return False
+            return bool(kernel32.SetConsoleMode(
+                handle, mode.value | cls.ENABLE_VIRTUAL_TERMINAL_PROCESSING))
+        except (AttributeError, OSError):
+            return False
+
+    @staticmethod
+    def count_lines(text):
+        """
+        Count the terminal lines a printed text takes up.
+
+        Args:
+            text: The text, printed with a trailing newline.
+
+        Returns:
+            The number of lines, wrapped lines included.
+        """
+        width = max(shutil.get_terminal_size().columns, 1)
+        return sum(max(len(line) - 1, 0) // width + 1
+                   for line in str(text).split('\n'))
+
+    def clear(self):
+        """
+        Clear the screen before the next output.
+        """
+        self._pending_clear = True
+
+    def flush(self):
+        """
+        Carry out a pending clear before output other than a board.
+        """
+        if not self._pending_clear:
+            return
+        self._pending_clear = False
+        self._cells = None
+        stream, ansi = self._output()
+        if ansi:
+            stream.write(self.HOME + self.ERASE_SCREEN)
+            stream.flush()
+
+    def wrote(self, text):
+        """
+        Account for text printed below the board by other means.
+
+        Args:
+            text: The printed text.
+        """
+        self._lines_below += self.count_lines(text)
+
+    def forget(self):
+        """
+        Forget the board on screen after something else drew over it.
+        """
+        self._cells = None
+
+    def draw_board(self, board):
+        """
+        Draw a board, rewriting only the cells that changed if it can.
+
+        Args:
+            board: The current state of the game board.
+        """
+        symbols = {board.BOARD_PLAYER_X: 'X', board.BOARD_PLAYER_O: 'O',
+                   board.BOARD_EMPTY: ' '}
+        # Fallback for unexpected values
+        cells = [symbols.get(space, '?') for space in board.board]
+        shape = (board.rows, board.columns)
+        height = 2 * board.rows + 2
+        stream, ansi = self._output()
+        if not ansi:
+            self._pending_clear = False
+            stream.write(self.frame(cells, *shape))
+            stream.flush()
+            return
+
+        if self._pending_clear:
+            self._pending_clear = False
+            on_screen = self._cells is not None and self._shape == shape \
+                and height + self._lines_below \
+                < shutil.get_terminal_size().lines
+            if on_screen:
+                parts = [self.HOME]
+                for index, (old, new) in enumerate(zip(self._cells, cells)):
+                    if old != new:
+                        row, column = divmod(index, board.columns)
+                        parts.append(f"\x1b[{2 * row + 3};{4 * column + 3}H"
+                                     f"{new}")
+                parts.append(f"\x1b[{height + 1};1H" + self.ERASE_BELOW)
+            else:
+                lines = self.frame(cells, *shape).split('\n')
+                parts = [self.HOME,
+                         (self.ERASE_LINE + '\n').join(lines),
+                         self.ERASE_BELOW]
+            stream.write(''.join(parts))
+            self._cells, self._shape = cells, shape
+        else:
+            # Drawn below whatever is on screen, it cannot be updated
+            stream.write(self.frame(cells, *shape))
+            self._cells = None
+        self._lines_below = 0
+        stream.flush()
+
+    @staticmethod
+    def frame(cells, rows, columns):
+        """
+        Compose the text of a board.
+
+        Args:
+            cells: The symbol of every space.
+            rows: The number of rows.
+            columns: The number of columns.
+
+        Returns:
+            The board as one string, starting with an empty line and
+            ending with a newline.
+        """
+        separator = '+---' * columns + '+'
+        lines = ['', separator]
+        for i in range(0, rows * columns, columns):
+            lines.append('| ' + ' | '.join(cells[i:i + columns]) + ' |')
+            lines.append(separator)
+        return '\n'.join(lines) + '\n'
+
+
+class BinaryRain:
+    """
+    Columns of falling zeros and ones, drawn at a fixed frame rate.
+
+    Every column has one drop with its own head row, speed and length.
+    A frame moves each head down and erases the end of its trail, so
+    only the cells that change are touched. The frame lives in one
+    preallocated buffer that starts with the cursor home sequence and is
+    written to the terminal in a single call.
+    """
+    FPS = 20
+    HOME = b"\x1b[H"
+    HIDE_CURSOR = "\x1b[?25l"
+    SHOW_CURSOR = "\x1b[?25h"
+    # ASCII codes written into the buffer
+    SPACE = 32
+    ZERO = 48
+
+    def __init__(self, columns, rows, seed=None):
+        """
+        Initialize a screen without drops.
+
+        Args:
+            columns: The width of the animation in characters.
+            rows: The height of the animation in lines.
+            seed: Optional seed that makes the animation repeatable.
+        """
+        self.columns = max(columns, 1)
+        self.rows = max(rows, 1)
+        self.random = random.Random(seed)
+        self._width = self.columns + 1
+        self.buffer = bytearray(self.HOME) + bytearray(
+            (b" " * self.columns + b"\n") * self.rows)
+        self._offset = len(self.HOME)
+        self.heads = [0] * self.columns
+        self.speeds = [1] * self.columns
+        self.lengths = [1] * self.columns
+        for column in range(self.columns):
+            self._new_drop(column)
+
+    def _new_drop(self, column):
+        """
+        Start a new drop above the screen in a column.
+
+        Args:
+            column: The index of the column.
+        """
+        self.heads[column] = -self.random.randint(0, self.rows)
+        self.speeds[column] = self.random.randint(1, 2)
+        self.lengths[column] = self.random.randint(
+            max(self.rows // 4, 1), self.rows)
+
+    def step(self):
+        """
+        Advance every drop and update the buffer.
+        """
+        buffer = self.buffer
+        width, offset, rows = self._width, self._offset, self.rows
+        bits = self.random.getrandbits
+        heads, speeds, lengths = self.heads, self.speeds, self.lengths
+        for column in range(self.columns):
+            head = heads[column]
+            length = lengths[column]
+            for _ in range(speeds[column]):
+                head += 1
+                if 0 <= head < rows:
+                    buffer[offset + head * width + column] = \
+                        self.ZERO + bits(1)
+                tail = head - length
+                if 0 <= tail < rows:
+                    buffer[offset + tail * width + column] = self.SPACE
+            heads[column] = head
+            if head - length >= rows - 1:
+                self._new_drop(column)
+
+    def run(self, stream=None, fps=FPS, frames=None):
+        """
+        Play the animation until it is interrupted or has shown frames.
+
+        Args:
+            stream: Optional text stream to draw on, sys.stdout if None.
+            fps: Frames per second, the animation sleeps between frames.
+            frames: Optional number of frames after which to stop.
+
+        Returns:
+            A dictionary with the frames shown, the wall and CPU seconds
+            taken and the resulting frames per second.
+        """
+        stream = stream or sys.stdout
+        binary = getattr(stream, 'buffer', None)
+        interval = 1 / fps
+        shown = 0
+        start, cpu = time.perf_counter(), time.process_time()
+        next_frame = start
+        stream.write(self.HIDE_CURSOR + TerminalRenderer.HOME
+                     + TerminalRenderer.ERASE_SCREEN)
+        try:
+            while frames is None or shown < frames:
+                self.step()
+                if binary is not None:
+                    stream.flush()
+                    binary.write(self.buffer)
+                    binary.flush()
+                else:
+                    stream.write(self.buffer.decode('ascii'))
+                    stream.flush()
+                shown += 1
+                next_frame += interval
+                delay = next_frame - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    # Running late, do not rush frames to catch up
+                    next_frame = time.perf_counter()
+        finally:
+            stream.write(TerminalRenderer.HOME + TerminalRenderer.ERASE_SCREEN
+                         + self.SHOW_CURSOR)
+            stream.flush()
+        seconds = time.perf_counter() - start
+        return {'frames': shown, 'seconds': seconds,
+                'cpu_seconds': time.process_time() - cpu,
+                'fps': shown / seconds if seconds else 0.0}
+
 
 class GameView:
     """ Handles the produced output"""
+    renderer = TerminalRenderer()
+
+    @staticmethod
+    def _print(message):
+        """
+        Print a message below everything drawn so far.
+
+        Args:
+            message: The message to print.
+        """
+        GameView.renderer.flush()
+        print(message)
+        GameView.renderer.wrote(message)
+
+    @staticmethod
+    def _input(prompt):
+        """
+        Read a line of input below everything drawn so far.
+
+        Args:
+            prompt: The prompt to display to the user.
+
+        Returns:
+            The user's input as a string.
+        """
+        GameView.renderer.flush()
+        answer = input(prompt)
+        GameView.renderer.wrote(prompt + answer)
+        return answer
+
     @staticmethod
     def display_start_screen():
         """
         Display the start screen of the game.
         """
-        print(r"""
+        GameView._print(r"""
   _______ _   _______      _______         
  |__   __(_) |__   __|    |__   __|        
     | |   _  ___| | __ _  ___| | ___   ___ 
@@ -24,7 +386,7 @@ class GameView:
         """
         Display the main menu of the game.
         """
-        print("""
+        GameView._print("""
 Welcome to Tic Tac Toe
 1) New game
 2) Load a saved game
@@ -39,14 +401,17 @@ Welcome to Tic Tac Toe
         Args:
             message: The message to display.
         """
-        print(message)
+        GameView._print(message)
 
     @staticmethod
     def clear_screen():
         """
         Clear the terminal screen.
+
+        The clear is done with ANSI escape sequences together with the
+        next output, see TerminalRenderer.
         """
-        os.system('cls' if os.name == 'nt' else 'clear')
+        GameView.renderer.clear()
 
     @staticmethod
     def input_prompt(prompt):
@@ -59,7 +424,7 @@ Welcome to Tic Tac Toe
         Returns:
             The user's input as a string.
         """
-        return input(prompt)
+        return GameView._input(prompt)
 
     @staticmethod
     def choose_move(board, player):
@@ -71,32 +436,63 @@ Welcome to Tic Tac Toe
             player: The current player.
 
         Returns:
-            The user's chosen move as a tuple of (row, column), 
+            The user's chosen move as a tuple of (row, column),
             or 'save' if the user chooses to save the game.
         """
-        print("To save the game, type 'save' at any time. \n")
-        print(f"{player.player_type}'s turn.")
+        GameView._print("To save the game, type 'save' at any time. \n")
+        GameView._print(f"{player.player_type}'s turn.")
         while True:
-            row = input('Enter row [1-3]: ')
+            row = GameView._input(f'Enter row [1-{board.rows}]: ')
             if row.lower() == 'save':
                 return 'save'
-            if not row.isdigit() or not 1 <= int(row) <= 3:
-                print("Invalid input. Please enter a number between 1 to 3.")
+            if not row.isdigit() or not 1 <= int(row) <= board.rows:
+                GameView._print("Invalid input. Please enter a number "
+                                f"between 1 to {board.rows}.")
                 continue
 
-            column = input('Enter column [1-3]: ')
+            column = GameView._input(f'Enter column [1-{board.columns}]: ')
             if column.lower() == 'save':
                 return 'save'
-            if not column.isdigit() or not 1 <= int(column) <= 3:
-                print("Invalid input. Please enter a number between 1 to 3.")
+            if not column.isdigit() or not 1 <= int(column) <= board.columns:
+                GameView._print("Invalid input. Please enter a number "
+                                f"between 1 to {board.columns}.")
                 continue
-            index = (int(row) - 1) * 3 + (int(column) - 1)
+            index = (int(row) - 1) * board.columns + (int(column) - 1)
             if board.board[index] != board.BOARD_EMPTY:
-                print('Space already taken. Try again.')
+                GameView._print('Space already taken. Try again.')
             else:
                 break
         return row, column
 
+    @staticmethod
+    def binary_rain(fps=BinaryRain.FPS, frames=None):
+        """
+        Play the binary rain animation on the whole terminal.
+
+        Consoles that do not process ANSI escape sequences get a message
+        instead, the animation would print them as text.
+
+        Args:
+            fps: Frames per second.
+            frames: Optional number of frames after which to stop.
+
+        Returns:
+            The statistics returned by BinaryRain.run, or None if the
+            animation was skipped.
+        """
+        GameView.renderer.flush()
+        if not TerminalRenderer.enable_virtual_terminal():
+            GameView._print("The binary rain needs a terminal that "
+                            "understands ANSI escape sequences.")
+            return None
+        size = shutil.get_terminal_size()
+        # One line less, so the last newline does not scroll the screen
+        rain = BinaryRain(size.columns, size.lines - 1)
+        try:
+            return rain.run(fps=fps, frames=frames)
+        finally:
+            GameView.renderer.forget()
+
     @staticmethod
     def print_board(board):
         """
@@ -105,13 +501,4 @@ Welcome to Tic Tac Toe
         Args:
             board: The current state of the game board.
         """
-        symbols = {board.BOARD_PLAYER_X: 'X', board.BOARD_PLAYER_O: 'O',
-                   board.BOARD_EMPTY: ' '}
-        print('\n+---+---+---+')
-        for i in range(0, 9, 3):
-            row = []
-            for j in range(3):
-                # Fallback for unexpected values
-                row.append(symbols.get(board.board[i+j], '?'))
-            print('| ' + ' | '.join(row) + ' |')
-            print('+---+---+---+')
+        GameView.renderer.draw_board(board)